@@ -0,0 +1,505 @@
+"""
+Availability engine for finding common free time across users
+
+Each user's busy time on a day is stored as a 1440-bit integer, one bit per
+minute of the day. A group's busy time is the bitwise OR of its members'
+masks, and free windows are the runs of zero bits inside the work hours.
+This replaces expanding every meeting into a set of hours and re-checking
+every candidate start hour against it.
+
+Meeting times come from their start_at/end_at epoch minutes (see
+timespan.py), so meetings can start and end on any minute, and a meeting
+that crosses midnight is busy time on both of the days it touches.
+
+Per-(user, date) masks are materialized in busy_view and updated on every
+meeting write, and each day's slots for a query are cached in slot_cache,
+which drops entries as soon as a meeting of one of their users on that date
+is written.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date as Date, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import data
+import timespan
+from timespan import MINUTES_PER_DAY
+
+
+def interval_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmask with bits [start_minute, end_minute) set, clamped to the day"""
+    start_minute = max(start_minute, 0)
+    end_minute = min(end_minute, MINUTES_PER_DAY)
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+def meeting_minutes(meeting: dict, date: Optional[str] = None) -> Optional[Tuple[int, int]]:
+    """
+    A meeting's (start, end) as minutes since midnight of `date` (its own
+    date by default) - negative or past 1440 where it spills into another
+    day. None for a meeting without times.
+    """
+    if meeting.get("start_at") is None and meeting.get("date") is None:
+        # Hours without a date: minutes of whichever day they're checked against
+        meeting, date = {**meeting, "date": "1970-01-01"}, "1970-01-01"
+    span = timespan.meeting_span(meeting)
+    if span is None:
+        return None
+    midnight = timespan.day_start(date if date is not None else timespan.day_of(span[0]))
+    return span[0] - midnight, span[1] - midnight
+
+
+def busy_mask(meetings: Iterable[dict], date: Optional[str] = None) -> int:
+    """
+    Combine a set of meetings into a single busy bitmask for `date` (each
+    meeting's own date by default). The intervals are merged with one sort
+    first, so overlapping meetings cost one mask operation per merged run.
+    """
+    spans = (meeting_minutes(meeting, date) for meeting in meetings)
+    mask = 0
+    for start, end in timespan.merge_spans(span for span in spans if span is not None):
+        mask |= interval_mask(start, end)
+    return mask
+
+
+def user_day_meetings(user_id: str, date: str) -> List[dict]:
+    """
+    A user's meetings with busy time on a date: the ones starting that day
+    plus the previous day's that run past midnight (meetings last at most a day)
+    """
+    overnight = [
+        row for row in data.meetings_for_user_on(user_id, timespan.previous_day(date))
+        if len(_days_of(row)) > 1
+    ]
+    return overnight + data.meetings_for_user_on(user_id, date)
+
+
+def _days_of(row: dict) -> List[str]:
+    """The dates a meeting row has busy time on"""
+    span = timespan.meeting_span(row)
+    return timespan.days_spanned(span) if span is not None else [row["date"]]
+
+
+def user_busy_mask(user_id: str, date: str) -> int:
+    """Busy bitmask for one user on a date (YYYY-MM-DD)"""
+    return busy_view.get(user_id, date)
+
+
+def group_busy_mask(user_ids: Iterable[str], date: str) -> int:
+    """
+    Busy bitmask for a group - a minute is busy if anyone is busy
+
+    Read as one snapshot: a meeting moved between two of the users counts
+    for exactly one of them, never both or neither, while the move is applied.
+    """
+    user_ids = list(user_ids)
+    return data.read_consistent(lambda: busy_view.group_mask(user_ids, date))
+
+
+def bit_runs(mask: int) -> List[Tuple[int, int]]:
+    """
+    The maximal (start, end) runs of set bits in a non-negative mask
+
+    Walks the mask one run at a time, so the cost is proportional to the
+    number of runs rather than the number of bits.
+    """
+    runs = []
+    while mask:
+        start = (mask & -mask).bit_length() - 1
+        run = mask >> start
+        # run has `length` trailing ones; run ^ (run + 1) has length + 1 ones
+        length = (run ^ (run + 1)).bit_length() - 1
+        runs.append((start, start + length))
+        mask &= ~(((1 << length) - 1) << start)
+    return runs
+
+
+def free_windows(busy: int, window_start: int, window_end: int) -> List[Tuple[int, int]]:
+    """Return the maximal free (start, end) minute ranges inside a window"""
+    return bit_runs(~busy & interval_mask(window_start, window_end))
+
+
+def slots_in_windows(
+    windows: Iterable[Tuple[int, int]],
+    duration_minutes: int,
+    grid_start: int,
+    step_minutes: int
+) -> List[Tuple[int, int]]:
+    """
+    Lay candidate slots of duration_minutes onto free windows
+
+    Slot starts are aligned to a grid of step_minutes beginning at grid_start,
+    matching how the service steps through the work day hour by hour.
+    """
+    slots = []
+    for window_start, window_end in windows:
+        # First grid point at or after the window start
+        offset = window_start - grid_start
+        start = grid_start + -(-offset // step_minutes) * step_minutes
+        while start + duration_minutes <= window_end:
+            slots.append((start, start + duration_minutes))
+            start += step_minutes
+    return slots
+
+
+class _WriteTracker:
+    """
+    Detects writes to (user_id, date) keys while a value derived from them
+    is being computed, so the value isn't stored once it's already stale.
+
+    Keys are only tracked while a compute that read them is running, so
+    this stays small. Not thread-safe by itself: callers hold their lock.
+    """
+
+    def __init__(self):
+        self._in_flight = {}  # (user_id, date) -> [computes running, writes seen]
+        self._epoch = 0  # Bumped by reset()
+
+    def begin(self, keys: List[tuple]) -> tuple:
+        """Start a compute over keys, returns a token for end()"""
+        marks = []
+        for key in keys:
+            tracker = self._in_flight.setdefault(key, [0, 0])
+            tracker[0] += 1
+            marks.append(tracker[1])
+        return self._epoch, keys, marks
+
+    def end(self, token: tuple) -> bool:
+        """Finish a compute, returns True if any of its keys was written meanwhile"""
+        epoch, keys, marks = token
+        stale = epoch != self._epoch
+        for key, mark in zip(keys, marks):
+            tracker = self._in_flight[key]
+            stale = stale or tracker[1] != mark
+            tracker[0] -= 1
+            if not tracker[0]:
+                del self._in_flight[key]
+        return stale
+
+    def touch(self, key: tuple):
+        """Record a write to key"""
+        tracker = self._in_flight.get(key)
+        if tracker is not None:
+            tracker[1] += 1
+
+    def reset(self):
+        """Record a write to every key"""
+        self._epoch += 1
+
+
+def _busy_interval(row: dict) -> tuple:
+    """The part of a meeting row that affects busy masks"""
+    return row["user_id"], timespan.meeting_span(row)
+
+
+class BusyMaskView:
+    """
+    Materialized busy mask per (user_id, date)
+
+    A mask is loaded from the (user_id, date) index the first time it is
+    read, then kept current by apply(), which runs after every meeting
+    write: a new meeting is OR-ed into its mask, and a mask that lost or
+    changed a meeting is rebuilt from that day's meetings. Writes that
+    don't move a meeting (title, prep, ...) leave masks untouched.
+    Availability reads are then dict lookups and bitwise ORs. At most
+    max_size masks are kept; the least recently used are dropped first and
+    simply reloaded if read again.
+
+    A single mask is eventually consistent: a write is visible in the data
+    before apply() has run for it, and masks loaded in that window already
+    include it while materialized ones don't yet. Reads of several masks
+    that must agree go through data.read_consistent(), which waits out
+    writes until their listeners (including apply()) have returned.
+    """
+
+    def __init__(self, max_size: int = 16384):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._masks = OrderedDict()  # (user_id, date) -> busy mask, least recently used first
+        self._tracker = _WriteTracker()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, date: str) -> int:
+        """Busy mask for one user on a date, loading it on first use"""
+        key = (user_id, date)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+            token = self._tracker.begin([key])
+
+        mask = None
+        try:
+            mask = busy_mask(user_day_meetings(user_id, date), date)
+        finally:
+            with self._lock:
+                # A write that landed during the load has already been applied
+                # to the data but not to this mask, so don't keep it
+                if not self._tracker.end(token) and mask is not None and key not in self._masks:
+                    self._masks[key] = mask
+                    while len(self._masks) > self.max_size:
+                        self._masks.popitem(last=False)
+        return mask
+
+    def group_mask(self, user_ids: List[str], date: str) -> int:
+        """OR of the users' masks"""
+        with self._lock:
+            masks = [self._masks.get((user_id, date)) for user_id in user_ids]
+            for user_id, mask in zip(user_ids, masks):
+                if mask is not None:
+                    self._masks.move_to_end((user_id, date))
+        group = 0
+        for user_id, mask in zip(user_ids, masks):
+            group |= mask if mask is not None else self.get(user_id, date)
+        return group
+
+    def apply(self, changes: Optional[list]):
+        """data.add_write_listener() hook: bring masks up to date with a write"""
+        if changes is None:
+            with self._lock:
+                self._masks.clear()
+                self._tracker.reset()
+            return
+
+        added = {}  # key -> OR of the meetings that only arrived
+        rebuild = set()  # keys that lost or changed a meeting
+        for _, old, new in changes:
+            if old is not None and new is not None and _busy_interval(old) == _busy_interval(new):
+                continue
+            if old is not None:
+                rebuild.update((old["user_id"], day) for day in _days_of(old))
+            if new is not None:
+                for day in _days_of(new):
+                    key = (new["user_id"], day)
+                    added[key] = added.get(key, 0) | busy_mask([new], day)
+
+        with self._lock:
+            for key in rebuild.union(added):
+                self._tracker.touch(key)
+                if key not in self._masks:
+                    continue
+                if key in rebuild:
+                    # Overlapping meetings share bits, so removal means a rebuild
+                    self._masks[key] = busy_mask(user_day_meetings(*key), key[1])
+                else:
+                    self._masks[key] |= added[key]
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+
+class AvailabilityCache:
+    """
+    Cache of one day's free slots per (user set, date, query parameters)
+
+    Entries are indexed by every (user_id, date) they were computed from.
+    When a meeting is written, only the entries for the (user_id, date)s
+    its old and new times touch are dropped; everything else stays cached.
+
+    A result whose (user_id, date) inputs were written while it was being
+    computed is returned but not stored, so a slow reader can't put back
+    slots computed from data that was already replaced.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> tuple of (start, end) slots
+        self._by_user_date = {}  # (user_id, date) -> set of keys
+        self._tracker = _WriteTracker()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(user_ids: Iterable[str], date: str, duration_minutes: int,
+                  work_hours: tuple, step_minutes: int) -> tuple:
+        """Canonical key - the order and repetition of user_ids don't matter"""
+        return (tuple(sorted(set(user_ids))), date, duration_minutes, tuple(work_hours), step_minutes)
+
+    def _drop(self, key: tuple):
+        """Remove an entry and its index references (lock held)"""
+        self._entries.pop(key, None)
+        user_ids, date = key[0], key[1]
+        for user_id in user_ids:
+            keys = self._by_user_date.get((user_id, date))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user_date[(user_id, date)]
+
+    def get_or_compute(self, key: tuple, compute) -> List[Tuple[int, int]]:
+        """Return cached slots for key, or compute(), cache and return them"""
+        user_date_keys = [(user_id, key[1]) for user_id in key[0]]
+        with self._lock:
+            slots = self._entries.get(key)
+            if slots is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(slots)
+            self.misses += 1
+            token = self._tracker.begin(user_date_keys)
+
+        slots = None
+        try:
+            slots = tuple(compute())
+        finally:
+            with self._lock:
+                if not self._tracker.end(token) and slots is not None:
+                    self._entries[key] = slots
+                    for user_date in user_date_keys:
+                        self._by_user_date.setdefault(user_date, set()).add(key)
+                    while len(self._entries) > self.max_size:
+                        self._drop(next(iter(self._entries)))
+        return list(slots)
+
+    def invalidate(self, user_id: str, date: str):
+        """Drop every entry computed from user_id's meetings on date"""
+        with self._lock:
+            self._tracker.touch((user_id, date))
+            for key in list(self._by_user_date.get((user_id, date), ())):
+                self._drop(key)
+
+    def clear(self):
+        """Drop every entry, including results still being computed (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._by_user_date.clear()
+            self._tracker.reset()
+
+    def on_write(self, changes: Optional[list]):
+        """data.add_write_listener() hook: invalidate the (user, date) of each change"""
+        if changes is None:
+            self.clear()
+            return
+        for _, old, new in changes:
+            for row in (old, new):
+                if row is not None:
+                    for day in _days_of(row):
+                        self.invalidate(row["user_id"], day)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+
+# Shared by every caller; kept current by the data layer's write listeners
+busy_view = BusyMaskView()
+slot_cache = AvailabilityCache()
+
+
+def _on_write(changes: Optional[list]):
+    # Masks first, so a cache refill triggered by the invalidation below
+    # can't read a mask that doesn't include this write yet
+    busy_view.apply(changes)
+    slot_cache.on_write(changes)
+
+
+data.add_write_listener(_on_write)
+
+
+def _day_slots(user_ids: List[str], date: str, duration_minutes: int,
+               work_hours: tuple, step_minutes: int) -> List[Tuple[int, int]]:
+    """One day's free slots for a group, served from slot_cache when possible"""
+    def compute():
+        work_start, work_end = work_hours[0] * 60, work_hours[1] * 60
+        busy = group_busy_mask(user_ids, date)
+        windows = free_windows(busy, work_start, work_end)
+        return slots_in_windows(windows, duration_minutes, work_start, step_minutes)
+
+    key = slot_cache.cache_key(user_ids, date, duration_minutes, work_hours, step_minutes)
+    return slot_cache.get_or_compute(key, compute)
+
+
+def find_free_slots(
+    user_ids: List[str],
+    date: str,
+    duration_minutes: int,
+    work_hours: tuple = (9, 17),
+    step_minutes: int = 60
+) -> List[Tuple[int, int]]:
+    """
+    Find (start, end) minute ranges on a date when every user is free
+
+    Args:
+        user_ids: Users who must all be available
+        date: Date in YYYY-MM-DD format
+        duration_minutes: Length of the slot to find
+        work_hours: (start_hour, end_hour) bounds for the slots
+        step_minutes: Spacing between candidate start times
+
+    Raises:
+        ValueError: If duration_minutes or step_minutes is not positive
+    """
+    if duration_minutes <= 0:
+        raise ValueError("duration_minutes must be positive")
+    if step_minutes <= 0:
+        raise ValueError("step_minutes must be positive")
+
+    return _day_slots(user_ids, date, duration_minutes, work_hours, step_minutes)
+
+
+def iter_dates(start_date: str, end_date: str) -> Iterator[str]:
+    """
+    Iterate YYYY-MM-DD strings from start_date to end_date inclusive
+
+    The dates are validated eagerly so bad input fails at call time, not on
+    the first next().
+    """
+    first = Date.fromisoformat(start_date)
+    last = Date.fromisoformat(end_date)
+    if last < first:
+        raise ValueError("end_date must not be before start_date")
+    return (
+        (first + timedelta(days=offset)).isoformat()
+        for offset in range((last - first).days + 1)
+    )
+
+
+def iter_free_slots(
+    user_ids: List[str],
+    start_date: str,
+    end_date: str,
+    duration_minutes: int,
+    work_hours: tuple = (9, 17),
+    step_minutes: int = 60,
+    limit: Optional[int] = None
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Lazily yield (date, start, end) free slots across a date range
+
+    Days are walked in order and only computed when the caller asks for more
+    slots, so a search for the first N openings stops at the first day that
+    satisfies it. Each user's busy mask for a day is read from busy_view and
+    OR-ed into the group mask.
+
+    Raises:
+        ValueError: If the dates are malformed or out of order, or the
+            duration/step is not positive
+    """
+    if duration_minutes <= 0:
+        raise ValueError("duration_minutes must be positive")
+    if step_minutes <= 0:
+        raise ValueError("step_minutes must be positive")
+    days = iter_dates(start_date, end_date)
+
+    def _walk():
+        for day in days:
+            for start, end in _day_slots(user_ids, day, duration_minutes, work_hours, step_minutes):
+                yield day, start, end
+
+    return islice(_walk(), limit)
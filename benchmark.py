@@ -0,0 +1,348 @@
+"""
+Benchmarks for the service hot paths
+
+Generates a seeded synthetic dataset, swaps it in as the data backend and
+times each service call, reporting latency percentiles and throughput per
+dataset size. Results are written as JSON so runs can be compared.
+
+The dataset aims to look like real usage rather than uniform noise:
+- meeting owners and contacts follow a Zipf-like popularity curve, so a few
+  users and contacts have long histories
+- meetings fall on weekdays, cluster mid-morning and mid-afternoon, and are
+  15 to 90 minutes long, mostly on the hour or half hour
+- ~70% of meetings are with an external contact; past meetings mostly carry
+  a transcript, summary, action items and sentiment
+
+Usage:
+    python benchmark.py                                   # 10^3 .. 10^6 meetings
+    python benchmark.py --sizes 1000,10000 --iterations 200 --output results.json
+    python benchmark.py --sizes 1000 --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date as Date, datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import data
+import meeting_service
+import timespan
+from data import InMemoryBackend, MeetingStore
+from models import CreateMeetingRequest
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DEFAULT_ITERATIONS = 500
+PERCENTILES = (50, 90, 99)
+
+START_HOUR_WEIGHTS = {8: 2, 9: 6, 10: 9, 11: 8, 12: 3, 13: 6, 14: 9, 15: 8, 16: 5, 17: 2}
+START_MINUTE_WEIGHTS = {0: 10, 15: 1, 30: 5, 45: 1}
+DURATION_WEIGHTS = {15: 1, 30: 4, 45: 1, 60: 5, 90: 1}
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+class Dataset(NamedTuple):
+    """Synthetic rows, keyed by id like the data.py fixtures"""
+    users: dict
+    contacts: dict
+    meetings: dict
+    start_date: str  # First day meetings are spread over
+    today: str  # Meetings before this date are "past" and have been analyzed
+    days: int
+
+
+def _zipf_cum_weights(n: int, exponent: float = 0.8) -> List[float]:
+    return list(accumulate(1.0 / (rank + 1) ** exponent for rank in range(n)))
+
+
+def _weighted(weights: dict):
+    return list(weights), list(accumulate(weights.values()))
+
+
+def generate_dataset(
+    n_meetings: int,
+    n_users: Optional[int] = None,
+    n_contacts: Optional[int] = None,
+    seed: int = 0,
+    start_date: str = "2025-01-06",
+    days: int = 365
+) -> Dataset:
+    """
+    Build n_meetings meetings across n_users users and n_contacts contacts
+    (by default one user per 500 meetings and one contact per 100, at
+    least 5 and 10). The same arguments always produce the same dataset.
+    """
+    rng = random.Random(seed)
+    n_users = n_users or max(5, n_meetings // 500)
+    n_contacts = n_contacts or max(10, n_meetings // 100)
+
+    users = {
+        f"bench_user_{i}": {"id": f"bench_user_{i}", "name": f"User {i}",
+                            "email": f"user{i}@company.com", "role": "Account Executive"}
+        for i in range(n_users)
+    }
+    contacts = {
+        f"bench_contact_{i}": {"id": f"bench_contact_{i}", "name": f"Contact {i}",
+                               "email": f"contact{i}@customer{i % 97}.com",
+                               "company": f"Customer {i % 97}", "role": "Director"}
+        for i in range(n_contacts)
+    }
+
+    first = Date.fromisoformat(start_date)
+    weekdays = [
+        timespan.day_start(day.isoformat())
+        for day in (first + timedelta(days=offset) for offset in range(days))
+        if day.weekday() < 5
+    ]
+    today = (first + timedelta(days=days // 2)).isoformat()
+    today_start = timespan.day_start(today)
+
+    user_ids, contact_ids = list(users), list(contacts)
+    user_weights = _zipf_cum_weights(n_users)
+    contact_weights = _zipf_cum_weights(n_contacts)
+    hours, hour_weights = _weighted(START_HOUR_WEIGHTS)
+    minutes, minute_weights = _weighted(START_MINUTE_WEIGHTS)
+    durations, duration_weights = _weighted(DURATION_WEIGHTS)
+
+    meetings = {}
+    for index in range(n_meetings):
+        meeting_id = f"bench_meeting_{index}"
+        start_at = (
+            rng.choice(weekdays)
+            + rng.choices(hours, cum_weights=hour_weights)[0] * 60
+            + rng.choices(minutes, cum_weights=minute_weights)[0]
+        )
+        end_at = start_at + rng.choices(durations, cum_weights=duration_weights)[0]
+        contact_id = (
+            rng.choices(contact_ids, cum_weights=contact_weights)[0] if rng.random() < 0.7 else None
+        )
+        row = {
+            "id": meeting_id,
+            "user_id": rng.choices(user_ids, cum_weights=user_weights)[0],
+            "contact_id": contact_id,
+            "title": f"{'Customer sync' if contact_id else 'Internal review'} #{index}",
+            **timespan.hour_fields(start_at, end_at),
+            "start_at": start_at,
+            "end_at": end_at,
+            "action_items": [],
+        }
+        if start_at < today_start and rng.random() < 0.8:
+            row.update(
+                transcript=f"Rep: Thanks for joining. Customer: Let's review item {index}. [continues]",
+                summary=f"Discussed rollout status and open question {index % 50}.",
+                action_items=[f"Follow up on item {index}", "Share pricing update"][:rng.randint(0, 2)],
+                sentiment=rng.choice(SENTIMENTS),
+            )
+        meetings[meeting_id] = row
+
+    return Dataset(users, contacts, meetings, start_date, today, days)
+
+
+@contextmanager
+def use_dataset(dataset: Dataset):
+    """Serve every data.py helper from the dataset for the duration of the block"""
+    store = MeetingStore()
+    store.write_batch(puts=dataset.meetings)
+    previous = data.set_backend(InMemoryBackend(dict(dataset.users), dict(dataset.contacts), store))
+    try:
+        yield
+    finally:
+        data.set_backend(previous)
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return sorted_values[rank - 1]
+
+
+def measure(call: Callable[[], object], iterations: int) -> dict:
+    """Time `iterations` calls, returns latency percentiles (ms) and throughput"""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter_ns()
+        call()
+        latencies.append((time.perf_counter_ns() - begin) / 1e6)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats = {f"p{percent}_ms": round(_percentile(latencies, percent), 4) for percent in PERCENTILES}
+    stats.update(
+        iterations=iterations,
+        mean_ms=round(sum(latencies) / iterations, 4),
+        max_ms=round(latencies[-1], 4),
+        ops_per_second=round(iterations / elapsed, 1) if elapsed > 0 else None,
+    )
+    return stats
+
+
+def _random_day(rng: random.Random, dataset: Dataset) -> str:
+    return (Date.fromisoformat(dataset.start_date) + timedelta(days=rng.randrange(dataset.days))).isoformat()
+
+
+def _operations(rng: random.Random, dataset: Dataset) -> Dict[str, Callable[[], object]]:
+    """name -> a call that picks fresh random arguments each time it runs"""
+    user_ids, contact_ids = list(dataset.users), list(dataset.contacts)
+    upcoming = [
+        meeting_id for meeting_id, row in dataset.meetings.items()
+        if row["contact_id"] is not None and row["date"] >= dataset.today
+    ] or list(dataset.meetings)
+
+    def get_all_meetings():
+        month_start = _random_day(rng, dataset)
+        month_end = (Date.fromisoformat(month_start) + timedelta(days=30)).isoformat()
+        filters = rng.choice([
+            None,
+            {"date_from": month_start, "date_to": month_end},
+            {"contact_id": rng.choice(contact_ids)},
+            {"internal": False, "has_transcript": True},
+        ])
+        return meeting_service.get_all_meetings(rng.choice(user_ids), filters)
+
+    def find_available_slots():
+        group = rng.sample(user_ids, min(len(user_ids), rng.randint(1, 3)))
+        return meeting_service.find_available_slots(group, _random_day(rng, dataset))
+
+    def create_meeting():
+        day = _random_day(rng, dataset)
+        hour = rng.randint(8, 17)
+        return meeting_service.create_meeting(CreateMeetingRequest(
+            user_id=rng.choice(user_ids), contact_id=rng.choice(contact_ids + [None]),
+            title="Benchmark meeting", date=day, start_hour=hour, end_hour=hour + 1
+        ))
+
+    def get_historical_meetings_for_contact():
+        return data.get_historical_meetings_for_contact(rng.choice(contact_ids), limit=10)
+
+    def generate_pre_meeting_prep():
+        return meeting_service.generate_pre_meeting_prep(rng.choice(upcoming), force=True)
+
+    return {
+        "get_all_meetings": get_all_meetings,
+        "find_available_slots": find_available_slots,
+        "create_meeting": create_meeting,
+        "get_historical_meetings_for_contact": get_historical_meetings_for_contact,
+        "generate_pre_meeting_prep": generate_pre_meeting_prep,
+    }
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    iterations: int = DEFAULT_ITERATIONS,
+    seed: int = 0,
+    operations: Optional[Sequence[str]] = None,
+    log=print
+) -> dict:
+    """
+    Benchmark every operation (or just `operations`) at each dataset size
+
+    Returns {"meta": {...}, "results": [{"size", "users", "contacts",
+    "setup_seconds", "operations": {name: stats}}, ...]}.
+    """
+    results = []
+    for size in sizes:
+        setup_started = time.perf_counter()
+        dataset = generate_dataset(size, seed=seed)
+        with use_dataset(dataset):
+            setup_seconds = time.perf_counter() - setup_started
+            log(f"{size:>9,} meetings: dataset ready in {setup_seconds:.1f}s")
+            # Start every size from a cold LLM cache, so prep timings are comparable
+            meeting_service.llm.clear()
+            rng = random.Random(seed + size)
+            measured = {}
+            for name, call in _operations(rng, dataset).items():
+                if operations and name not in operations:
+                    continue
+                measured[name] = measure(call, iterations)
+                log(f"    {name:<38} p50 {measured[name]['p50_ms']:>9.3f} ms   "
+                    f"p99 {measured[name]['p99_ms']:>9.3f} ms   "
+                    f"{measured[name]['ops_per_second']:>10,.0f} ops/s")
+        results.append({
+            "size": size,
+            "users": len(dataset.users),
+            "contacts": len(dataset.contacts),
+            "setup_seconds": round(setup_seconds, 3),
+            "operations": measured,
+        })
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2,
+                    metric: str = "p50_ms") -> List[str]:
+    """
+    Regressions of current against baseline: one message per (size,
+    operation) present in both whose metric grew by more than threshold
+    """
+    previous = {
+        (result["size"], name): stats
+        for result in baseline["results"] for name, stats in result["operations"].items()
+    }
+    regressions = []
+    for result in current["results"]:
+        for name, stats in result["operations"].items():
+            before = previous.get((result["size"], name))
+            if not before or not before[metric]:
+                continue
+            change = stats[metric] / before[metric] - 1
+            if change > threshold:
+                regressions.append(
+                    f"{name} @ {result['size']:,}: {metric} {before[metric]} -> {stats[metric]} (+{change:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the meeting service hot paths")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated meeting counts (default: 10^3..10^6)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="Calls per operation and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operations", help="Comma-separated subset of operations to run")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative p50 slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+    results = run_benchmarks(
+        [int(size) for size in args.sizes.split(",")],
+        args.iterations,
+        args.seed,
+        args.operations.split(",") if args.operations else None,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_results(json.load(f), results, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
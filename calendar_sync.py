@@ -0,0 +1,200 @@
+"""
+Incremental calendar sync
+
+Applies a feed of upstream calendar changes to the meetings store:
+
+    {"op": "upsert", "external_id": "evt_123", "user_id": "user_1",
+     "contact_id": "contact_1", "title": "Demo", "date": "2026-01-05",
+     "start_hour": 10, "end_hour": 11}
+    {"op": "delete", "external_id": "evt_456"}
+
+- Each external_id maps to a fixed meeting ID, so a record is matched to
+  its meeting with a key lookup rather than a search
+- Upserts are hashed; when the hash equals the sync_hash stored on the
+  meeting the record is skipped without being parsed or written, so
+  re-syncing a whole calendar only does real work for what changed
+- Records are read lazily and applied in batches through the bulk store
+  writes; within a batch only the last record per external_id is applied
+
+Usage:
+    report = sync_jsonl("calendar_delta.jsonl")
+    print(report.created, report.updated, report.unchanged, report.records_per_second)
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+import data
+from models import CreateMeetingRequest, Meeting, SyncReport
+
+MAX_REPORTED_ERRORS = 100
+
+# Fields copied from an upstream record onto the meeting
+SYNCED_FIELDS = tuple(CreateMeetingRequest.model_fields)
+
+
+def meeting_id_for(external_id: str) -> str:
+    """The meeting ID a synced external event is stored under"""
+    return f"meeting_{hashlib.sha256(external_id.encode()).hexdigest()[:16]}"
+
+
+def content_hash(record: dict) -> str:
+    """
+    Hash of the synced fields of an upstream record, as received - computed
+    before validation so unchanged records skip parsing entirely
+    """
+    fields = [record.get(name) for name in SYNCED_FIELDS]
+    payload = json.dumps(fields, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    """
+    Lazily read change records from a JSONL file, one JSON object per line.
+    Unparseable lines are yielded as {"error": ...} so they are counted as failures.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"error": f"Line {line_number}: invalid JSON ({e.msg})"}
+
+
+class _ChangeApplier:
+    """Applies batches of deduplicated change records and counts the outcomes"""
+
+    def __init__(self, report: SyncReport, known_users: dict, known_contacts: dict):
+        self.report = report
+        self.known_users = known_users
+        self.known_contacts = known_contacts
+
+    def fail(self, message: str):
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(message)
+
+    def _references_exist(self, request: CreateMeetingRequest) -> Optional[str]:
+        """Error message for an unknown user or contact, checked once per sync"""
+        if request.user_id not in self.known_users:
+            self.known_users[request.user_id] = data.user_exists(request.user_id)
+        if not self.known_users[request.user_id]:
+            return f"User {request.user_id} not found"
+        if request.contact_id:
+            if request.contact_id not in self.known_contacts:
+                self.known_contacts[request.contact_id] = data.contact_exists(request.contact_id)
+            if not self.known_contacts[request.contact_id]:
+                return f"Contact {request.contact_id} not found"
+        return None
+
+    def apply(self, records: dict):
+        """Apply external_id -> record for one batch"""
+        current = data.meetings_by_id([meeting_id_for(external_id) for external_id in records])
+        created_at = datetime.utcnow().isoformat()
+        puts, deletes = [], []
+
+        for external_id, record in records.items():
+            meeting_id = meeting_id_for(external_id)
+            existing = current.get(meeting_id)
+
+            if record.get("op", "upsert") == "delete":
+                if existing is None:
+                    self.report.missing += 1
+                else:
+                    deletes.append(meeting_id)
+                continue
+
+            record_hash = content_hash(record)
+            if existing is not None and existing.get("sync_hash") == record_hash:
+                self.report.unchanged += 1
+                continue
+
+            try:
+                request = CreateMeetingRequest.model_validate(record)
+            except ValidationError as e:
+                problems = "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+                )
+                self.fail(f"{external_id}: {problems}")
+                continue
+
+            error = self._references_exist(request)
+            if error:
+                self.fail(f"{external_id}: {error}")
+                continue
+
+            # Keep what was added locally (prep, transcript, ...) on updates
+            base = existing or {"id": meeting_id, "created_at": created_at}
+            puts.append(Meeting(**{
+                **base,
+                **request.model_dump(),
+                "external_id": external_id,
+                "sync_hash": record_hash,
+            }))
+            if existing is None:
+                self.report.created += 1
+            else:
+                self.report.updated += 1
+
+        if puts or deletes:
+            # One write, and a meeting deleted since it was read still counts as deleted
+            data.write_meetings(puts, deletes)
+            self.report.deleted += len(deletes)
+
+
+def sync_changes(changes: Iterable[dict], batch_size: int = 500) -> SyncReport:
+    """
+    Apply a stream of change records to the meetings store.
+
+    Reads at most batch_size records at a time, so memory stays bounded
+    for feeds of any length. Invalid records are counted and reported in
+    SyncReport.errors rather than aborting the sync.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    report = SyncReport()
+    applier = _ChangeApplier(report, known_users={}, known_contacts={})
+    started = time.perf_counter()
+    changes = iter(changes)
+
+    while True:
+        chunk = list(islice(changes, batch_size))
+        if not chunk:
+            break
+        report.received += len(chunk)
+
+        # Last record per external_id wins within a batch
+        records = {}
+        for record in chunk:
+            if "error" in record:
+                applier.fail(record["error"])
+                continue
+            external_id = record.get("external_id")
+            if not isinstance(external_id, str) or not external_id:
+                applier.fail(f"Record without an external_id: {record!r:.80}")
+                continue
+            if external_id in records:
+                report.duplicates += 1
+                del records[external_id]  # Re-insert so order follows the latest record
+            records[external_id] = record
+        applier.apply(records)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    if report.elapsed_seconds > 0:
+        report.records_per_second = report.received / report.elapsed_seconds
+    return report
+
+
+def sync_jsonl(path: str, batch_size: int = 500) -> SyncReport:
+    """Apply a JSONL change feed file to the meetings store"""
+    return sync_changes(read_jsonl(path), batch_size)
@@ -3,8 +3,452 @@ Mock database for the Meeting Intelligence API
 In a real application, this would be a proper database (PostgreSQL, MongoDB, etc.)
 """
 
-from typing import Optional, List
-from models import User, Contact, Meeting
+import bisect
+import threading
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager, ExitStack
+from itertools import accumulate, islice
+from typing import Optional, List, Tuple, Iterator, Iterable
+from models import User, Contact, Meeting, MeetingFilters
+import meeting_query
+import timespan
+
+
+class WriteGate:
+    """
+    Tracks a backend's writes so reads can avoid overlapping them
+
+    A write counts as in progress from before it changes anything until
+    its write listeners have returned, so a read that no write overlapped
+    sees the data and everything derived from it by listeners (such as
+    availability's busy masks) in agreement.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._started = 0
+        self._finished = 0
+        self._exclusive = 0  # Readers holding off new writes
+
+    @contextmanager
+    def writing(self):
+        """Mark a write as in progress for the block, including its listeners"""
+        depth = getattr(self._local, "depth", 0)
+        with self._cond:
+            # A write nested in one of this thread's writes must not wait
+            while self._exclusive and not depth:
+                self._cond.wait()
+            self._started += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            with self._cond:
+                self._finished += 1
+                self._cond.notify_all()
+
+    def read(self, read, max_attempts: int = 8):
+        """
+        Run read() against a state that no write overlapped
+
+        Optimistic: if a write was in progress or started during the read,
+        the read is retried. After max_attempts new writes are held off
+        until the ones in progress finish, so a steady stream of writes
+        can't starve readers.
+        """
+        if getattr(self._local, "depth", 0):
+            return read()  # Inside this thread's own write, which can't finish first
+        for _ in range(max_attempts):
+            started = self._started
+            if started != self._finished:
+                time.sleep(0)  # Let the in-progress write finish
+                continue
+            result = read()
+            if self._started == started:
+                return result
+        with self._cond:
+            self._exclusive += 1
+            while self._started != self._finished:
+                self._cond.wait()
+        try:
+            return read()
+        finally:
+            with self._cond:
+                self._exclusive -= 1
+                self._cond.notify_all()
+
+
+class _Timeline:
+    """
+    Immutable sorted sequence, stored as a tuple of sorted chunks
+
+    updated() returns a new timeline that shares every chunk it didn't
+    touch, so an insert or remove copies one chunk and the chunk directory
+    (O(sqrt n) for CHUNK_SIZE ~ sqrt n) instead of the whole sequence.
+    Positions and bisects work as on one flat sorted list.
+    """
+
+    CHUNK_SIZE = 512  # Chunks are split past this and merged below a quarter of it
+
+    __slots__ = ("_chunks", "_lasts", "_offsets")
+
+    def __init__(self, chunks: Iterable[tuple] = ()):
+        self._chunks = tuple(chunks)  # Non-empty sorted tuples, in order
+        self._lasts = [chunk[-1] for chunk in self._chunks]
+        # _offsets[i] is the position of chunk i's first entry; the last is the length
+        self._offsets = [0, *accumulate(len(chunk) for chunk in self._chunks)]
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def bisect_left(self, entry) -> int:
+        """Position of the first entry >= entry"""
+        i = bisect.bisect_left(self._lasts, entry)
+        if i == len(self._chunks):
+            return len(self)
+        return self._offsets[i] + bisect.bisect_left(self._chunks[i], entry)
+
+    def bisect_right(self, entry) -> int:
+        """Position of the first entry > entry"""
+        i = bisect.bisect_right(self._lasts, entry)
+        if i == len(self._chunks):
+            return len(self)
+        return self._offsets[i] + bisect.bisect_right(self._chunks[i], entry)
+
+    def entries(self, lo: int = 0, hi: Optional[int] = None) -> Iterator[tuple]:
+        """Entries at positions [lo, hi), in order"""
+        hi = len(self) if hi is None else min(hi, len(self))
+        i = max(bisect.bisect_right(self._offsets, lo) - 1, 0)
+        while lo < hi:
+            chunk, start = self._chunks[i], self._offsets[i]
+            end = min(hi, start + len(chunk))
+            yield from chunk[lo - start:end - start]
+            lo, i = end, i + 1
+
+    def updated(self, adds: Iterable[tuple], removes: set) -> "_Timeline":
+        """A new timeline with adds inserted and removes (which must be present) removed"""
+        changed = {}  # chunk index -> (adds, removes)
+        last = max(len(self._chunks) - 1, 0)
+        for entry in adds:
+            i = min(bisect.bisect_left(self._lasts, entry), last)
+            changed.setdefault(i, ([], set()))[0].append(entry)
+        for entry in removes:
+            i = bisect.bisect_left(self._lasts, entry)
+            changed.setdefault(i, ([], set()))[1].add(entry)
+
+        chunks = list(self._chunks)
+        # Highest index first, so each chunk is final before its left neighbour is visited
+        for i in sorted(changed, reverse=True):
+            chunk_adds, chunk_removes = changed[i]
+            entries = [entry for entry in (chunks[i] if chunks else ()) if entry not in chunk_removes]
+            entries.extend(chunk_adds)
+            lo, hi = i, min(i + 1, len(chunks))
+            if entries and len(entries) < self.CHUNK_SIZE // 4:
+                # Fold a small chunk into a neighbour: the right one is already
+                # final, the left one only if this update doesn't touch it
+                if i + 1 < len(chunks):
+                    entries.extend(chunks[i + 1])
+                    hi = i + 2
+                elif i > 0 and i - 1 not in changed:
+                    entries.extend(chunks[i - 1])
+                    lo = i - 1
+            entries.sort()
+            # Split evenly, so a split never leaves a sliver behind
+            count = -(-len(entries) // self.CHUNK_SIZE)
+            size = -(-len(entries) // count) if count else 0
+            chunks[lo:hi] = [tuple(entries[start:start + size]) for start in range(0, len(entries), size or 1)]
+        return _Timeline(chunks)
+
+
+_EMPTY_TIMELINE = _Timeline()
+
+
+class MeetingStore(MutableMapping):
+    """
+    Meetings table with secondary indexes
+
+    Behaves like a plain dict of meeting_id -> meeting dict, but keeps
+    per-user, per-contact and per-date (external meetings only) timelines
+    sorted by (date, start_at, id) in sync on every write. Every lookup is a
+    bisect into one of them, so it costs O(log n + results) instead of
+    O(table), including date ranges, keyset paging and most-recent-K.
+
+    Thread safety:
+    - Stored meeting dicts and timelines are never mutated once published;
+      writers build a new one and swap it in. Readers therefore never take
+      a lock and never see a half-applied change to one meeting.
+    - Timelines are chunked (see _Timeline), so a write copies one chunk of
+      each timeline it touches rather than the whole timeline.
+    - Writers lock only the stripe for their meeting_id (and, briefly, the
+      stripe for each timeline they touch), so writes to different
+      meetings don't contend.
+    - read_consistent() runs a multi-lookup read against a state with no
+      write in progress, retrying optimistically before it blocks writes.
+
+    Writes must go through the mapping interface or patch(); mutating a
+    stored meeting dict in place bypasses the indexes.
+    """
+
+    def __init__(self, meetings: Optional[dict] = None, stripes: int = 64):
+        self._rows = {}
+        # Timelines map key -> _Timeline of (date, start_at, meeting_id), oldest first
+        self._user_timeline = {}
+        self._contact_timeline = {}
+        self._external_timeline = {}  # Keyed by date; meetings with a contact only
+        self._row_locks = [threading.Lock() for _ in range(stripes)]
+        self._index_locks = [threading.Lock() for _ in range(stripes)]
+        # Called with [(meeting_id, old_row, new_row), ...] after each write
+        self._listeners = []
+        self._gate = WriteGate()
+        for meeting_id, row in (meetings or {}).items():
+            self[meeting_id] = row
+
+    @contextmanager
+    def _writing(self, meeting_id: str):
+        """Hold the meeting's stripe lock"""
+        with self._row_locks[hash(meeting_id) % len(self._row_locks)]:
+            yield
+
+    @staticmethod
+    def _timeline_entries(meeting_id: str, row: Optional[dict]) -> set:
+        """The (timeline, key, sort key) entries a meeting row belongs to"""
+        if row is None:
+            return set()
+        sort_key = (row["date"], timespan.start_at(row), meeting_id)
+        entries = {("_user_timeline", row["user_id"], sort_key)}
+        if row.get("contact_id") is not None:
+            entries.add(("_contact_timeline", row["contact_id"], sort_key))
+            entries.add(("_external_timeline", row["date"], sort_key))
+        return entries
+
+    def _apply_timeline(self, name: str, key, adds: list, removes: set):
+        """Insert/remove entries in one sorted timeline and publish the new version"""
+        timelines = getattr(self, name)
+        with self._index_locks[hash((name, key)) % len(self._index_locks)]:
+            timeline = timelines.get(key, _EMPTY_TIMELINE).updated(adds, removes)
+            if timeline:
+                timelines[key] = timeline
+            else:
+                timelines.pop(key, None)
+
+    def _reindex(self, changes: List[Tuple[str, Optional[dict], Optional[dict]]]):
+        """
+        Move meetings from the timelines of their old rows to those of their
+        new rows, for a list of (meeting_id, old, new). Each timeline touched
+        is updated once, however many of the meetings fall in it.
+        """
+        timelines = {}  # (timeline, key) -> (adds, removes)
+        for meeting_id, old, new in changes:
+            old_entries = self._timeline_entries(meeting_id, old)
+            new_entries = self._timeline_entries(meeting_id, new)
+            for name, key, sort_key in new_entries.difference(old_entries):
+                timelines.setdefault((name, key), ([], set()))[0].append(sort_key)
+            for name, key, sort_key in old_entries.difference(new_entries):
+                timelines.setdefault((name, key), ([], set()))[1].add(sort_key)
+
+        # Timelines that gain meetings go first, so a meeting never drops out
+        # of every timeline while it moves between them
+        for (name, key), (adds, removes) in sorted(
+            timelines.items(), key=lambda item: not item[1][0]
+        ):
+            self._apply_timeline(name, key, adds, removes)
+
+    def __getitem__(self, meeting_id: str) -> dict:
+        return self._rows[meeting_id]
+
+    def add_listener(self, listener):
+        """
+        Call listener([(meeting_id, old_row, new_row), ...]) after every write
+        (old_row is None for inserts, new_row is None for deletes). Listeners
+        run after the write is visible and outside the store's locks.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, changes: list):
+        for listener in list(self._listeners):
+            listener(changes)
+
+    def __setitem__(self, meeting_id: str, row: dict):
+        row = dict(row)
+        with self._gate.writing():
+            with self._writing(meeting_id):
+                old = self._rows.get(meeting_id)
+                self._rows[meeting_id] = row
+                self._reindex([(meeting_id, old, row)])
+            self._notify([(meeting_id, old, row)])
+
+    def __delitem__(self, meeting_id: str):
+        with self._gate.writing():
+            with self._writing(meeting_id):
+                row = self._rows.pop(meeting_id)
+                self._reindex([(meeting_id, row, None)])
+            self._notify([(meeting_id, row, None)])
+
+    def __iter__(self):
+        # Iterate over a point-in-time copy of the keys so concurrent writes
+        # can't invalidate the iterator
+        return iter(tuple(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, meeting_id) -> bool:
+        return meeting_id in self._rows
+
+    def patch(self, meeting_id: str, updates: dict) -> dict:
+        """Apply a partial update to a meeting and re-index it, returns the new row"""
+        with self._gate.writing():
+            with self._writing(meeting_id):
+                old = self._rows[meeting_id]
+                row = timespan.apply_update(old, updates)
+                self._rows[meeting_id] = row
+                self._reindex([(meeting_id, old, row)])
+            self._notify([(meeting_id, old, row)])
+        return row
+
+    def write_batch(
+        self,
+        puts: Optional[dict] = None,
+        patches: Optional[dict] = None,
+        deletes: Iterable[str] = (),
+        missing_ok: bool = False
+    ) -> dict:
+        """
+        Apply many writes as one: puts (meeting_id -> row), patches
+        (meeting_id -> partial update) and deletes (meeting_ids).
+
+        All-or-nothing: if a patched or deleted meeting doesn't exist, raises
+        KeyError before anything is written - unless missing_ok, which skips
+        deletes of meetings that are already gone. Returns meeting_id -> new
+        row (None for deleted meetings). Indexes are updated once per bucket
+        for the whole batch, and read_consistent() sees none or all of it.
+        """
+        puts = {meeting_id: dict(row) for meeting_id, row in (puts or {}).items()}
+        patches = patches or {}
+        deletes = list(deletes)
+        meeting_ids = set(puts) | set(patches) | set(deletes)
+        stripes = sorted({hash(meeting_id) % len(self._row_locks) for meeting_id in meeting_ids})
+
+        with self._gate.writing():
+            # Stripe locks are always taken in index order, so batches can't deadlock
+            with ExitStack() as stack:
+                for stripe in stripes:
+                    stack.enter_context(self._row_locks[stripe])
+                if missing_ok:
+                    deletes = [meeting_id for meeting_id in deletes if meeting_id in self._rows]
+                for meeting_id in list(patches) + deletes:
+                    if meeting_id not in self._rows:
+                        raise KeyError(meeting_id)
+
+                new_rows = dict(puts)
+                for meeting_id, updates in patches.items():
+                    new_rows[meeting_id] = timespan.apply_update(
+                        new_rows.get(meeting_id, self._rows[meeting_id]), updates
+                    )
+                for meeting_id in deletes:
+                    new_rows[meeting_id] = None
+
+                changes = []
+                for meeting_id, row in new_rows.items():
+                    old = self._rows.get(meeting_id)
+                    if row is None:
+                        self._rows.pop(meeting_id, None)
+                    else:
+                        self._rows[meeting_id] = row
+                    changes.append((meeting_id, old, row))
+                self._reindex(changes)
+            self._notify(changes)
+        return new_rows
+
+    def read_consistent(self, read):
+        """Run read() against a state that no write (or its listeners) overlapped"""
+        return self._gate.read(read)
+
+    # Index lookups - each returns meeting dicts ordered by (date, start_at, id)
+
+    def for_user(self, user_id: str) -> List[dict]:
+        """All meetings owned by a user"""
+        return list(self.iter_timeline("user", user_id))
+
+    def for_contact(self, contact_id: str) -> List[dict]:
+        """All meetings with an external contact"""
+        return list(self.iter_timeline("contact", contact_id))
+
+    def for_user_on(self, user_id: str, date: str) -> List[dict]:
+        """A user's meetings on a given date (YYYY-MM-DD)"""
+        return list(self.iter_timeline("user", user_id, date, date))
+
+
+    def external_on(self, date: str) -> List[dict]:
+        """Meetings with an external contact on a given date, ordered by start time"""
+        return list(self.iter_timeline("external", date))
+
+    def recent_for_contact(self, contact_id: str, limit: int,
+                           before: Optional[Tuple[str, int]] = None) -> List[dict]:
+        """
+        The `limit` most recent meetings with a contact, newest first
+
+        before: optional (date, start_at); only meetings starting strictly
+        earlier are returned. Costs O(log n + limit) via the sorted timeline.
+        """
+        timeline = self._contact_timeline.get(contact_id, _EMPTY_TIMELINE)
+        end = len(timeline) if before is None else timeline.bisect_left(tuple(before))
+        start = max(end - limit, 0)
+        rows = (self._rows.get(entry[2]) for entry in reversed(list(timeline.entries(start, end))))
+        # A concurrent delete may have removed a row since the timeline was read
+        return [row for row in rows if row is not None]
+
+    def _timeline_bounds(self, by: str, key, date_from: Optional[str] = None,
+                         date_to: Optional[str] = None,
+                         after: Optional[Tuple[str, int, str]] = None) -> Tuple["_Timeline", int, int]:
+        """A timeline snapshot and the [lo, hi) positions within the date range and past `after`"""
+        timeline = {
+            "user": self._user_timeline,
+            "contact": self._contact_timeline,
+            "external": self._external_timeline,
+        }[by].get(key, _EMPTY_TIMELINE)
+        lo = 0 if date_from is None else timeline.bisect_left((date_from,))
+        if after is not None:
+            lo = max(lo, timeline.bisect_right(tuple(after)))
+        # (date_to, inf) sorts after every entry on date_to
+        hi = len(timeline) if date_to is None else timeline.bisect_right((date_to, float("inf")))
+        return timeline, lo, hi
+
+    def timeline_count(self, by: str, key, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None) -> int:
+        """
+        Number of meetings for a user (by="user") or contact (by="contact")
+        within an inclusive date range, in O(log n)
+        """
+        _, lo, hi = self._timeline_bounds(by, key, date_from, date_to)
+        return max(hi - lo, 0)
+
+    def iter_timeline(self, by: str, key, date_from: Optional[str] = None,
+                      date_to: Optional[str] = None,
+                      after: Optional[Tuple[str, int, str]] = None) -> Iterator[dict]:
+        """
+        Lazily yield a user's (by="user") or contact's (by="contact") meetings,
+        or a date's meetings with a contact (by="external"), ordered by
+        (date, start_at, id)
+
+        date_from/date_to: optional inclusive date range (YYYY-MM-DD)
+        after: optional (date, start_at, id) sort key; only meetings that
+        sort strictly after it are yielded. Iterates a snapshot of the
+        timeline, so concurrent writes don't disturb the walk.
+        """
+        timeline, lo, hi = self._timeline_bounds(by, key, date_from, date_to, after)
+        for entry in timeline.entries(lo, hi):
+            row = self._rows.get(entry[2])
+            # A concurrent delete may have removed a row since the snapshot
+            if row is not None:
+                yield row
+
 
 # Users database
 USERS = {
@@ -48,7 +492,7 @@ CONTACTS = {
 }
 
 # Meetings database (includes historical and current meetings)
-MEETINGS = {
+MEETINGS = MeetingStore({
     "hist_meeting_1": {
         "id": "hist_meeting_1",
         "user_id": "user_1",
@@ -175,41 +619,205 @@ MEETINGS = {
         "start_hour": 10,
         "end_hour": 11
     }
-}
+})
+
+
+# Storage backends
+
+class InMemoryBackend:
+    """
+    Default storage backend: the module-level USERS, CONTACTS and MEETINGS dicts
+
+    Every backend exposes these methods (see sqlite_backend.SQLiteBackend for
+    the persistent one). Rows are plain dicts with the same keys as the
+    Pydantic models; the helper functions below turn them into models.
+    """
+
+    def __init__(self, users: dict, contacts: dict, meetings: MeetingStore):
+        self.users = users
+        self.contacts = contacts
+        self.meetings = meetings
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self.users.get(user_id)
+
+    def get_contact(self, contact_id: str) -> Optional[dict]:
+        return self.contacts.get(contact_id)
+
+    def get_meeting(self, meeting_id: str) -> Optional[dict]:
+        return self.meetings.get(meeting_id)
+
+    def add_user(self, row: dict):
+        self.users[row["id"]] = row
+
+    def add_contact(self, row: dict):
+        self.contacts[row["id"]] = row
+
+    def add_meeting(self, row: dict):
+        self.meetings[row["id"]] = row
+
+    def add_meetings(self, rows: List[dict]):
+        self.meetings.write_batch(puts={row["id"]: row for row in rows})
+
+    def update_meetings(self, updates: dict) -> List[dict]:
+        new_rows = self.meetings.write_batch(patches=updates)
+        return [new_rows[meeting_id] for meeting_id in updates]
+
+    def delete_meetings(self, meeting_ids: List[str]):
+        self.meetings.write_batch(deletes=meeting_ids)
+
+    def write_meetings(self, rows: List[dict], deleted_ids: List[str]):
+        self.meetings.write_batch(puts={row["id"]: row for row in rows}, deletes=deleted_ids, missing_ok=True)
+
+    def update_meeting(self, meeting_id: str, updates: dict) -> Optional[dict]:
+        try:
+            return self.meetings.patch(meeting_id, updates)
+        except KeyError:
+            return None
+
+    def delete_meeting(self, meeting_id: str) -> bool:
+        try:
+            del self.meetings[meeting_id]
+            return True
+        except KeyError:
+            return False
+
+    def meetings_by_id(self, meeting_ids: List[str]) -> dict:
+        rows = ((meeting_id, self.meetings.get(meeting_id)) for meeting_id in meeting_ids)
+        return {meeting_id: row for meeting_id, row in rows if row is not None}
+
+    def user_exists(self, user_id: str) -> bool:
+        return user_id in self.users
+
+    def contact_exists(self, contact_id: str) -> bool:
+        return contact_id in self.contacts
+
+    def meeting_exists(self, meeting_id: str) -> bool:
+        return meeting_id in self.meetings
+
+    def meetings_for_user_on(self, user_id: str, date: str) -> List[dict]:
+        return self.meetings.for_user_on(user_id, date)
+
+    def meetings_for_contact_on(self, contact_id: str, date: str) -> List[dict]:
+        return list(self.meetings.iter_timeline("contact", contact_id, date, date))
+
+    def external_meetings_on(self, date: str) -> List[dict]:
+        return self.meetings.external_on(date)
+
+    def recent_meetings_for_contact(self, contact_id: str, limit: int,
+                                    before: Optional[Tuple[str, int]] = None) -> List[dict]:
+        return self.meetings.recent_for_contact(contact_id, limit, before)
+
+    def query_meetings(self, user_id: str, filters: MeetingFilters,
+                       after: Optional[Tuple[str, int, str]] = None,
+                       limit: Optional[int] = None) -> List[dict]:
+        return list(islice(meeting_query.execute(self.meetings, user_id, filters, after), limit))
+
+    def add_write_listener(self, listener):
+        self.meetings.add_listener(listener)
+
+    def remove_write_listener(self, listener):
+        self.meetings.remove_listener(listener)
+
+    def read_consistent(self, read):
+        return self.meetings.read_consistent(read)
+
+
+_backend = InMemoryBackend(USERS, CONTACTS, MEETINGS)
+
+# Listeners for meeting writes on whichever backend is active, see add_write_listener()
+_write_listeners = []
+
+
+def _dispatch_writes(changes: Optional[list]):
+    for listener in list(_write_listeners):
+        listener(changes)
+
+
+_backend.add_write_listener(_dispatch_writes)
+
+
+def get_backend():
+    """Return the active storage backend"""
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Switch every helper below to a different storage backend
+    Returns the previous backend so callers (e.g. tests) can restore it
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    previous.remove_write_listener(_dispatch_writes)
+    backend.add_write_listener(_dispatch_writes)
+    # Everything derived from the old backend's data is now invalid
+    _dispatch_writes(None)
+    return previous
+
+
+def add_write_listener(listener):
+    """
+    Call listener(changes) after every meeting write on the active backend
+
+    changes is a list of (meeting_id, old_row, new_row) - old_row is None for
+    inserts and new_row is None for deletes - or None when the backend is
+    swapped and any meeting may have changed. Listeners run after the write
+    is visible to readers, so a cache invalidated here can't keep stale data.
+    """
+    _write_listeners.append(listener)
+
+
+def remove_write_listener(listener):
+    """Stop calling a listener registered with add_write_listener()"""
+    _write_listeners.remove(listener)
 
 
 # Helper functions
 
+def meeting_from_row(meeting_data: dict) -> Meeting:
+    """
+    Build a Meeting from a stored row
+
+    Uses model_validate, which runs in pydantic-core and measures ~2.5x faster
+    than model_construct for this model, and avoids building a kwargs dict.
+    Read paths should call this only for the rows they actually return.
+    """
+    return Meeting.model_validate(meeting_data)
+
+
 def get_user(user_id: str) -> Optional[User]:
     """Get user by ID, returns User model or None"""
-    user_data = USERS.get(user_id)
+    user_data = _backend.get_user(user_id)
     return User(**user_data) if user_data else None
 
 
 def get_contact(contact_id: str) -> Optional[Contact]:
     """Get contact by ID, returns Contact model or None"""
-    contact_data = CONTACTS.get(contact_id)
+    contact_data = _backend.get_contact(contact_id)
     return Contact(**contact_data) if contact_data else None
 
 
 def get_meeting(meeting_id: str) -> Optional[Meeting]:
     """Get meeting by ID, returns Meeting model or None"""
-    meeting_data = MEETINGS.get(meeting_id)
-    return Meeting(**meeting_data) if meeting_data else None
+    meeting_data = _backend.get_meeting(meeting_id)
+    return meeting_from_row(meeting_data) if meeting_data else None
 
 
-def get_historical_meetings_for_contact(contact_id: str, limit: int = 10) -> List[Meeting]:
+def get_historical_meetings_for_contact(
+    contact_id: str,
+    limit: int = 10,
+    before: Optional[Tuple[str, int]] = None
+) -> List[Meeting]:
     """
     Get meetings with a specific contact
     Returns list of Meeting models sorted by date (most recent first)
+
+    before: optional (date, start_at) - only meetings that start strictly
+    earlier are returned, e.g. the history leading up to a given meeting
     """
-    meetings = [
-        Meeting(**meeting) for meeting in MEETINGS.values()
-        if meeting["contact_id"] == contact_id
-    ]
-    # Sort by date descending (date + start_hour for proper ordering)
-    meetings.sort(key=lambda x: (x.date, x.start_hour), reverse=True)
-    return meetings[:limit]
+    rows = _backend.recent_meetings_for_contact(contact_id, limit, before)
+    return [meeting_from_row(row) for row in rows]
 
 
 def add_meeting(meeting: Meeting) -> str:
@@ -218,10 +826,26 @@ def add_meeting(meeting: Meeting) -> str:
     Accepts a Meeting Pydantic model
     Returns the meeting_id
     """
-    meeting_dict = meeting.model_dump()
-    meeting_id = meeting.id
-    MEETINGS[meeting_id] = meeting_dict
-    return meeting_id
+    _backend.add_meeting(meeting.model_dump())
+    return meeting.id
+
+
+_TIME_FIELDS = timespan.SPAN_FIELDS + timespan.HOUR_FIELDS
+
+
+def _validated_updates(current: dict, updates: dict) -> dict:
+    """
+    Validate an update against the current row, raises ValueError if it doesn't
+    validate. Returns the coerced updates; an update to any time field
+    carries all of them, so the span and the hours stay in agreement.
+    """
+    validated = Meeting(**timespan.apply_update(current, updates))
+    if any(key in updates for key in _TIME_FIELDS):
+        updates = {**updates, **{key: None for key in _TIME_FIELDS}}
+    return {
+        key: getattr(validated, key) if key in Meeting.model_fields else value
+        for key, value in updates.items()
+    }
 
 
 def update_meeting(meeting_id: str, updates: dict) -> Optional[Meeting]:
@@ -229,22 +853,130 @@ def update_meeting(meeting_id: str, updates: dict) -> Optional[Meeting]:
     Update a meeting with new data
     Returns updated Meeting model or None if not found
     """
-    if meeting_id in MEETINGS:
-        MEETINGS[meeting_id].update(updates)
-        return Meeting(**MEETINGS[meeting_id])
-    return None
+    current = _backend.get_meeting(meeting_id)
+    if current is None:
+        return None
+
+    # Validate before writing so a bad update never reaches storage, and
+    # store the validated (coerced) values
+    updates = _validated_updates(current, updates)
+
+    meeting_data = _backend.update_meeting(meeting_id, updates)
+    return meeting_from_row(meeting_data) if meeting_data else None
+
+
+def delete_meeting(meeting_id: str) -> bool:
+    """
+    Delete a meeting from the database
+    Returns True if it existed, False otherwise
+    """
+    return _backend.delete_meeting(meeting_id)
+
+
+def add_meetings(meetings: List[Meeting]) -> List[str]:
+    """
+    Add many meetings in one batch
+    Returns the meeting_ids
+    """
+    _backend.add_meetings([meeting.model_dump() for meeting in meetings])
+    return [meeting.id for meeting in meetings]
+
+
+def update_meetings(updates: dict) -> List[Meeting]:
+    """
+    Update many meetings (meeting_id -> updates) in one all-or-nothing batch
+    Returns the updated Meeting models in the same order
+
+    Raises ValueError, writing nothing, if a meeting doesn't exist or an
+    update doesn't validate.
+    """
+    validated_updates = {}
+    for meeting_id, meeting_updates in updates.items():
+        current = _backend.get_meeting(meeting_id)
+        if current is None:
+            raise ValueError(f"Meeting {meeting_id} not found")
+        validated_updates[meeting_id] = _validated_updates(current, meeting_updates)
+
+    try:
+        rows = _backend.update_meetings(validated_updates)
+    except KeyError as e:
+        # Deleted by another writer since it was validated
+        raise ValueError(f"Meeting {e.args[0]} not found")
+    return [meeting_from_row(row) for row in rows]
+
+
+def delete_meetings(meeting_ids: List[str]) -> int:
+    """
+    Delete many meetings in one all-or-nothing batch
+    Returns the number deleted; raises ValueError, deleting nothing, if any
+    of them doesn't exist
+    """
+    meeting_ids = list(dict.fromkeys(meeting_ids))
+    try:
+        _backend.delete_meetings(meeting_ids)
+    except KeyError as e:
+        raise ValueError(f"Meeting {e.args[0]} not found")
+    return len(meeting_ids)
+
+
+def write_meetings(puts: List[Meeting], deletes: List[str]):
+    """
+    Add or replace puts and delete deletes (meeting_ids) in one batch
+    A meeting in deletes that is already gone is skipped, not an error
+    """
+    _backend.write_meetings([meeting.model_dump() for meeting in puts], list(dict.fromkeys(deletes)))
 
 
 def user_exists(user_id: str) -> bool:
     """Check if user exists"""
-    return user_id in USERS
+    return _backend.user_exists(user_id)
 
 
 def contact_exists(contact_id: str) -> bool:
     """Check if contact exists"""
-    return contact_id in CONTACTS
+    return _backend.contact_exists(contact_id)
 
 
 def meeting_exists(meeting_id: str) -> bool:
     """Check if meeting exists"""
-    return meeting_id in MEETINGS
+    return _backend.meeting_exists(meeting_id)
+
+
+# Indexed lookups returning raw meeting dicts, for the service's hot paths
+
+def meetings_for_contact_on(contact_id: str, date: str) -> List[dict]:
+    """Meetings with an external contact on a given date (YYYY-MM-DD)"""
+    return _backend.meetings_for_contact_on(contact_id, date)
+
+
+def external_meetings_on(date: str) -> List[dict]:
+    """Meetings with an external contact on a given date, ordered by start time"""
+    return _backend.external_meetings_on(date)
+
+
+def meetings_by_id(meeting_ids: List[str]) -> dict:
+    """meeting_id -> meeting dict for the given ids that exist"""
+    return _backend.meetings_by_id(meeting_ids)
+
+
+def meetings_for_user_on(user_id: str, date: str) -> List[dict]:
+    """A user's meetings on a given date (YYYY-MM-DD)"""
+    return _backend.meetings_for_user_on(user_id, date)
+
+
+def query_meetings(
+    user_id: str,
+    filters: MeetingFilters,
+    after: Optional[Tuple[str, int, str]] = None,
+    limit: Optional[int] = None
+) -> List[dict]:
+    """
+    Up to `limit` of a user's meetings matching filters, ordered by
+    (date, start_at, id) and starting strictly after the `after` sort key
+    """
+    return _backend.query_meetings(user_id, filters, after, limit)
+
+
+def read_consistent(read):
+    """Run read() against a consistent snapshot of the meetings data"""
+    return _backend.read_consistent(read)
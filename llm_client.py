@@ -21,10 +21,14 @@ Usage:
         print(f"LLM call failed: {e}")
 """
 
+import asyncio
+import hashlib
 import json
 import re
+import threading
 import time
 import random
+from collections import OrderedDict
 from typing import Optional
 
 
@@ -33,6 +37,26 @@ class LLMAPIError(Exception):
     pass
 
 
+class RateLimitError(LLMAPIError):
+    """Too many requests - retry after backing off"""
+    pass
+
+
+class APITimeoutError(LLMAPIError):
+    """The API took too long to respond"""
+    pass
+
+
+class ServiceUnavailableError(LLMAPIError):
+    """The API is temporarily unavailable"""
+    pass
+
+
+class InvalidRequestError(LLMAPIError):
+    """The request itself was rejected - retrying will not help"""
+    pass
+
+
 class MockLLMClient:
     """
     Simulates an LLM API client with realistic response patterns
@@ -41,6 +65,15 @@ class MockLLMClient:
     API reliability issues. You must implement proper error handling!
     """
 
+    KEY_TOPICS = (
+        "Product capabilities and features",
+        "Implementation timeline and resources",
+        "Pricing and contract terms",
+        "Technical integration requirements",
+        "Team training and onboarding",
+        "Success metrics and ROI",
+    )
+
     def __init__(self, simulate_latency=False, failure_rate=0.2):
         """
         Initialize the mock client
@@ -66,24 +99,41 @@ class MockLLMClient:
         Raises:
             LLMAPIError: Randomly raised ~20% of the time to simulate API failures
         """
-        # Simulate random API failures (20% failure rate)
-        if random.random() < self.failure_rate:
-            error_types = [
-                ("RateLimitError", "Rate limit exceeded. Please retry after a short delay."),
-                ("TimeoutError", "Request timed out. The API took too long to respond."),
-                ("ServiceUnavailableError", "Service temporarily unavailable. Please retry."),
-                ("InvalidRequestError", "Invalid request format or parameters."),
-            ]
-            error_type, error_message = random.choice(error_types)
-            raise LLMAPIError(f"{error_type}: {error_message}")
+        self._maybe_fail()
 
         # Simulate API latency
         if self.simulate_latency:
             time.sleep(0.5)
 
+        return self._respond(prompt)
+
+    def _maybe_fail(self):
+        """Simulate random API failures (20% failure rate)"""
+        if random.random() < self.failure_rate:
+            error_types = [
+                (RateLimitError, "RateLimitError", "Rate limit exceeded. Please retry after a short delay."),
+                (APITimeoutError, "TimeoutError", "Request timed out. The API took too long to respond."),
+                (ServiceUnavailableError, "ServiceUnavailableError", "Service temporarily unavailable. Please retry."),
+                (InvalidRequestError, "InvalidRequestError", "Invalid request format or parameters."),
+            ]
+            error_class, error_type, error_message = random.choice(error_types)
+            raise error_class(f"{error_type}: {error_message}")
+
+    def _respond(self, prompt: str) -> str:
+        """Build the mock response for a prompt"""
         # Analyze prompt to determine what type of response to generate
         prompt_lower = prompt.lower()
 
+        # Combined transcript analysis for one or more meetings
+        if "transcript analysis request" in prompt_lower:
+            return self._generate_transcript_analysis(prompt)
+
+        # Map-reduce analysis of long transcripts
+        if "transcript chunk request" in prompt_lower:
+            return self._generate_chunk_summary(prompt)
+        if "transcript summary reduce request" in prompt_lower:
+            return self._generate_summary_reduce(prompt)
+
         # Pre-meeting context generation
         if "prepare" in prompt_lower or "context" in prompt_lower or "upcoming meeting" in prompt_lower:
             return self._generate_meeting_context(prompt)
@@ -170,14 +220,7 @@ PENDING ACTION ITEMS:
     def _generate_key_topics(self, prompt: str) -> str:
         """Generate key topics from transcript"""
         # Provide realistic topics based on a business meeting
-        topics = [
-            "Product capabilities and features",
-            "Implementation timeline and resources",
-            "Pricing and contract terms",
-            "Technical integration requirements",
-            "Team training and onboarding",
-            "Success metrics and ROI"
-        ]
+        topics = list(self.KEY_TOPICS)
 
         # Select 3-5 topics
         import random
@@ -220,6 +263,39 @@ PENDING ACTION ITEMS:
             }
         }, indent=2)
 
+    def _generate_transcript_analysis(self, prompt: str) -> str:
+        """Generate summary, action items, topics and sentiment per meeting section"""
+        sections = re.split(r"^=== MEETING (\S+): .* ===$", prompt, flags=re.MULTILINE)
+        # re.split gives [preamble, id1, text1, id2, text2, ...]
+        results = {
+            meeting_id: self._analyze_section(transcript)
+            for meeting_id, transcript in zip(sections[1::2], sections[2::2])
+        }
+        return json.dumps({"meetings": results}, indent=2)
+
+    def _generate_chunk_summary(self, prompt: str) -> str:
+        """Generate the analysis of one chunk of a long transcript"""
+        chunk = re.split(r"^=== TRANSCRIPT CHUNK ===$", prompt, maxsplit=1, flags=re.MULTILINE)[-1]
+        return json.dumps(self._analyze_section(chunk), indent=2)
+
+    def _generate_summary_reduce(self, prompt: str) -> str:
+        """Combine partial summaries: the distinct lead sentences, in order"""
+        parts = re.split(r"^=== PART \d+ ===$", prompt, flags=re.MULTILINE)[1:]
+        sentences = dict.fromkeys(part.strip().split(". ")[0].rstrip(".") for part in parts)
+        return json.dumps({"summary": ". ".join(list(sentences)[:3]) + "."}, indent=2)
+
+    def _analyze_section(self, transcript: str) -> dict:
+        """Summary, action items, topics and sentiment for one transcript"""
+        action_items = json.loads(self._generate_action_items(transcript))["action_items"]
+        sentiment = json.loads(self._generate_sentiment(transcript))["sentiment"]
+        topics = random.Random(len(transcript)).sample(self.KEY_TOPICS, k=3)
+        return {
+            "summary": f"The meeting covered {topics[0].lower()} and {topics[1].lower()}. {sentiment['summary']}",
+            "action_items": [{"task": item["task"], "owner": item["owner"]} for item in action_items[:2]],
+            "key_topics": topics,
+            "sentiment": sentiment,
+        }
+
     def _generate_follow_ups(self, prompt: str) -> str:
         """Generate follow-up recommendations"""
         follow_ups = [
@@ -238,6 +314,178 @@ PENDING ACTION ITEMS:
         return json.dumps({"follow_ups": selected}, indent=2)
 
 
+class AsyncMockLLMClient(MockLLMClient):
+    """
+    asyncio version of MockLLMClient
+
+    Same responses and failure behaviour, but generate() is a coroutine and
+    simulated latency uses asyncio.sleep, so many calls can be in flight at
+    once on a single event loop.
+    """
+
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Generate a response based on the prompt (awaitable)
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt (instruction for the LLM)
+
+        Returns:
+            JSON-formatted string response
+
+        Raises:
+            LLMAPIError: Randomly raised ~20% of the time to simulate API failures
+        """
+        self._maybe_fail()
+
+        # Simulate API latency without blocking the event loop
+        if self.simulate_latency:
+            await asyncio.sleep(0.5)
+
+        return self._respond(prompt)
+
+
+class ResponseCache:
+    """
+    Thread-safe string cache with least-recently-used eviction and a TTL
+
+    Holds at most max_size entries; each expires ttl_seconds after it was
+    stored. Hits and misses are counted for stats().
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = 3600.0,
+                 clock=time.monotonic):
+        """
+        Args:
+            max_size: Maximum number of cached entries
+            ttl_seconds: Seconds an entry stays valid (None = never expires)
+            clock: Time source, injectable for tests
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value and count the hit/miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """Store a value, evicting the least recently used entry if full"""
+        expires_at = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedLLMClient(ResponseCache):
+    """
+    Response cache in front of an LLM client
+
+    Responses are keyed on a hash of (prompt, system_prompt), bounded to
+    max_size entries with least-recently-used eviction, and expire after
+    ttl_seconds. Failed calls raise through and are never cached.
+
+    Usage:
+        client = CachedLLMClient(MockLLMClient(), max_size=512, ttl_seconds=600)
+        client.generate("...")  # miss - calls the wrapped client
+        client.generate("...")  # hit - no LLM call
+    """
+
+    def __init__(self, client, max_size: int = 1024, ttl_seconds: Optional[float] = 3600.0,
+                 clock=time.monotonic):
+        """
+        Args:
+            client: Wrapped client exposing generate(prompt, system_prompt)
+            max_size: Maximum number of cached responses
+            ttl_seconds: Seconds a response stays valid (None = never expires)
+            clock: Time source, injectable for tests
+        """
+        super().__init__(max_size, ttl_seconds, clock)
+        self.client = client
+
+    @staticmethod
+    def cache_key(prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Stable hash of the inputs that determine a response"""
+        digest = hashlib.sha256()
+        digest.update(prompt.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update((system_prompt or "").encode("utf-8"))
+        return digest.hexdigest()
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Return a cached response, or call the wrapped client and cache it"""
+        key = self.cache_key(prompt, system_prompt)
+        response = self.get(key)
+        if response is None:
+            # LLMAPIError propagates before anything is stored
+            response = self.client.generate(prompt, system_prompt)
+            self.put(key, response)
+        return response
+
+    def refresh(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Call the wrapped client even if a response is cached, and cache the new one"""
+        response = self.client.generate(prompt, system_prompt)
+        self.put(self.cache_key(prompt, system_prompt), response)
+        return response
+
+
+class AsyncCachedLLMClient(CachedLLMClient):
+    """CachedLLMClient for an async client such as AsyncMockLLMClient"""
+
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Return a cached response, or await the wrapped client and cache it"""
+        key = self.cache_key(prompt, system_prompt)
+        response = self.get(key)
+        if response is None:
+            response = await self.client.generate(prompt, system_prompt)
+            self.put(key, response)
+        return response
+
+    async def refresh(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Await the wrapped client even if a response is cached, and cache the new one"""
+        response = await self.client.generate(prompt, system_prompt)
+        self.put(self.cache_key(prompt, system_prompt), response)
+        return response
+
+
 # Example usage (for testing)
 if __name__ == "__main__":
     client = MockLLMClient()
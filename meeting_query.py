@@ -0,0 +1,103 @@
+"""
+Filter engine for meeting queries
+
+Turns a filters dict into a MeetingFilters model, picks the narrowest index
+to read from, and applies the remaining filters row by row as the index is
+walked:
+
+- contact_id and the user are each backed by a sorted timeline in
+  MeetingStore, and both timelines are sorted by date, so a date range is
+  two bisects on whichever timeline is chosen
+- the planner counts the rows each candidate timeline has inside the date
+  range (O(log n) each) and reads from the smaller one
+- every other filter is a per-row check on the rows that index produces
+
+Usage:
+    filters = parse_filters({"date_from": "2025-11-01", "has_transcript": True})
+    rows = execute(data.MEETINGS, "user_1", filters)  # lazy, sorted by date
+"""
+
+from datetime import datetime
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from models import MeetingFilters
+
+
+class QueryPlan(NamedTuple):
+    """How a query will be answered"""
+    index: str  # "user" or "contact" timeline
+    key: str  # user_id or contact_id to read the timeline of
+    estimated_rows: int  # Rows the index yields before per-row filters
+    residual: Tuple[str, ...]  # Filters checked row by row, in order
+
+
+def parse_filters(filters: Optional[dict]) -> MeetingFilters:
+    """Validate a filters dict, raises ValueError for unknown or malformed filters"""
+    if isinstance(filters, MeetingFilters):
+        return filters
+    parsed = MeetingFilters.model_validate(filters or {})
+    for name in ("date_from", "date_to"):
+        value = getattr(parsed, name)
+        if value is not None:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"Invalid {name}: {value}. Expected YYYY-MM-DD")
+    return parsed
+
+
+def _residual_checks(filters: MeetingFilters, user_id: str,
+                     index: str) -> List[Tuple[str, Callable[[dict], bool]]]:
+    """Per-row checks for the filters the chosen index doesn't answer, cheapest first"""
+    checks = []
+    if index == "contact":
+        checks.append(("user_id", lambda row: row["user_id"] == user_id))
+    elif filters.contact_id is not None:
+        checks.append(("contact_id", lambda row: row.get("contact_id") == filters.contact_id))
+    if filters.hour_from is not None:
+        checks.append(("hour_from", lambda row: row["start_hour"] >= filters.hour_from))
+    if filters.hour_to is not None:
+        checks.append(("hour_to", lambda row: row["end_hour"] <= filters.hour_to))
+    if filters.internal is not None:
+        checks.append(("internal", lambda row: (row.get("contact_id") is None) == filters.internal))
+    if filters.sentiment is not None:
+        checks.append(("sentiment", lambda row: row.get("sentiment") == filters.sentiment))
+    if filters.has_transcript is not None:
+        checks.append(("has_transcript", lambda row: bool(row.get("transcript")) == filters.has_transcript))
+    if filters.has_prep is not None:
+        checks.append(("has_prep", lambda row: bool(row.get("prep")) == filters.has_prep))
+    if filters.title_contains is not None:
+        needle = filters.title_contains.lower()
+        checks.append(("title_contains", lambda row: needle in row["title"].lower()))
+    return checks
+
+
+def plan(store, user_id: str, filters: MeetingFilters) -> QueryPlan:
+    """Choose the timeline with the fewest rows in the requested date range"""
+    candidates = [("user", user_id)]
+    if filters.contact_id is not None:
+        candidates.append(("contact", filters.contact_id))
+
+    estimated_rows, index, key = min(
+        (store.timeline_count(index, key, filters.date_from, filters.date_to), index, key)
+        for index, key in candidates
+    )
+    return QueryPlan(
+        index=index,
+        key=key,
+        estimated_rows=estimated_rows,
+        residual=tuple(name for name, _ in _residual_checks(filters, user_id, index))
+    )
+
+
+def execute(store, user_id: str, filters: MeetingFilters,
+            after: Optional[Tuple[str, int, str]] = None) -> Iterator[dict]:
+    """
+    Lazily yield a user's meeting rows matching filters, ordered by
+    (date, start_at, id) and starting strictly after the `after` sort key
+    """
+    query_plan = plan(store, user_id, filters)
+    checks = [check for _, check in _residual_checks(filters, user_id, query_plan.index)]
+    rows = store.iter_timeline(query_plan.index, query_plan.key,
+                               filters.date_from, filters.date_to, after)
+    return (row for row in rows if all(check(row) for check in checks))
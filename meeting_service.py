@@ -5,15 +5,67 @@ Fully implemented solution for all phases.
 """
 
 import data
-from models import Meeting, User, Contact, CreateMeetingRequest, TimeSlot
-from llm_client import MockLLMClient, LLMAPIError
-from typing import List, Optional
-from datetime import datetime
+import availability
+import meeting_query
+import prompt_budget
+import scheduler
+import timespan
+import transcript_analysis
+from models import (
+    Meeting, MeetingPage, User, Contact, CreateMeetingRequest, TimeSlot, PrepResult,
+    Participant, SlotSuggestion, AnalysisResult, MeetingAnalysis,
+)
+from llm_client import (
+    MockLLMClient,
+    AsyncMockLLMClient,
+    CachedLLMClient,
+    AsyncCachedLLMClient,
+    ResponseCache,
+    LLMAPIError,
+)
+import resilience
+from resilience import (
+    AsyncBreakerLLMClient,
+    BreakerLLMClient,
+    CircuitBreaker,
+    RetryBudget,
+    RetryBudgetExhaustedError,
+    SingleFlight,
+)
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import hashlib
 import time
 import uuid
 import json
 
-llm = MockLLMClient(failure_rate=0.0)
+# Shared by every caller in the process, so an LLM outage is detected once
+# and retries across all requests stay bounded
+llm_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
+# Identical prompts (same contact and history) are served from the cache;
+# only misses go through the breaker, so cached prep outlives an outage
+llm = CachedLLMClient(BreakerLLMClient(MockLLMClient(failure_rate=0.0), llm_breaker),
+                      max_size=1024, ttl_seconds=3600)
+async_llm = AsyncCachedLLMClient(AsyncBreakerLLMClient(AsyncMockLLMClient(failure_rate=0.0), llm_breaker),
+                                 max_size=1024, ttl_seconds=3600)
+llm_retry_budget = RetryBudget(capacity=10.0, deposit_per_request=0.2, refill_per_second=1.0)
+
+# Concurrent prep requests for the same (meeting_id, fingerprint) share one
+# generation: prep_flights per LLM attempt, prep_retry_flights per retry loop
+prep_flights = SingleFlight()
+prep_retry_flights = SingleFlight()
+
+# Past meetings considered for a prep prompt; the token budget decides how many fit
+PREP_HISTORY_LIMIT = 10
+PREP_PROMPT_TOKENS = prompt_budget.DEFAULT_MAX_TOKENS
+
+# Partial analyses of long-transcript chunks, keyed by the chunk's hash. A
+# chunk's text fully determines its result, so entries never expire and an
+# edited transcript only re-analyzes the chunks that changed
+chunk_cache = ResponseCache(max_size=8192, ttl_seconds=None)
 
 
 # ============================================================================
@@ -23,24 +75,100 @@ llm = MockLLMClient(failure_rate=0.0)
 def get_all_meetings(user_id: str, filters: Optional[dict] = None) -> List[Meeting]:
     """
     Get all meetings for a user with optional filtering.
+
+    Supported filters (see MeetingFilters): contact_id, date_from, date_to,
+    hour_from, hour_to, internal, sentiment, has_transcript, has_prep and
+    title_contains. Meetings are returned in (date, start_at, id) order.
     """
     # Validate user exists
     if not data.user_exists(user_id):
         raise ValueError(f"User {user_id} not found")
 
-    # Get all meetings for user
-    meetings = [
-        meeting for meeting in data.MEETINGS.values()
-        if meeting["user_id"] == user_id
-    ]
-
-    # Apply filters if provided
-    if filters:
-        if "contact_id" in filters:
-            meetings = [m for m in meetings if m.get("contact_id") == filters["contact_id"]]
+    # Reads from the narrowest index, then filters the (small) result
+    rows = data.query_meetings(user_id, meeting_query.parse_filters(filters))
 
     # Convert to Meeting objects
-    return [Meeting(**meeting) for meeting in meetings]
+    return [data.meeting_from_row(row) for row in rows]
+
+
+def _encode_cursor(row: dict) -> str:
+    """Opaque cursor pointing just past a meeting in (date, start_at, id) order"""
+    key = [row["date"], timespan.start_at(row), row["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int, str]:
+    try:
+        date, start_at, meeting_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not (isinstance(date, str) and isinstance(start_at, int) and isinstance(meeting_id, str)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return date, start_at, meeting_id
+
+
+def get_meetings_page(
+    user_id: str,
+    filters: Optional[dict] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> MeetingPage:
+    """
+    Get one page of a user's meetings, ordered by (date, start_at, id).
+
+    Pass the returned next_cursor back to fetch the following page. The
+    ordering key is stable, so meetings created or deleted between calls
+    don't cause rows to be skipped or repeated. Supports the same filters
+    as get_all_meetings.
+    """
+    if not data.user_exists(user_id):
+        raise ValueError(f"User {user_id} not found")
+    if limit < 1:
+        raise ValueError("Limit must be at least 1")
+
+    parsed = meeting_query.parse_filters(filters)
+    after = _decode_cursor(cursor) if cursor is not None else None
+    # Fetch one extra row to learn whether there is a next page
+    rows = data.query_meetings(user_id, parsed, after, limit + 1)
+
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return MeetingPage(
+        meetings=[data.meeting_from_row(row) for row in rows[:limit]],
+        next_cursor=next_cursor
+    )
+
+
+def iter_meetings(
+    user_id: str,
+    filters: Optional[dict] = None,
+    page_size: int = 100
+) -> Iterator[Meeting]:
+    """
+    Lazily yield a user's meetings in (date, start_at, id) order.
+
+    Fetches page_size rows at a time, so memory stays bounded and the first
+    meeting arrives without reading the whole history. Inputs are validated
+    up front, before the first meeting is requested.
+    """
+    if not data.user_exists(user_id):
+        raise ValueError(f"User {user_id} not found")
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+
+    parsed = meeting_query.parse_filters(filters)
+
+    def pages():
+        after = None
+        while True:
+            rows = data.query_meetings(user_id, parsed, after, page_size)
+            for row in rows:
+                yield data.meeting_from_row(row)
+            if len(rows) < page_size:
+                return
+            last = rows[-1]
+            after = (last["date"], timespan.start_at(last), last["id"])
+
+    return pages()
 
 
 def get_meeting(meeting_id: str) -> Meeting:
@@ -75,9 +203,8 @@ def create_meeting(meeting_request: CreateMeetingRequest) -> Meeting:
         user_id=meeting_request.user_id,
         contact_id=meeting_request.contact_id,
         title=meeting_request.title,
-        date=meeting_request.date,
-        start_hour=meeting_request.start_hour,
-        end_hour=meeting_request.end_hour,
+        start_at=meeting_request.start_at,
+        end_at=meeting_request.end_at,
         created_at=datetime.utcnow().isoformat()
     )
 
@@ -95,77 +222,193 @@ def delete_meeting(meeting_id: str) -> bool:
         raise ValueError(f"Meeting {meeting_id} not found")
 
     # Delete from database
-    del data.MEETINGS[meeting_id]
-    return True
+    return data.delete_meeting(meeting_id)
+
+
+def _validate_references(user_ids, contact_ids) -> None:
+    """Check each distinct user and contact once, raise ValueError for unknown ones"""
+    for user_id in dict.fromkeys(user_ids):
+        if not data.user_exists(user_id):
+            raise ValueError(f"User {user_id} not found")
+    for contact_id in dict.fromkeys(contact_ids):
+        if contact_id and not data.contact_exists(contact_id):
+            raise ValueError(f"Contact {contact_id} not found")
+
+
+def create_meetings(meeting_requests: List[CreateMeetingRequest]) -> List[Meeting]:
+    """
+    Create many meetings in one all-or-nothing batch.
+
+    Every referenced user and contact is validated once up front; if any
+    is unknown, raises ValueError and nothing is created.
+    """
+    _validate_references(
+        (request.user_id for request in meeting_requests),
+        (request.contact_id for request in meeting_requests)
+    )
+
+    created_at = datetime.utcnow().isoformat()
+    meetings = [
+        Meeting(
+            id=f"meeting_{uuid.uuid4().hex[:8]}",
+            user_id=request.user_id,
+            contact_id=request.contact_id,
+            title=request.title,
+            start_at=request.start_at,
+            end_at=request.end_at,
+            created_at=created_at
+        )
+        for request in meeting_requests
+    ]
+
+    data.add_meetings(meetings)
+    return meetings
+
+
+def update_meetings(updates: Dict[str, dict]) -> List[Meeting]:
+    """
+    Update many meetings (meeting_id -> field updates) in one all-or-nothing batch.
+
+    Raises ValueError, updating nothing, if a meeting doesn't exist, an
+    update names an unknown user or contact, or a value doesn't validate.
+    Returns the updated meetings in the order given.
+    """
+    for meeting_id, meeting_updates in updates.items():
+        if meeting_updates.get("id", meeting_id) != meeting_id:
+            raise ValueError(f"Cannot change the id of meeting {meeting_id}")
+
+    _validate_references(
+        (u["user_id"] for u in updates.values() if "user_id" in u),
+        (u["contact_id"] for u in updates.values() if "contact_id" in u)
+    )
+
+    return data.update_meetings(updates)
+
+
+def delete_meetings(meeting_ids: List[str]) -> int:
+    """
+    Delete many meetings in one all-or-nothing batch.
+
+    Raises ValueError, deleting nothing, if any meeting doesn't exist.
+    Returns the number of meetings deleted.
+    """
+    return data.delete_meetings(meeting_ids)
 
 
 # ============================================================================
 # PHASE 3: Availability Function
 # ============================================================================
 
+def _validate_user_ids(user_ids: List[str]) -> None:
+    """Raise ValueError if the user list is empty or names an unknown user"""
+    if not user_ids:
+        raise ValueError("user_ids cannot be empty")
+
+    for user_id in user_ids:
+        if not data.user_exists(user_id):
+            raise ValueError(f"User {user_id} not found")
+
+
+def _slot_minutes(duration_hours: int, duration_minutes: Optional[int]) -> int:
+    """The slot length in minutes; duration_minutes wins over duration_hours"""
+    if duration_minutes is not None:
+        if duration_minutes <= 0:
+            raise ValueError("duration_minutes must be positive")
+        return duration_minutes
+    if duration_hours <= 0:
+        raise ValueError("duration_hours must be positive")
+    return duration_hours * 60
+
+
+def _time_slot(day: str, start: int, end: int) -> TimeSlot:
+    """A TimeSlot for minutes [start, end) past the day's midnight"""
+    start_at, end_at = timespan.day_start(day) + start, timespan.day_start(day) + end
+    return TimeSlot(**timespan.hour_fields(start_at, end_at), start_at=start_at, end_at=end_at)
+
+
 def find_available_slots(
     user_ids: List[str],
     date: str,
     duration_hours: int = 1,
-    work_hours: tuple = (9, 17)
+    work_hours: tuple = (9, 17),
+    duration_minutes: Optional[int] = None,
+    step_minutes: int = 60
 ) -> List[TimeSlot]:
     """
     Find time slots when all users are available.
+
+    The slot length is duration_minutes if given, else duration_hours.
+    Candidate starts are step_minutes apart from the start of work hours;
+    a slot that doesn't start on the hour has start_hour rounded down and
+    end_hour rounded up, with the exact minutes in start_at/end_at.
     """
-    # Validate inputs
-    if not user_ids:
-        raise ValueError("user_ids cannot be empty")
+    _validate_user_ids(user_ids)
+    minutes = _slot_minutes(duration_hours, duration_minutes)
 
-    # Validate all users exist
-    for user_id in user_ids:
-        if not data.user_exists(user_id):
-            raise ValueError(f"User {user_id} not found")
+    # Compute common free windows with the bitmask availability engine
+    free_slots = availability.find_free_slots(user_ids, date, minutes, work_hours, step_minutes)
+    return [_time_slot(date, start, end) for start, end in free_slots]
 
-    # Get all meetings for all users on this date
-    busy_hours = set()
 
-    for user_id in user_ids:
-        user_meetings = [
-            m for m in data.MEETINGS.values()
-            if m["user_id"] == user_id and m.get("date", "") == date
-        ]
-
-        # Add all busy hours to the set
-        for meeting in user_meetings:
-            start_hour = meeting.get("start_hour")
-            end_hour = meeting.get("end_hour")
-            if start_hour is not None and end_hour is not None:
-                # A meeting from 10-12 means hours 10 and 11 are busy
-                for hour in range(start_hour, end_hour):
-                    busy_hours.add(hour)
-
-    # Find available slots
-    available_slots = []
-    work_start, work_end = work_hours
-
-    # Look for consecutive free hours
-    hour = work_start
-    while hour + duration_hours <= work_end:
-        # Check if all hours in this slot are free
-        slot_hours = range(hour, hour + duration_hours)
-        if all(h not in busy_hours for h in slot_hours):
-            available_slots.append(TimeSlot(
-                date=date,
-                start_hour=hour,
-                end_hour=hour + duration_hours
-            ))
-        hour += 1
-
-    return available_slots
+def find_available_slots_in_range(
+    user_ids: List[str],
+    start_date: str,
+    end_date: str,
+    duration_hours: int = 1,
+    work_hours: tuple = (9, 17),
+    limit: Optional[int] = None,
+    duration_minutes: Optional[int] = None,
+    step_minutes: int = 60
+) -> Iterator[TimeSlot]:
+    """
+    Find time slots when all users are available across a date range.
+
+    Returns a generator that walks the days in order and stops as soon as
+    `limit` slots have been produced (or the range is exhausted).
+    Inputs are validated up front, before the first slot is requested.
+    Slot length and spacing work as in find_available_slots.
+    """
+    _validate_user_ids(user_ids)
+    minutes = _slot_minutes(duration_hours, duration_minutes)
+
+    free_slots = availability.iter_free_slots(
+        user_ids, start_date, end_date, minutes, work_hours, step_minutes, limit=limit
+    )
+    return (_time_slot(day, start, end) for day, start, end in free_slots)
+
+
+def suggest_meeting_times(
+    participants: List[Participant],
+    start_date: str,
+    end_date: str,
+    duration_minutes: int = 60,
+    top_n: int = 5
+) -> List[SlotSuggestion]:
+    """
+    Rank the best times for a meeting across participants' time zones,
+    work hours, preferred hours and buffers. Returns up to top_n
+    suggestions (UTC), best first.
+    """
+    for participant in participants:
+        if participant.is_contact:
+            if not data.contact_exists(participant.id):
+                raise ValueError(f"Contact {participant.id} not found")
+        elif not data.user_exists(participant.id):
+            raise ValueError(f"User {participant.id} not found")
+
+    return scheduler.suggest_meeting_times(
+        participants, start_date, end_date, duration_minutes, top_n
+    )
 
 
 # ============================================================================
 # PHASE 4: Pre-Meeting Prep
 # ============================================================================
 
-def generate_pre_meeting_prep(meeting_id: str) -> Meeting:
+def _load_prep_inputs(meeting_id: str) -> Tuple[Meeting, Contact, List[Meeting]]:
     """
-    Generate pre-meeting preparation for external meetings.
+    Validate a meeting for prep and load the contact and history it is built from.
+    Raises ValueError for unknown meetings, internal meetings and unknown contacts.
     """
     # Get meeting
     meeting = data.get_meeting(meeting_id)
@@ -181,44 +424,104 @@ def generate_pre_meeting_prep(meeting_id: str) -> Meeting:
     if not contact:
         raise ValueError(f"Contact {meeting.contact_id} not found")
 
-    # Get historical meetings with this contact
-    past_meetings = data.get_historical_meetings_for_contact(meeting.contact_id, limit=5)
+    # Get historical meetings with this contact that happened before this one
+    past_meetings = data.get_historical_meetings_for_contact(
+        meeting.contact_id, limit=PREP_HISTORY_LIMIT, before=(meeting.date, meeting.start_at)
+    )
+
+    return meeting, contact, past_meetings
 
-    # Build prompt
-    contact_info = f"{contact.name} - {contact.role} at {contact.company}"
 
-    history_str = ""
+def _prep_fingerprint(meeting: Meeting, contact: Contact, past_meetings: List[Meeting]) -> str:
+    """
+    Hash of every input the prep prompt is built from.
+    If it matches the fingerprint stored with a meeting's prep, the prep is up to date.
+    """
+    inputs = {
+        "title": meeting.title,
+        "contact": contact.model_dump(),
+        "history": [
+            {
+                "id": m.id,
+                "date": m.date,
+                "title": m.title,
+                "summary": m.summary,
+                "action_items": m.action_items,
+            }
+            for m in past_meetings
+        ],
+        "max_tokens": PREP_PROMPT_TOKENS,
+    }
+    encoded = json.dumps(inputs, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _build_prep_prompt(
+    meeting: Meeting,
+    contact: Contact,
+    past_meetings: List[Meeting],
+    max_tokens: int = PREP_PROMPT_TOKENS
+) -> prompt_budget.BuiltPrompt:
+    """
+    Build the LLM prompt for a meeting's prep within a token budget.
+
+    Past meetings (most recent first) are ranked by recency and by how
+    much they mention the upcoming meeting's title; the best are included
+    in full, then as a title line only, until the budget is used up. They
+    appear in the prompt in date order, most recent first.
+    """
+    builder = prompt_budget.PromptBuilder(max_tokens)
+    builder.add("You are helping prepare someone for an upcoming meeting.")
+    builder.add("")
+    builder.add(f"Upcoming meeting: {meeting.title}")
+    builder.add("")
+    builder.add("Contact Information:")
+    builder.add(f"{contact.name} - {contact.role} at {contact.company}")
+    builder.add("")
+
     if past_meetings:
-        history_str = f"\n\nPast meetings ({len(past_meetings)} total):\n"
-        for m in past_meetings[:3]:  # Just include last 3
-            history_str += f"- {m.date}: {m.title}\n"
+        builder.add(f"Past meetings ({len(past_meetings)} total):")
+        query = prompt_budget.keywords(meeting.title)
+        for age, m in enumerate(past_meetings):
+            lines = [f"- {m.date}: {m.title}"]
             if m.summary:
-                history_str += f"  Summary: {m.summary}\n"
+                lines.append(f"  Summary: {m.summary}")
             if m.action_items:
-                history_str += f"  Action items: {', '.join(m.action_items[:2])}\n"
+                lines.append(f"  Action items: {'; '.join(m.action_items)}")
+            text = "\n".join(lines)
+            builder.add_optional(text, prompt_budget.rank_score(age, text, query), fallback=lines[0])
     else:
-        history_str = "\n\nThis is your first meeting with this contact."
-
-    prompt = f"""You are helping prepare someone for an upcoming meeting.
+        builder.add("This is your first meeting with this contact.")
 
-Contact Information:
-{contact_info}
-{history_str}
-
-Please provide a comprehensive meeting preparation including:
+    builder.add("")
+    builder.add("""Please provide a comprehensive meeting preparation including:
 1. A brief contact summary (2-3 sentences about who they are and your relationship)
 2. Summary of recent interactions (what you've discussed before)
 3. 3-5 suggested talking points for the upcoming meeting
 4. Any pending action items from past meetings that should be followed up on
 
 Format this as clear, readable text that someone can quickly review before their meeting.
-"""
+""")
+    return builder.build()
 
-    # Call LLM to get prep text
-    prep_text = llm.generate(prompt)
 
+def build_prep_prompt(meeting_id: str, max_tokens: int = PREP_PROMPT_TOKENS) -> prompt_budget.BuiltPrompt:
+    """
+    The prompt generate_pre_meeting_prep would send for a meeting, with its
+    estimated size in tokens - for tracking LLM cost without calling it.
+    """
+    meeting, contact, past_meetings = _load_prep_inputs(meeting_id)
+    return _build_prep_prompt(meeting, contact, past_meetings, max_tokens)
+
+
+def _save_prep(meeting_id: str, prep_text: str, fingerprint: str, prompt_tokens: int) -> Meeting:
+    """Store generated prep text, its input fingerprint and prompt size, return the updated meeting"""
     # Update meeting with prep text
-    data.update_meeting(meeting_id, {"prep": prep_text})
+    data.update_meeting(meeting_id, {
+        "prep": prep_text,
+        "prep_fingerprint": fingerprint,
+        "prep_prompt_tokens": prompt_tokens,
+    })
 
     # Return updated meeting
     updated_meeting = data.get_meeting(meeting_id)
@@ -228,28 +531,503 @@ Format this as clear, readable text that someone can quickly review before their
     return updated_meeting
 
 
+def generate_pre_meeting_prep(meeting_id: str, force: bool = False) -> Meeting:
+    """
+    Generate pre-meeting preparation for external meetings.
+
+    If the meeting already has prep built from the same contact and history
+    (same fingerprint), it is returned as-is without calling the LLM.
+    Pass force=True to regenerate regardless, bypassing the response cache.
+    Concurrent calls for the same meeting, fingerprint and force share one
+    LLM call and all get its result.
+    """
+    meeting, contact, past_meetings = _load_prep_inputs(meeting_id)
+
+    fingerprint = _prep_fingerprint(meeting, contact, past_meetings)
+    if not force and meeting.prep and meeting.prep_fingerprint == fingerprint:
+        return meeting
+
+    # A forced call must not join a normal one, which may answer from the cache
+    return prep_flights.do((meeting_id, fingerprint, force), _generate_prep,
+                           meeting, contact, past_meetings, fingerprint, force)
+
+
+def _generate_prep(meeting: Meeting, contact: Contact, past_meetings: List[Meeting], fingerprint: str,
+                   force: bool = False) -> Meeting:
+    prompt = _build_prep_prompt(meeting, contact, past_meetings)
+
+    # Call LLM to get prep text (fails fast on a cache miss while the circuit is open).
+    # Forced calls skip the cached response, which is the prep being replaced
+    prep_text = llm.refresh(prompt.text) if force else llm.generate(prompt.text)
+
+    return _save_prep(meeting.id, prep_text, fingerprint, prompt.estimated_tokens)
+
+
+async def generate_pre_meeting_prep_async(
+    meeting_id: str,
+    client: Optional[AsyncMockLLMClient] = None
+) -> Meeting:
+    """
+    Generate pre-meeting preparation using the asyncio LLM client.
+    Up-to-date prep is reused, and concurrent calls coalesced, the same way
+    as in generate_pre_meeting_prep.
+    """
+    meeting, contact, past_meetings = _load_prep_inputs(meeting_id)
+
+    fingerprint = _prep_fingerprint(meeting, contact, past_meetings)
+    if meeting.prep and meeting.prep_fingerprint == fingerprint:
+        return meeting
+
+    return await prep_flights.do_async((meeting_id, fingerprint), _generate_prep_async,
+                                       meeting, contact, past_meetings, fingerprint, client)
+
+
+def _async_client(client: Optional[AsyncMockLLMClient]):
+    """The shared cached client, or the caller's own client behind the shared breaker"""
+    return async_llm if client is None else AsyncBreakerLLMClient(client, llm_breaker)
+
+
+async def _generate_prep_async(
+    meeting: Meeting,
+    contact: Contact,
+    past_meetings: List[Meeting],
+    fingerprint: str,
+    client: Optional[AsyncMockLLMClient]
+) -> Meeting:
+    prompt = _build_prep_prompt(meeting, contact, past_meetings)
+    prep_text = await _async_client(client).generate(prompt.text)
+    return _save_prep(meeting.id, prep_text, fingerprint, prompt.estimated_tokens)
+
+
 # ============================================================================
 # PHASE 5: Error Handling
 # ============================================================================
 
+def _next_retry_delay(error: LLMAPIError, attempt: int, max_retries: int, max_delay: float,
+                      task: str = "generate prep") -> float:
+    """
+    Decide whether a failed LLM attempt should be retried.
+    Returns the (jittered) delay before the next attempt, or raises the final error.
+    """
+    if not resilience.is_retryable(error):
+        # Invalid request, open circuit, ... - retrying won't help
+        raise error
+    if attempt == max_retries - 1:
+        # Last attempt failed, raise error
+        raise LLMAPIError(f"Failed to {task} after {max_retries} attempts: {str(error)}")
+    if not llm_retry_budget.try_spend():
+        raise RetryBudgetExhaustedError(f"Retry budget exhausted, not retrying: {str(error)}")
+    return resilience.retry_delay(error, attempt, max_delay=max_delay)
+
+
 def generate_pre_meeting_prep_with_retry(
     meeting_id: str,
-    max_retries: int = 3
+    max_retries: int = 3,
+    max_delay: float = 2.0
 ) -> Meeting:
     """
     Generate pre-meeting prep with retry logic for LLM failures.
+
+    Retries use full-jitter exponential backoff capped at max_delay, with a
+    longer backoff for rate limits. Invalid requests are never retried, every
+    retry must be paid for from the shared retry budget, and while the
+    circuit breaker is open calls fail fast without sleeping.
+
+    Concurrent calls for the same meeting and fingerprint share one run of
+    the whole retry loop, so its retries are paid for once.
     """
+    meeting, contact, past_meetings = _load_prep_inputs(meeting_id)
+    fingerprint = _prep_fingerprint(meeting, contact, past_meetings)
+    if meeting.prep and meeting.prep_fingerprint == fingerprint:
+        return meeting
+
+    return prep_retry_flights.do((meeting_id, fingerprint), _generate_prep_with_retry,
+                                 meeting_id, max_retries, max_delay)
+
+
+def _generate_prep_with_retry(meeting_id: str, max_retries: int, max_delay: float) -> Meeting:
+    llm_retry_budget.record_request()
     for attempt in range(max_retries):
         try:
             return generate_pre_meeting_prep(meeting_id)
         except LLMAPIError as e:
-            if attempt == max_retries - 1:
-                # Last attempt failed, raise error
-                raise LLMAPIError(f"Failed to generate prep after {max_retries} attempts: {str(e)}")
-
-            # Calculate exponential backoff
-            wait_time = 0.1 * (2 ** attempt)
-            time.sleep(wait_time)
+            time.sleep(_next_retry_delay(e, attempt, max_retries, max_delay))
         except ValueError as e:
             # Don't retry on ValueError (bad input)
             raise
+
+
+async def generate_pre_meeting_prep_batch(
+    meeting_ids: List[str],
+    concurrency: int = 10,
+    max_retries: int = 3,
+    client: Optional[AsyncMockLLMClient] = None,
+    max_delay: float = 2.0
+) -> List[PrepResult]:
+    """
+    Generate prep for many meetings concurrently.
+
+    At most `concurrency` LLM calls are in flight at once. Each meeting is
+    retried with the same policy as generate_pre_meeting_prep_with_retry
+    (jittered backoff, retry budget, circuit breaker), and failures are reported per meeting instead of aborting the batch.
+    Results are returned in the same order as meeting_ids.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_retries < 1:
+        raise ValueError("max_retries must be at least 1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _generate(meeting_id: str) -> PrepResult:
+        async with semaphore:
+            return await _prep_result_with_retry(meeting_id, max_retries, client, max_delay)
+
+    return list(await asyncio.gather(*(_generate(mid) for mid in meeting_ids)))
+
+
+async def _prep_result_with_retry(
+    meeting_id: str,
+    max_retries: int,
+    client: Optional[AsyncMockLLMClient],
+    max_delay: float
+) -> PrepResult:
+    """Generate one meeting's prep under the retry policy, reporting failure as a PrepResult"""
+    llm_retry_budget.record_request()
+    for attempt in range(max_retries):
+        try:
+            meeting = await generate_pre_meeting_prep_async(meeting_id, client)
+            return PrepResult(meeting_id=meeting_id, success=True, meeting=meeting)
+        except ValueError as e:
+            # Bad input - retrying won't help
+            return PrepResult(meeting_id=meeting_id, success=False, error=str(e))
+        except LLMAPIError as e:
+            try:
+                delay = _next_retry_delay(e, attempt, max_retries, max_delay)
+            except LLMAPIError as final:
+                return PrepResult(meeting_id=meeting_id, success=False, error=str(final))
+            await asyncio.sleep(delay)
+
+
+def run_pre_meeting_prep_batch(meeting_ids: List[str], concurrency: int = 10) -> List[PrepResult]:
+    """
+    Synchronous entry point for batch prep generation (e.g. a morning cron job).
+    """
+    return asyncio.run(generate_pre_meeting_prep_batch(meeting_ids, concurrency))
+
+
+# ============================================================================
+# Prep Pre-warming
+# ============================================================================
+
+def _tomorrow() -> str:
+    return (datetime.now(timezone.utc).date() + timedelta(days=1)).isoformat()
+
+
+async def prewarm_prep(
+    date: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    rate_per_second: float = 2.0,
+    concurrency: int = 5,
+    max_retries: int = 3,
+    client: Optional[AsyncMockLLMClient] = None,
+    max_delay: float = 2.0
+) -> List[PrepResult]:
+    """
+    Generate prep ahead of time for a day's external meetings (default:
+    tomorrow, UTC), so users don't wait on the LLM when they open them.
+
+    Meetings come from the external-meeting date index, ordered by start
+    time, and are started in that order: at most rate_per_second starts per
+    second and `concurrency` generations at once. Once deadline_seconds
+    have passed nothing more is started and generations still running are
+    cancelled, so whatever is left undone is always the day's latest
+    meetings. Meetings with up-to-date prep return without an LLM call.
+    Results are in start-time order; meetings cut off by the deadline are
+    reported as failed.
+    """
+    if rate_per_second <= 0:
+        raise ValueError("rate_per_second must be positive")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_retries < 1:
+        raise ValueError("max_retries must be at least 1")
+
+    meeting_ids = [row["id"] for row in data.external_meetings_on(date or _tomorrow())]
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    interval = 1.0 / rate_per_second
+    results = {}
+    tasks = []
+
+    async def _generate(meeting_id: str):
+        try:
+            results[meeting_id] = await _prep_result_with_retry(meeting_id, max_retries, client, max_delay)
+        finally:
+            semaphore.release()
+
+    async def _dispatch():
+        next_start = loop.time()
+        for meeting_id in meeting_ids:
+            await semaphore.acquire()
+            wait = next_start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            next_start = max(next_start, loop.time()) + interval
+            tasks.append(asyncio.ensure_future(_generate(meeting_id)))
+        await asyncio.gather(*tasks)
+
+    try:
+        await asyncio.wait_for(_dispatch(), deadline_seconds)
+    except asyncio.TimeoutError:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [
+        results.get(meeting_id) or PrepResult(
+            meeting_id=meeting_id, success=False, error="Deadline passed before prep was generated"
+        )
+        for meeting_id in meeting_ids
+    ]
+
+
+def run_prep_prewarm(
+    date: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    rate_per_second: float = 2.0,
+    concurrency: int = 5
+) -> List[PrepResult]:
+    """
+    Synchronous entry point for prep pre-warming (e.g. a nightly cron job).
+    """
+    return asyncio.run(prewarm_prep(date, deadline_seconds, rate_per_second, concurrency))
+
+
+# ============================================================================
+# Post-Meeting Transcript Analysis
+# ============================================================================
+
+async def _generate_with_retry(
+    prompt: str,
+    client: Optional[AsyncMockLLMClient],
+    max_retries: int,
+    max_delay: float,
+    task: str
+) -> str:
+    """
+    One LLM call under the shared retry policy (jittered backoff, retry
+    budget, circuit breaker). Raises the final LLMAPIError.
+    """
+    llm_retry_budget.record_request()
+    for attempt in range(max_retries):
+        try:
+            return await _async_client(client).generate(prompt)
+        except LLMAPIError as e:
+            await asyncio.sleep(_next_retry_delay(e, attempt, max_retries, max_delay, task))
+
+
+async def _map_reduce_transcript(source, chunk_chars: int, semaphore: asyncio.Semaphore, call) -> MeetingAnalysis:
+    """summarize_transcript with the caller's semaphore and LLM call"""
+
+    async def _map(chunk: str) -> dict:
+        key = transcript_analysis.transcript_hash(chunk)
+        cached = chunk_cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        async with semaphore:
+            response = await call(transcript_analysis.build_chunk_prompt(chunk))
+        partial = transcript_analysis.parse_chunk_response(response)
+        chunk_cache.put(key, json.dumps(partial))
+        return partial
+
+    async def _reduce(summaries: List[str]) -> str:
+        async with semaphore:
+            response = await call(transcript_analysis.build_reduce_prompt(summaries))
+        return transcript_analysis.parse_reduce_response(response)
+
+    tasks = []
+    try:
+        for chunk in transcript_analysis.chunk_transcript(source, chunk_chars):
+            tasks.append(asyncio.ensure_future(_map(chunk)))
+            await asyncio.sleep(0)  # Let the chunk's call start while the rest is read
+        if not tasks:
+            raise ValueError("Transcript is empty")
+        partials = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    fanout = transcript_analysis.REDUCE_FANOUT
+    summaries = [partial["summary"] for partial in partials]
+    while len(summaries) > 1:
+        groups = [summaries[i:i + fanout] for i in range(0, len(summaries), fanout)]
+        summaries = await asyncio.gather(*(_reduce(group) for group in groups))
+    return transcript_analysis.merge_partials(partials, summaries[0])
+
+
+async def summarize_transcript(
+    source: Union[str, Iterable[str]],
+    chunk_chars: int = transcript_analysis.DEFAULT_CHUNK_CHARS,
+    concurrency: int = 10,
+    max_retries: int = 3,
+    client: Optional[AsyncMockLLMClient] = None,
+    max_delay: float = 2.0
+) -> MeetingAnalysis:
+    """
+    Map-reduce analysis of a transcript too long for one prompt.
+
+    The transcript - a string, or an iterable of text pieces such as an
+    open file - is cut into chunks on speaker turns as it is read, and each
+    chunk is analyzed as soon as it is cut, at most `concurrency` at once.
+    Chunk results are cached by content (chunk_cache), so after an edit
+    only the changed chunks call the LLM. The partial summaries are then
+    reduced REDUCE_FANOUT at a time until one remains; action items,
+    topics and sentiment are merged without an LLM call.
+
+    Raises:
+        LLMAPIError: If a chunk or reduce call still fails after retries
+        ValueError: If the transcript is empty or a reply can't be parsed
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_retries < 1:
+        raise ValueError("max_retries must be at least 1")
+
+    async def _call(prompt: str) -> str:
+        return await _generate_with_retry(prompt, client, max_retries, max_delay, "summarize transcript")
+
+    return await _map_reduce_transcript(source, chunk_chars, asyncio.Semaphore(concurrency), _call)
+
+
+async def analyze_transcripts_batch(
+    meeting_ids: List[str],
+    pack_size: int = transcript_analysis.DEFAULT_PACK_SIZE,
+    concurrency: int = 10,
+    max_retries: int = 3,
+    client: Optional[AsyncMockLLMClient] = None,
+    max_delay: float = 2.0,
+    force: bool = False,
+    chunk_chars: int = transcript_analysis.DEFAULT_CHUNK_CHARS
+) -> List[AnalysisResult]:
+    """
+    Extract summary, action items, key topics and sentiment from many
+    meetings' transcripts.
+
+    Meetings are packed pack_size to a prompt, so each LLM call analyzes
+    several of them, and at most `concurrency` calls are in flight at once.
+    Transcripts longer than chunk_chars go through summarize_transcript
+    instead, sharing the same concurrency limit. Calls are retried with the
+    same policy as prep generation. Meetings whose current transcript was
+    already analyzed are skipped unless force=True. Everything extracted is
+    written back in one bulk update. Failures are reported per meeting, in
+    the same order as meeting_ids.
+    """
+    if pack_size < 1:
+        raise ValueError("pack_size must be at least 1")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_retries < 1:
+        raise ValueError("max_retries must be at least 1")
+
+    results = {}
+    pending = []
+    rows = data.meetings_by_id(list(dict.fromkeys(meeting_ids)))
+    for meeting_id in dict.fromkeys(meeting_ids):
+        row = rows.get(meeting_id)
+        if row is None:
+            results[meeting_id] = AnalysisResult(meeting_id=meeting_id, success=False,
+                                                 error=f"Meeting {meeting_id} not found")
+            continue
+        meeting = data.meeting_from_row(row)
+        if not meeting.transcript:
+            results[meeting_id] = AnalysisResult(meeting_id=meeting_id, success=False,
+                                                 error="Meeting has no transcript")
+        elif not force and not transcript_analysis.needs_analysis(meeting):
+            results[meeting_id] = AnalysisResult(meeting_id=meeting_id, success=True,
+                                                 meeting=meeting, skipped=True)
+        else:
+            pending.append(meeting)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    updates = {}  # meeting_id -> fields to write back
+
+    async def _call(prompt: str) -> str:
+        return await _generate_with_retry(prompt, client, max_retries, max_delay, "analyze transcripts")
+
+    def _fail(pack: List[Meeting], error: str):
+        for meeting in pack:
+            results[meeting.id] = AnalysisResult(meeting_id=meeting.id, success=False, error=error)
+
+    async def _analyze(pack: List[Meeting]):
+        try:
+            async with semaphore:
+                response = await _call(transcript_analysis.build_analysis_prompt(pack))
+            parsed = transcript_analysis.parse_analysis_response(response, [m.id for m in pack])
+        except (LLMAPIError, ValueError) as e:
+            return _fail(pack, str(e))
+        for meeting in pack:
+            analysis = parsed[meeting.id]
+            if analysis is None:
+                _fail([meeting], "No analysis returned for meeting")
+            else:
+                updates[meeting.id] = transcript_analysis.analysis_updates(analysis, meeting.transcript)
+
+    async def _analyze_long(meeting: Meeting):
+        try:
+            analysis = await _map_reduce_transcript(meeting.transcript, chunk_chars, semaphore, _call)
+        except (LLMAPIError, ValueError) as e:
+            return _fail([meeting], str(e))
+        updates[meeting.id] = transcript_analysis.analysis_updates(analysis, meeting.transcript)
+
+    short = [m for m in pending if len(m.transcript) <= chunk_chars]
+    long = [m for m in pending if len(m.transcript) > chunk_chars]
+    await asyncio.gather(
+        *(_analyze(pack) for pack in transcript_analysis.pack_meetings(short, pack_size)),
+        *(_analyze_long(meeting) for meeting in long),
+    )
+
+    results.update(_write_analysis(updates))
+    return [results[meeting_id] for meeting_id in meeting_ids]
+
+
+def _write_analysis(updates: Dict[str, dict]) -> Dict[str, AnalysisResult]:
+    """
+    Bulk-write extracted analysis, leaving out meetings deleted meanwhile
+
+    A meeting can be deleted between any existence check and the all-or-
+    nothing update, so a failed update is retried without the meetings that
+    are gone. It is re-raised only if every meeting still exists.
+    """
+    results = {}
+    while updates:
+        existing = data.meetings_by_id(list(updates))
+        missing = [meeting_id for meeting_id in updates if meeting_id not in existing]
+        for meeting_id in missing:
+            results[meeting_id] = AnalysisResult(meeting_id=meeting_id, success=False,
+                                                 error=f"Meeting {meeting_id} not found")
+        updates = {meeting_id: fields for meeting_id, fields in updates.items() if meeting_id in existing}
+        if not updates:
+            break
+        try:
+            written = data.update_meetings(updates)
+        except ValueError:
+            if all(data.meeting_exists(meeting_id) for meeting_id in updates):
+                raise
+            continue
+        for meeting in written:
+            results[meeting.id] = AnalysisResult(meeting_id=meeting.id, success=True, meeting=meeting)
+        break
+    return results
+
+
+def run_transcript_analysis(
+    meeting_ids: List[str],
+    pack_size: int = transcript_analysis.DEFAULT_PACK_SIZE,
+    concurrency: int = 10
+) -> List[AnalysisResult]:
+    """
+    Synchronous entry point for transcript analysis (e.g. an end-of-day job).
+    """
+    return asyncio.run(analyze_transcripts_batch(meeting_ids, pack_size, concurrency))
@@ -4,8 +4,36 @@ Pydantic Models for Meeting Intelligence Service
 Completed models with all required fields.
 """
 
-from pydantic import BaseModel
-from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, model_validator
+from typing import Optional, List, Tuple
+
+import timespan
+
+
+def _sync_span(model):
+    """
+    Fill start_at/end_at from the hour fields, or the hour fields from
+    start_at/end_at when those are given (they win if both are)
+    """
+    if model.start_at is not None and model.end_at is not None:
+        if model.end_at < model.start_at:
+            raise ValueError("end_at must not be before start_at")
+        if model.end_at - model.start_at > timespan.MAX_DURATION_MINUTES:
+            raise ValueError("Meetings can't be longer than 24 hours")
+        for name, value in timespan.hour_fields(model.start_at, model.end_at).items():
+            setattr(model, name, value)
+    elif None not in (model.date, model.start_hour, model.end_hour):
+        # Out-of-range hours would silently move the meeting to another date
+        if not 0 <= model.start_hour <= 23:
+            raise ValueError("start_hour must be between 0 and 23")
+        if not 0 <= model.end_hour <= 48:
+            raise ValueError("end_hour must be between 0 and 48")
+        model.start_at, model.end_at = timespan.from_hours(model.date, model.start_hour, model.end_hour)
+        model.end_hour = timespan.hour_fields(model.start_at, model.end_at)["end_hour"]
+    else:
+        raise ValueError("Either start_at and end_at or date, start_hour and end_hour are required")
+    return model
 
 
 class User(BaseModel):
@@ -31,15 +59,27 @@ class Meeting(BaseModel):
     user_id: str
     contact_id: Optional[str] = None  # None for internal meetings
     title: str
-    date: str  # Format: YYYY-MM-DD
-    start_hour: int  # 0-23 (hour of day meeting starts)
-    end_hour: int  # 0-23 (hour of day meeting ends)
+    date: Optional[str] = None  # Format: YYYY-MM-DD
+    start_hour: Optional[int] = None  # 0-23 (hour of day meeting starts)
+    end_hour: Optional[int] = None  # Hour it ends, counted from `date`'s midnight (>24 past midnight)
+    start_at: Optional[int] = None  # UTC minutes since the epoch; derived from the hours if not given
+    end_at: Optional[int] = None  # UTC minutes since the epoch, exclusive
     created_at: Optional[str] = None
     transcript: Optional[str] = None
     summary: Optional[str] = None
     action_items: List[str] = []
     sentiment: Optional[str] = None
+    key_topics: List[str] = []
+    analysis_hash: Optional[str] = None  # Hash of the transcript summary/action_items/... were extracted from
     prep: Optional[str] = None  # Pre-meeting preparation text generated by LLM
+    prep_fingerprint: Optional[str] = None  # Hash of the inputs `prep` was generated from
+    prep_prompt_tokens: Optional[int] = None  # Estimated size of the prompt `prep` was generated from
+    external_id: Optional[str] = None  # Upstream calendar event ID for synced meetings
+    sync_hash: Optional[str] = None  # Hash of the upstream record last synced into this meeting
+
+    @model_validator(mode="after")
+    def _check_times(self):
+        return _sync_span(self)
 
 
 class CreateMeetingRequest(BaseModel):
@@ -47,14 +87,100 @@ class CreateMeetingRequest(BaseModel):
     user_id: str
     contact_id: Optional[str] = None
     title: str
-    date: str  # Format: YYYY-MM-DD
-    start_hour: int  # 0-23
-    end_hour: int  # 0-23
+    date: Optional[str] = None  # Format: YYYY-MM-DD
+    start_hour: Optional[int] = None  # 0-23
+    end_hour: Optional[int] = None  # Below start_hour: ends the next day
+    start_at: Optional[int] = None  # UTC epoch minutes, instead of date/start_hour/end_hour
+    end_at: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _check_times(self):
+        return _sync_span(self)
+
+
+class MeetingFilters(BaseModel):
+    """Filters accepted by get_all_meetings and the paging functions"""
+    model_config = ConfigDict(extra="forbid")  # Reject misspelled filter names
+
+    contact_id: Optional[str] = None
+    date_from: Optional[str] = None  # YYYY-MM-DD, inclusive
+    date_to: Optional[str] = None  # YYYY-MM-DD, inclusive
+    hour_from: Optional[int] = None  # Meeting starts at or after this hour
+    hour_to: Optional[int] = None  # Meeting ends at or before this hour
+    internal: Optional[bool] = None  # True: no contact, False: with a contact
+    sentiment: Optional[str] = None
+    has_transcript: Optional[bool] = None
+    has_prep: Optional[bool] = None
+    title_contains: Optional[str] = None  # Case-insensitive substring
 
 
 class TimeSlot(BaseModel):
     """Represents an available time slot"""
     date: str  # Format: YYYY-MM-DD
     start_hour: int  # 0-23
-    end_hour: int  # 0-23
+    end_hour: int  # Hour it ends, counted from `date`'s midnight (>24 past midnight)
+    start_at: Optional[int] = None  # UTC epoch minutes
+    end_at: Optional[int] = None
+
+
+class Participant(BaseModel):
+    """Someone who has to attend a meeting being scheduled"""
+    id: str  # user_id, or contact_id when is_contact is True
+    is_contact: bool = False
+    timezone: str = "UTC"  # IANA name, e.g. "America/New_York"
+    work_hours: Tuple[int, int] = (9, 17)  # Local hours they can meet in
+    preferred_hours: Optional[Tuple[int, int]] = None  # Local hours they'd rather meet in
+    buffer_minutes: int = 0  # Free time to keep around their other meetings
+
+
+class SlotSuggestion(BaseModel):
+    """A ranked candidate time for a meeting"""
+    start: datetime  # UTC
+    end: datetime  # UTC
+    score: float  # Higher is better
+
+
+class PrepResult(BaseModel):
+    """Outcome of generating prep for one meeting in a batch"""
+    meeting_id: str
+    success: bool
+    meeting: Optional[Meeting] = None  # Updated meeting when success is True
+    error: Optional[str] = None  # Error message when success is False
+
+
+class MeetingAnalysis(BaseModel):
+    """What the LLM extracted from one meeting's transcript"""
+    summary: str
+    action_items: List[str] = []
+    key_topics: List[str] = []
+    sentiment: str  # very_positive, positive, neutral or negative
+
+
+class AnalysisResult(BaseModel):
+    """Outcome of analyzing one meeting's transcript in a batch"""
+    meeting_id: str
+    success: bool
+    meeting: Optional[Meeting] = None  # Updated meeting when success is True
+    skipped: bool = False  # True when the stored analysis was already up to date
+    error: Optional[str] = None  # Error message when success is False
+
+
+class MeetingPage(BaseModel):
+    """One page of a user's meetings, in (date, start_at, id) order"""
+    meetings: List[Meeting]
+    next_cursor: Optional[str] = None  # Pass back to get the next page; None on the last page
+
 
+class SyncReport(BaseModel):
+    """Counts and throughput for one calendar sync run"""
+    received: int = 0  # Records read from the feed
+    duplicates: int = 0  # Superseded by a later record for the same external_id in a batch
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0  # Upserts whose content hash matched the stored meeting
+    deleted: int = 0
+    missing: int = 0  # Deletes for meetings that don't exist
+    failed: int = 0
+    errors: List[str] = []  # One message per failed record
+    elapsed_seconds: float = 0.0
+    records_per_second: float = 0.0
@@ -0,0 +1,109 @@
+"""
+Budgeted prompt assembly
+
+A prompt is a fixed frame (instructions, the contact, ...) plus optional
+items such as past meetings. PromptBuilder adds the optional items
+greedily, highest score first, while the estimated size stays within a
+token budget, then assembles everything in its original order with a
+single join.
+
+Sizes are estimated at CHARS_PER_TOKEN characters per token - close
+enough for English text to bound cost and latency without a tokenizer.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Set
+
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = 1000
+
+RECENCY_DECAY = 0.8  # Each older item is worth this much of the one after it
+RELEVANCE_WEIGHT = 1.0  # Score boost for an item matching every query keyword
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "for", "from", "in", "of", "on", "or", "the", "to", "with",
+})
+
+
+class BuiltPrompt(NamedTuple):
+    """An assembled prompt and what went into it"""
+    text: str
+    estimated_tokens: int
+    included: int  # Optional items included (in full or as their fallback)
+    dropped: int  # Optional items left out to stay within the budget
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a piece of text"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def keywords(text: str) -> Set[str]:
+    """Lowercased words of 3+ characters, minus stopwords"""
+    return {word for word in re.findall(r"[a-z0-9]{3,}", text.lower()) if word not in STOPWORDS}
+
+
+def rank_score(age: int, text: str, query: Set[str]) -> float:
+    """
+    Score of a history item: decays with age (0 = most recent) and is
+    boosted by the share of the query keywords the item mentions
+    """
+    relevance = len(query & keywords(text)) / len(query) if query else 0.0
+    return RECENCY_DECAY ** age * (1 + RELEVANCE_WEIGHT * relevance)
+
+
+class PromptBuilder:
+    """
+    Collects prompt parts and assembles them within a token budget
+
+    Required parts are always included, even if they alone exceed the
+    budget. Optional parts are considered highest score first; each is
+    included if it fits, else its shorter fallback if that fits, else it
+    is dropped and the next one is tried.
+
+    Usage:
+        builder = PromptBuilder(max_tokens=500)
+        builder.add("Instructions ...")
+        builder.add_optional("- 2025-10-01: Kickoff\\n  Summary: ...", score=0.9,
+                             fallback="- 2025-10-01: Kickoff")
+        prompt = builder.build()  # prompt.text, prompt.estimated_tokens
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS, separator: str = "\n"):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.max_tokens = max_tokens
+        self.separator = separator
+        self._parts = []  # (text, score or None if required, fallback)
+
+    def add(self, text: str) -> "PromptBuilder":
+        """Add a part that is always included"""
+        self._parts.append((text, None, None))
+        return self
+
+    def add_optional(self, text: str, score: float, fallback: Optional[str] = None) -> "PromptBuilder":
+        """Add a part that is included only if the budget allows"""
+        self._parts.append((text, score, fallback))
+        return self
+
+    def build(self) -> BuiltPrompt:
+        """Choose the optional parts and assemble the prompt"""
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        gap = len(self.separator)
+        chosen: List[Optional[str]] = [text if score is None else None for text, score, _ in self._parts]
+        size = sum(len(text) + gap for text in chosen if text is not None) - gap
+
+        optional = [i for i, (_, score, _) in enumerate(self._parts) if score is not None]
+        optional.sort(key=lambda i: -self._parts[i][1])
+        included = 0
+        for i in optional:
+            text, _, fallback = self._parts[i]
+            for candidate in (text, fallback):
+                if candidate is not None and size + gap + len(candidate) <= budget:
+                    chosen[i] = candidate
+                    size += gap + len(candidate)
+                    included += 1
+                    break
+
+        prompt = self.separator.join(text for text in chosen if text is not None)
+        return BuiltPrompt(prompt, estimate_tokens(prompt), included, len(optional) - included)
@@ -0,0 +1,363 @@
+"""
+Resilience primitives for calls to unreliable services (the LLM API)
+
+- CircuitBreaker: stops calling a failing service for a cool-down period so
+  callers fail fast instead of sleeping through their retry schedule
+- RetryBudget: process-wide cap on retries, so an outage cannot multiply
+  load on the service by max_retries
+- retry_delay: full-jitter exponential backoff that depends on the error type
+- BreakerLLMClient: an LLM client whose calls go through a CircuitBreaker,
+  for wrapping in a CachedLLMClient so cache hits bypass the breaker
+- SingleFlight: concurrent calls for the same key share one execution, so
+  a burst of identical requests costs one LLM call
+
+Usage:
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    try:
+        text = breaker.call(client.generate, prompt)
+    except CircuitOpenError:
+        # Service is known to be down - don't wait, degrade immediately
+        ...
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Hashable, Optional
+
+from llm_client import LLMAPIError, RateLimitError, InvalidRequestError
+
+
+class CircuitOpenError(LLMAPIError):
+    """Raised without calling the service while the circuit is open"""
+    pass
+
+
+class RetryBudgetExhaustedError(LLMAPIError):
+    """Raised when a retry is needed but the shared retry budget is empty"""
+    pass
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether an error is worth retrying.
+    Invalid requests fail the same way every time, and an open circuit
+    means the service is known to be down.
+    """
+    return (
+        isinstance(error, LLMAPIError)
+        and not isinstance(error, (InvalidRequestError, CircuitOpenError, RetryBudgetExhaustedError))
+    )
+
+
+def retry_delay(
+    error: Exception,
+    attempt: int,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    rate_limit_multiplier: float = 4.0,
+    rng=random.random
+) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(max_delay, base * 2^attempt)].
+
+    Rate limits get a larger base so callers actually back off rather than
+    hammering the API at the same pace. Jitter spreads retries out so
+    callers that failed together don't retry together.
+    """
+    if isinstance(error, RateLimitError):
+        base_delay *= rate_limit_multiplier
+    ceiling = min(max_delay, base_delay * (2 ** attempt))
+    return rng() * ceiling
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker
+
+    - closed: calls go through; consecutive failures are counted
+    - open: after failure_threshold consecutive failures, calls raise
+      CircuitOpenError immediately until reset_timeout has passed
+    - half-open: up to half_open_max_calls probe calls are let through;
+      a success closes the circuit, a failure re-opens it
+
+    Only retryable LLMAPIErrors count as failures. InvalidRequestError and
+    non-LLM exceptions (e.g. ValueError for bad input) say nothing about
+    the service's health.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock=time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once the timeout has passed"""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError"""
+        with self._lock:
+            self._refresh()
+            if self._state == self.OPEN:
+                raise CircuitOpenError("Circuit open: LLM service is failing, not calling it")
+            if self._state == self.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    raise CircuitOpenError("Circuit half-open: probe call already in flight")
+                self._probes_in_flight += 1
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes_in_flight = 0
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open()
+
+    def record_ignored(self):
+        """The call ended with an error that says nothing about service health"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def _record_error(self, error: BaseException):
+        if is_retryable(error):
+            self.record_failure()
+        else:
+            self.record_ignored()
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn through the breaker"""
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Await the coroutine function fn through the breaker"""
+        self.before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            self._record_error(e)
+            raise
+        self.record_success()
+        return result
+
+
+class BreakerLLMClient:
+    """
+    LLM client whose calls go through a CircuitBreaker
+
+    Put it inside a CachedLLMClient rather than around one: cached
+    responses are then served while the circuit is open, and a cache hit
+    never counts as a half-open probe that closes the circuit.
+
+    Usage:
+        client = CachedLLMClient(BreakerLLMClient(MockLLMClient(), breaker))
+    """
+
+    def __init__(self, client, breaker: CircuitBreaker):
+        self.client = client
+        self.breaker = breaker
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        return self.breaker.call(self.client.generate, prompt, system_prompt)
+
+
+class AsyncBreakerLLMClient(BreakerLLMClient):
+    """BreakerLLMClient for an async client such as AsyncMockLLMClient"""
+
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        return await self.breaker.call_async(self.client.generate, prompt, system_prompt)
+
+
+class RetryBudget:
+    """
+    Process-wide token bucket for retries
+
+    Every first attempt deposits deposit_per_request tokens and time refills
+    refill_per_second tokens, up to capacity. Every retry spends one token.
+    In steady state retries are capped at roughly deposit_per_request of
+    traffic, so an outage cannot turn every request into max_retries calls.
+    """
+
+    def __init__(self, capacity: float = 10.0, deposit_per_request: float = 0.2,
+                 refill_per_second: float = 1.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.deposit_per_request = deposit_per_request
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+
+    def record_request(self):
+        """Credit the budget for a new (non-retry) request"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.deposit_per_request)
+
+    def try_spend(self) -> bool:
+        """Take one retry token, returns False if none are left"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class _Flight:
+    """One in-flight call and its outcome"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncFlight:
+    """One in-flight task and how many callers are awaiting it"""
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get the same result, or the same
+    exception. Once it finishes the key is forgotten, so a later call runs
+    afresh - nothing is cached.
+
+    Thread callers use do(). asyncio callers use do_async(), which shares
+    one task per key and event loop; a caller that is cancelled stops
+    waiting, and once every caller has been cancelled the shared task is
+    cancelled too. The two kinds of callers don't join each other's flights.
+
+    Usage:
+        flights = SingleFlight()
+        prep = flights.do(("meeting_1", fingerprint), generate, "meeting_1")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> _Flight
+        self._tasks = {}  # (event loop, key) -> _AsyncFlight
+        self.shared = 0  # Calls that joined another caller's flight
+
+    def do(self, key: Hashable, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs), or wait for the in-flight run for key"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def do_async(self, key: Hashable, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs), or the in-flight task for key on this event loop"""
+        loop_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            flight = self._tasks.get(loop_key)
+            if flight is None:
+                flight = self._tasks[loop_key] = _AsyncFlight(asyncio.ensure_future(fn(*args, **kwargs)))
+                flight.task.add_done_callback(lambda _: self._forget(loop_key, flight))
+            else:
+                self.shared += 1
+            flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.task.done()
+                if abandoned:
+                    # Nobody wants the result any more; later callers start afresh
+                    self._tasks.pop(loop_key, None)
+            if abandoned:
+                flight.task.cancel()
+            raise
+
+    def _forget(self, loop_key, flight: _AsyncFlight):
+        with self._lock:
+            if self._tasks.get(loop_key) is flight:
+                del self._tasks[loop_key]
+
+    def in_flight(self) -> int:
+        """Keys currently being computed"""
+        with self._lock:
+            return len(self._flights) + len(self._tasks)
@@ -8,6 +8,22 @@ Usage:
     python run_tests.py phase3      # Run Phase 3 tests only
     python run_tests.py phase4      # Run Phase 4 tests only
     python run_tests.py phase5      # Run Phase 5 tests only
+    python run_tests.py store       # Run meeting store tests only
+    python run_tests.py availability  # Run availability engine tests only
+    python run_tests.py batch       # Run async batch prep tests only
+    python run_tests.py cache       # Run LLM cache tests only
+    python run_tests.py resilience  # Run circuit breaker / retry budget tests only
+    python run_tests.py sqlite      # Run SQLite backend tests only
+    python run_tests.py pagination  # Run pagination tests only
+    python run_tests.py query       # Run filter engine tests only
+    python run_tests.py bulk        # Run bulk create/update/delete tests only
+    python run_tests.py sync        # Run calendar sync tests only
+    python run_tests.py scheduler   # Run meeting time optimizer tests only
+    python run_tests.py timespan    # Run minute-granularity time model tests only
+    python run_tests.py benchmark   # Run benchmark harness tests only
+    python run_tests.py analysis    # Run transcript analysis tests only
+    python run_tests.py prompt      # Run prompt budget tests only
+    python run_tests.py prewarm     # Run prep pre-warming tests only
     python run_tests.py all         # Run all tests
 
 Examples:
@@ -26,6 +42,22 @@ PHASES = {
     'phase3': ('tests.test_phase3', 'Phase 3: Availability Algorithm'),
     'phase4': ('tests.test_phase4', 'Phase 4: Pre-Meeting Prep'),
     'phase5': ('tests.test_phase5', 'Phase 5: Error Handling'),
+    'store': ('tests.test_meeting_store', 'Meeting Store Indexes'),
+    'availability': ('tests.test_availability', 'Availability Engine'),
+    'batch': ('tests.test_async_prep', 'Async Batch Prep'),
+    'cache': ('tests.test_llm_cache', 'LLM Response Cache'),
+    'resilience': ('tests.test_resilience', 'Circuit Breaker and Retry Budget'),
+    'sqlite': ('tests.test_sqlite_backend', 'SQLite Storage Backend'),
+    'pagination': ('tests.test_pagination', 'Pagination and Streaming'),
+    'query': ('tests.test_meeting_query', 'Filter Engine and Query Planning'),
+    'bulk': ('tests.test_bulk_operations', 'Bulk Meeting Operations'),
+    'sync': ('tests.test_calendar_sync', 'Incremental Calendar Sync'),
+    'scheduler': ('tests.test_scheduler', 'Meeting Time Optimizer'),
+    'timespan': ('tests.test_timespan', 'Minute-Granularity Time Model'),
+    'benchmark': ('tests.test_benchmark', 'Benchmark Harness'),
+    'analysis': ('tests.test_transcript_analysis', 'Transcript Analysis Pipeline'),
+    'prompt': ('tests.test_prompt_budget', 'Prompt Budget'),
+    'prewarm': ('tests.test_prewarm', 'Prep Pre-warming'),
 }
 
 
@@ -0,0 +1,231 @@
+"""
+Ranked meeting time suggestions
+
+Finds the best times for a meeting across participants in different time
+zones. Stored meeting times are treated as UTC; each participant brings
+their own time zone, work hours, preferred hours and buffer.
+
+For each UTC day in the range:
+- every participant's local work hours are mapped onto UTC days as
+  1440-bit masks (DST-aware, cached per zone and day)
+- the masks of the day and the days a slot starting on it can run into
+  are joined into one continuous mask, so slots can cross UTC midnight
+- busy masks (joined with the day before) are widened by each buffer,
+  across midnight too, and removed from the work hours
+- the group can meet where every participant's mask is set (bitwise AND)
+- a sweep over per-minute counts of "participants who prefer this minute"
+  scores every candidate slot in O(1) via prefix sums
+
+Candidates go through a bounded min-heap of the best top_n. Later days can
+only score lower (score = preference - day_penalty * days_from_start), so
+the search stops at the first day whose best possible score can't beat the
+current top_n.
+
+Usage:
+    suggestions = suggest_meeting_times(
+        [Participant(id="user_1", timezone="America/New_York", preferred_hours=(10, 12)),
+         Participant(id="contact_1", is_contact=True, timezone="Europe/London")],
+        "2026-03-02", "2026-03-13", duration_minutes=30, top_n=3
+    )
+"""
+
+import heapq
+from datetime import date as Date, datetime, time as Time, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import data
+import availability
+import timespan
+from availability import (
+    MINUTES_PER_DAY, bit_runs, busy_mask, free_windows, interval_mask, iter_dates, slots_in_windows
+)
+from models import Participant, SlotSuggestion
+
+FULL_DAY = interval_mask(0, MINUTES_PER_DAY)
+
+
+@lru_cache(maxsize=256)
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+@lru_cache(maxsize=4096)
+def local_hours_mask(zone_name: str, day: str, start_hour: int, end_hour: int) -> int:
+    """
+    Minutes of the UTC day `day` that fall in the local [start_hour, end_hour)
+    window of any local date - a local window can span two UTC days
+    """
+    zone = _zone(zone_name)
+    utc_day = Date.fromisoformat(day)
+    day_start = datetime.combine(utc_day, Time(0), tzinfo=timezone.utc)
+    mask = 0
+    for offset in (-1, 0, 1):
+        local_midnight = datetime.combine(utc_day + timedelta(days=offset), Time(0), tzinfo=zone)
+        bounds = []
+        for hour in (start_hour, end_hour):
+            # Wall-clock arithmetic, so DST days keep their local hours
+            local = local_midnight + timedelta(hours=hour)
+            bounds.append(int((local.astimezone(timezone.utc) - day_start).total_seconds() // 60))
+        mask |= interval_mask(*bounds)
+    return mask
+
+
+def dilate(mask: int, minutes: int, width: int = MINUTES_PER_DAY) -> int:
+    """Grow every busy run by `minutes` on both sides, clamped to a mask `width` minutes long"""
+    if minutes <= 0 or not mask:
+        return mask
+    grown, covered = mask, 1  # grown covers every distance < covered
+    while covered <= minutes:
+        step = min(covered, minutes + 1 - covered)
+        grown |= (grown << step) | (grown >> step)
+        covered += step
+    return grown & ((1 << width) - 1)
+
+
+def _join(day_masks: List[int]) -> int:
+    """One continuous mask of consecutive days' masks, the first day lowest"""
+    joined = 0
+    for offset, mask in enumerate(day_masks):
+        joined |= mask << (offset * MINUTES_PER_DAY)
+    return joined
+
+
+def _participant_busy(participant: Participant, day: str) -> int:
+    if participant.is_contact:
+        # The previous day's meetings can run past midnight into this one
+        rows = data.meetings_for_contact_on(participant.id, timespan.previous_day(day))
+        return busy_mask(rows + data.meetings_for_contact_on(participant.id, day), day)
+    return availability.user_busy_mask(participant.id, day)
+
+
+def _preference_prefix(participants: List[Participant], day: str) -> List[int]:
+    """
+    prefix[m] = sum over minutes < m of the participants who are happy with
+    that minute. Participants without preferred_hours are happy with any.
+    """
+    counts = [0] * (MINUTES_PER_DAY + 1)
+    indifferent = 0
+    for participant in participants:
+        if participant.preferred_hours is None:
+            indifferent += 1
+            continue
+        preferred = local_hours_mask(participant.timezone, day, *participant.preferred_hours)
+        for start, end in free_windows(~preferred, 0, MINUTES_PER_DAY):
+            counts[start] += 1
+            counts[end] -= 1
+    per_minute = [indifferent + running for running in accumulate(counts[:MINUTES_PER_DAY])]
+    return [0] + list(accumulate(per_minute))
+
+
+def _day_masks(participants: List[Participant], day: str) -> Tuple[List[int], List[int]]:
+    """Each participant's work hours and busy masks on a UTC day"""
+    work = [local_hours_mask(p.timezone, day, *p.work_hours) for p in participants]
+    busy = [_participant_busy(p, day) for p in participants]
+    return work, busy
+
+
+def _day_candidates(participants: List[Participant], days: List[str], masks: Dict[str, tuple],
+                    prefixes: Dict[str, List[int]], duration_minutes: int,
+                    step_minutes: int) -> List[Tuple[int, int, float]]:
+    """
+    (start, end, preference score in [0, 1]) for every slot the whole group
+    can make that starts on days[1], in minutes from its midnight
+
+    days runs from the day before (whose buffers can reach past midnight)
+    through every day a slot can run into; masks and prefixes hold
+    _day_masks() and _preference_prefix() per day and are filled as needed.
+    """
+    for day in days:
+        if day not in masks:
+            masks[day] = _day_masks(participants, day)
+    width = len(days) * MINUTES_PER_DAY
+    group = (1 << (width - MINUTES_PER_DAY)) - 1
+    for i, participant in enumerate(participants):
+        work = _join([masks[day][0][i] for day in days[1:]])
+        busy = dilate(_join([masks[day][1][i] for day in days]), participant.buffer_minutes, width)
+        group &= work & ~(busy >> MINUTES_PER_DAY)
+        if not group & FULL_DAY:
+            return []
+
+    slots = [
+        (start, end) for start, end in slots_in_windows(bit_runs(group), duration_minutes, 0, step_minutes)
+        if start < MINUTES_PER_DAY
+    ]
+    if not slots:
+        return []
+    last_day = 1 + (slots[-1][1] - 1) // MINUTES_PER_DAY  # Last day any slot reaches into
+    prefix = [0]
+    for day in days[1:last_day + 1]:
+        if day not in prefixes:
+            prefixes[day] = _preference_prefix(participants, day)
+        base = prefix[-1]
+        prefix.extend(base + total for total in prefixes[day][1:])
+    scale = duration_minutes * len(participants)
+    return [(start, end, (prefix[end] - prefix[start]) / scale) for start, end in slots]
+
+
+def suggest_meeting_times(
+    participants: List[Participant],
+    start_date: str,
+    end_date: str,
+    duration_minutes: int = 60,
+    top_n: int = 5,
+    step_minutes: int = 30,
+    day_penalty: float = 0.05
+) -> List[SlotSuggestion]:
+    """
+    Return the top_n slots between start_date and end_date (UTC, inclusive)
+    when every participant can meet, best first.
+
+    score = average share of the slot inside each participant's preferred
+    hours, minus day_penalty per day after start_date. Ties go to the
+    earlier slot.
+
+    Raises:
+        ValueError: For an empty participant list, bad dates or time zones,
+            or a non-positive duration/step/top_n
+    """
+    if not participants:
+        raise ValueError("participants cannot be empty")
+    if duration_minutes <= 0 or step_minutes <= 0 or top_n <= 0:
+        raise ValueError("duration_minutes, step_minutes and top_n must be positive")
+    for participant in participants:
+        _zone(participant.timezone)
+    days = iter_dates(start_date, end_date)
+    # Days a slot starting on a given day can run into, after that day
+    spill_days = -(-duration_minutes // MINUTES_PER_DAY)
+
+    best = []  # min-heap of (score, -day_offset, -start, day, end), size <= top_n
+    masks, prefixes = {}, {}  # Per-day inputs shared by consecutive days' candidates
+    for day_offset, day in enumerate(days):
+        ceiling = 1.0 - day_penalty * day_offset
+        if len(best) == top_n and best[0][0] >= ceiling:
+            break  # No slot on this or any later day can make the cut
+        midnight = timespan.day_start(day)
+        window = [timespan.day_of(midnight + offset * MINUTES_PER_DAY) for offset in range(-1, spill_days + 1)]
+        for stale in [key for key in masks if key < window[0]]:
+            del masks[stale]
+            prefixes.pop(stale, None)
+        candidates = _day_candidates(participants, window, masks, prefixes, duration_minutes, step_minutes)
+        for start, end, preference in candidates:
+            entry = (preference - day_penalty * day_offset, -day_offset, -start, day, end)
+            if len(best) < top_n:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+    suggestions = []
+    for score, _, negative_start, day, end in sorted(best, reverse=True):
+        day_start = datetime.combine(Date.fromisoformat(day), Time(0), tzinfo=timezone.utc)
+        suggestions.append(SlotSuggestion(
+            start=day_start + timedelta(minutes=-negative_start),
+            end=day_start + timedelta(minutes=end),
+            score=round(score, 6)
+        ))
+    return suggestions
@@ -0,0 +1,396 @@
+"""
+SQLite storage backend for data.py
+
+Persists users, contacts and meetings to a SQLite file so created meetings
+and generated prep survive restarts and the dataset doesn't have to fit in
+RAM. Each row is stored as a JSON document, with the columns used for
+lookups (user_id, contact_id, date, start_hour, start_at) copied out and
+indexed.
+
+Usage:
+    import data
+    from sqlite_backend import SQLiteBackend
+
+    backend = SQLiteBackend("meetings.db")
+    backend.import_from(data.get_backend())  # optional: seed from the fixtures
+    data.set_backend(backend)
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+import data
+import timespan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meetings (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    contact_id TEXT,
+    date TEXT NOT NULL,
+    start_hour INTEGER NOT NULL,
+    start_at INTEGER,  -- UTC epoch minutes
+    doc TEXT NOT NULL
+);
+"""
+
+# Run after _migrate(), which adds start_at to databases created without it
+INDEXES = """
+-- user_id and contact_id lookups use the leftmost columns of these;
+-- idx_meetings_user_time also serves paging in (date, start_at, id) order
+DROP INDEX IF EXISTS idx_meetings_user_date;
+DROP INDEX IF EXISTS idx_meetings_user_slot;
+DROP INDEX IF EXISTS idx_meetings_contact_slot;
+DROP INDEX IF EXISTS idx_meetings_date;
+CREATE INDEX IF NOT EXISTS idx_meetings_user_time ON meetings (user_id, date, start_at, id);
+CREATE INDEX IF NOT EXISTS idx_meetings_contact_time ON meetings (contact_id, date, start_at);
+CREATE INDEX IF NOT EXISTS idx_meetings_date_time ON meetings (date, start_at);
+"""
+
+_UPSERT_MEETING = """
+INSERT INTO meetings (id, user_id, contact_id, date, start_hour, start_at, doc)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    user_id = excluded.user_id,
+    contact_id = excluded.contact_id,
+    date = excluded.date,
+    start_hour = excluded.start_hour,
+    start_at = excluded.start_at,
+    doc = excluded.doc
+"""
+
+
+def _meeting_params(row: dict) -> tuple:
+    return (
+        row["id"],
+        row["user_id"],
+        row.get("contact_id"),
+        row["date"],
+        row["start_hour"],
+        timespan.start_at(row),
+        json.dumps(row),
+    )
+
+
+class SQLiteBackend:
+    """
+    Storage backend backed by a SQLite database file
+
+    - WAL journal mode, so readers don't block the writer and vice versa
+    - One connection per thread (sqlite3 connections aren't shareable)
+    - Writes inside `with backend.batch():` share a single transaction;
+      add_meetings() batches with executemany
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 30.0):
+        """
+        Args:
+            path: Database file path (created if missing)
+            busy_timeout: Seconds to wait for another writer's lock
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._listeners = []
+        self._gate = data.WriteGate()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        conn.executescript(INDEXES)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add and backfill start_at on a database created before it existed"""
+        conn.execute("BEGIN IMMEDIATE")  # Another process may be migrating too
+        columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(meetings)")}
+        if "start_at" in columns:
+            conn.execute("COMMIT")
+            return
+        conn.execute("ALTER TABLE meetings ADD COLUMN start_at INTEGER")
+        # julianday() of the Unix epoch is 2440587.5
+        conn.execute(
+            "UPDATE meetings SET start_at = "
+            "CAST(ROUND((julianday(date) - 2440587.5) * 1440) AS INTEGER) + start_hour * 60"
+        )
+        conn.execute("COMMIT")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly below
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def _transaction(self, mode: str = "IMMEDIATE"):
+        """Run a block in one transaction, joining an enclosing one if present"""
+        conn = self._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        # A write is in progress until its listeners return, see read_consistent()
+        with self._gate.writing():
+            conn.execute(f"BEGIN {mode}")
+            self._local.changes = []
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._local.changes = []
+                raise
+            conn.execute("COMMIT")
+            changes, self._local.changes = self._local.changes, []
+            # Only after COMMIT, so listeners never act before readers can see the write
+            if changes:
+                for listener in list(self._listeners):
+                    listener(changes)
+
+    def _record_change(self, meeting_id: str, old: Optional[dict], new: Optional[dict]):
+        """Queue a meeting change for the listeners of the enclosing transaction"""
+        self._local.changes.append((meeting_id, old, new))
+
+    def add_write_listener(self, listener):
+        """Call listener([(meeting_id, old_row, new_row), ...]) after each committed write"""
+        self._listeners.append(listener)
+
+    def remove_write_listener(self, listener):
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def batch(self):
+        """Group every write in the block into a single transaction"""
+        with self._transaction():
+            yield self
+
+    def _fetch_docs(self, sql: str, params: tuple) -> List[dict]:
+        return [json.loads(doc) for (doc,) in self._conn().execute(sql, params)]
+
+    def _fetch_doc(self, sql: str, params: tuple) -> Optional[dict]:
+        docs = self._fetch_docs(sql, params)
+        return docs[0] if docs else None
+
+    # Reads
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self._fetch_doc("SELECT doc FROM users WHERE id = ?", (user_id,))
+
+    def get_contact(self, contact_id: str) -> Optional[dict]:
+        return self._fetch_doc("SELECT doc FROM contacts WHERE id = ?", (contact_id,))
+
+    def get_meeting(self, meeting_id: str) -> Optional[dict]:
+        return self._fetch_doc("SELECT doc FROM meetings WHERE id = ?", (meeting_id,))
+
+    def _exists(self, table: str, row_id: str) -> bool:
+        cursor = self._conn().execute(f"SELECT 1 FROM {table} WHERE id = ?", (row_id,))
+        return cursor.fetchone() is not None
+
+    def user_exists(self, user_id: str) -> bool:
+        return self._exists("users", user_id)
+
+    def contact_exists(self, contact_id: str) -> bool:
+        return self._exists("contacts", contact_id)
+
+    def meeting_exists(self, meeting_id: str) -> bool:
+        return self._exists("meetings", meeting_id)
+
+    def meetings_by_id(self, meeting_ids: List[str]) -> dict:
+        """meeting_id -> row for the ids that exist, in chunks below SQLite's variable limit"""
+        found = {}
+        for start in range(0, len(meeting_ids), 500):
+            chunk = meeting_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in self._fetch_docs(f"SELECT doc FROM meetings WHERE id IN ({placeholders})", tuple(chunk)):
+                found[row["id"]] = row
+        return found
+
+    def meetings_for_user_on(self, user_id: str, date: str) -> List[dict]:
+        # Served in index order by idx_meetings_user_time, no sort step
+        return self._fetch_docs(
+            "SELECT doc FROM meetings WHERE user_id = ? AND date = ? ORDER BY start_at, id",
+            (user_id, date)
+        )
+
+    def meetings_for_contact_on(self, contact_id: str, date: str) -> List[dict]:
+        return self._fetch_docs(
+            "SELECT doc FROM meetings WHERE contact_id = ? AND date = ? ORDER BY start_at, id",
+            (contact_id, date)
+        )
+
+    def external_meetings_on(self, date: str) -> List[dict]:
+        # idx_meetings_date_time yields the date's meetings in start order
+        return self._fetch_docs(
+            "SELECT doc FROM meetings WHERE date = ? AND contact_id IS NOT NULL ORDER BY start_at, id",
+            (date,)
+        )
+
+    def recent_meetings_for_contact(self, contact_id: str, limit: int,
+                                    before: Optional[Tuple[str, int]] = None) -> List[dict]:
+        # Served in index order by idx_meetings_contact_time, no sort step
+        if before is None:
+            return self._fetch_docs(
+                "SELECT doc FROM meetings WHERE contact_id = ? "
+                "ORDER BY date DESC, start_at DESC, id DESC LIMIT ?",
+                (contact_id, limit)
+            )
+        return self._fetch_docs(
+            "SELECT doc FROM meetings WHERE contact_id = ? AND (date, start_at) < (?, ?) "
+            "ORDER BY date DESC, start_at DESC, id DESC LIMIT ?",
+            (contact_id, before[0], before[1], limit)
+        )
+
+    def query_meetings(self, user_id: str, filters, after: Optional[Tuple[str, int, str]] = None,
+                       limit: Optional[int] = None) -> List[dict]:
+        # SQLite's planner picks between the user and contact indexes; the
+        # filters on fields kept only in the JSON doc are evaluated per row
+        clauses, params = ["user_id = ?"], [user_id]
+        if filters.contact_id is not None:
+            clauses.append("contact_id = ?")
+            params.append(filters.contact_id)
+        if filters.date_from is not None:
+            clauses.append("date >= ?")
+            params.append(filters.date_from)
+        if filters.date_to is not None:
+            clauses.append("date <= ?")
+            params.append(filters.date_to)
+        if after is not None:
+            # Keyset pagination: seek past the last key instead of OFFSET-scanning
+            clauses.append("(date, start_at, id) > (?, ?, ?)")
+            params.extend(after)
+        if filters.hour_from is not None:
+            clauses.append("start_hour >= ?")
+            params.append(filters.hour_from)
+        if filters.hour_to is not None:
+            clauses.append("json_extract(doc, '$.end_hour') <= ?")
+            params.append(filters.hour_to)
+        if filters.internal is not None:
+            clauses.append("contact_id IS NULL" if filters.internal else "contact_id IS NOT NULL")
+        if filters.sentiment is not None:
+            clauses.append("json_extract(doc, '$.sentiment') = ?")
+            params.append(filters.sentiment)
+        for name, field in (("has_transcript", "transcript"), ("has_prep", "prep")):
+            wanted = getattr(filters, name)
+            if wanted is not None:
+                operator = "!=" if wanted else "="
+                clauses.append(f"COALESCE(json_extract(doc, '$.{field}'), '') {operator} ''")
+        if filters.title_contains is not None:
+            clauses.append("instr(lower(json_extract(doc, '$.title')), ?) > 0")
+            params.append(filters.title_contains.lower())
+
+        sql = f"SELECT doc FROM meetings WHERE {' AND '.join(clauses)} ORDER BY date, start_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._fetch_docs(sql, tuple(params))
+
+    def read_consistent(self, read):
+        """Run read() against a state that no write in this process (or its listeners) overlapped"""
+        return self._gate.read(read)
+
+    # Writes
+
+    def add_user(self, row: dict):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO users (id, doc) VALUES (?, ?)", (row["id"], json.dumps(row)))
+
+    def add_contact(self, row: dict):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO contacts (id, doc) VALUES (?, ?)", (row["id"], json.dumps(row)))
+
+    def add_meeting(self, row: dict):
+        with self._transaction() as conn:
+            old = self.get_meeting(row["id"])
+            conn.execute(_UPSERT_MEETING, _meeting_params(row))
+            self._record_change(row["id"], old, row)
+
+    def add_meetings(self, rows: Iterable[dict]):
+        """Insert or replace many meetings in one transaction"""
+        rows = list(rows)
+        with self._transaction() as conn:
+            current = self.meetings_by_id([row["id"] for row in rows])
+            conn.executemany(_UPSERT_MEETING, (_meeting_params(row) for row in rows))
+            for row in rows:
+                self._record_change(row["id"], current.get(row["id"]), row)
+
+    def update_meeting(self, meeting_id: str, updates: dict) -> Optional[dict]:
+        # Read-modify-write under the write lock so concurrent updates aren't lost
+        with self._transaction() as conn:
+            old = self.get_meeting(meeting_id)
+            if old is None:
+                return None
+            row = timespan.apply_update(old, updates)
+            conn.execute(_UPSERT_MEETING, _meeting_params(row))
+            self._record_change(meeting_id, old, row)
+            return row
+
+    def update_meetings(self, updates: dict) -> List[dict]:
+        """Apply meeting_id -> updates in one transaction, raises KeyError if any is missing"""
+        with self._transaction() as conn:
+            current = self.meetings_by_id(list(updates))
+            rows = []
+            for meeting_id, meeting_updates in updates.items():
+                if meeting_id not in current:
+                    raise KeyError(meeting_id)
+                rows.append(timespan.apply_update(current[meeting_id], meeting_updates))
+            conn.executemany(_UPSERT_MEETING, (_meeting_params(row) for row in rows))
+            for row in rows:
+                self._record_change(row["id"], current[row["id"]], row)
+            return rows
+
+    def delete_meetings(self, meeting_ids: List[str]):
+        """Delete meetings in one transaction, raises KeyError if any is missing"""
+        with self._transaction() as conn:
+            existing = self.meetings_by_id(meeting_ids)
+            for meeting_id in meeting_ids:
+                if meeting_id not in existing:
+                    raise KeyError(meeting_id)
+            conn.executemany("DELETE FROM meetings WHERE id = ?", ((meeting_id,) for meeting_id in meeting_ids))
+            for meeting_id in meeting_ids:
+                self._record_change(meeting_id, existing[meeting_id], None)
+
+    def write_meetings(self, rows: List[dict], deleted_ids: List[str]):
+        """Insert or replace rows and delete deleted_ids in one transaction, skipping ids already gone"""
+        with self._transaction():
+            self.add_meetings(rows)
+            existing = self.meetings_by_id(deleted_ids)
+            self._conn().executemany("DELETE FROM meetings WHERE id = ?", ((meeting_id,) for meeting_id in existing))
+            for meeting_id, row in existing.items():
+                self._record_change(meeting_id, row, None)
+
+    def delete_meeting(self, meeting_id: str) -> bool:
+        with self._transaction() as conn:
+            old = self.get_meeting(meeting_id)
+            if old is None:
+                return False
+            conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+            self._record_change(meeting_id, old, None)
+            return True
+
+    def import_from(self, backend):
+        """Copy every user, contact and meeting from an InMemoryBackend"""
+        with self.batch():
+            for row in backend.users.values():
+                self.add_user(row)
+            for row in backend.contacts.values():
+                self.add_contact(row)
+            self.add_meetings(backend.meetings.values())
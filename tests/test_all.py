@@ -14,6 +14,22 @@ import test_phase2
 import test_phase3
 import test_phase4
 import test_phase5
+import test_meeting_store
+import test_availability
+import test_async_prep
+import test_llm_cache
+import test_resilience
+import test_sqlite_backend
+import test_pagination
+import test_meeting_query
+import test_bulk_operations
+import test_calendar_sync
+import test_scheduler
+import test_timespan
+import test_benchmark
+import test_transcript_analysis
+import test_prompt_budget
+import test_prewarm
 
 
 def suite():
@@ -26,6 +42,22 @@ def suite():
     test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_phase3))
     test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_phase4))
     test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_phase5))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_meeting_store))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_availability))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_async_prep))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_llm_cache))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_resilience))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_sqlite_backend))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_pagination))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_meeting_query))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_bulk_operations))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_calendar_sync))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_scheduler))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_timespan))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_benchmark))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_transcript_analysis))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_prompt_budget))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromModule(test_prewarm))
 
     return test_suite
 
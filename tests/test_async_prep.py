@@ -0,0 +1,102 @@
+"""
+Async Batch Prep Tests
+
+Tests for the asyncio LLM client and concurrent batch prep generation.
+Run with: python run_tests.py batch
+"""
+
+import asyncio
+import time
+import unittest
+import data
+from models import CreateMeetingRequest, PrepResult
+from llm_client import AsyncMockLLMClient, ServiceUnavailableError
+from meeting_service import create_meeting, generate_pre_meeting_prep_batch
+
+
+class UnavailableClient:
+    """Async client stub whose service is always down"""
+
+    async def generate(self, prompt, system_prompt=None):
+        raise ServiceUnavailableError("ServiceUnavailableError: Service temporarily unavailable.")
+
+
+class TestAsyncBatchPrep(unittest.TestCase):
+    """Test batch prep generation with the async client"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        test_meeting_ids = [mid for mid in data.MEETINGS.keys() if mid.startswith("test_batch_")]
+        for mid in test_meeting_ids:
+            del data.MEETINGS[mid]
+        self.created = []
+
+    def tearDown(self):
+        """Remove the meetings this test created from the shared store"""
+        for meeting_id in self.created:
+            data.delete_meeting(meeting_id)
+
+    def _create(self, contact_id="contact_1", start_hour=10):
+        meeting = create_meeting(CreateMeetingRequest(
+            user_id="user_1",
+            contact_id=contact_id,
+            title="Batch Prep Meeting",
+            date="2026-03-02",
+            start_hour=start_hour,
+            end_hour=start_hour + 1
+        ))
+        self.created.append(meeting.id)
+        return meeting
+
+    def test_batch_generates_prep_for_each_meeting(self):
+        """Should return one successful result per meeting, in order"""
+        meetings = [self._create(start_hour=9 + i) for i in range(3)]
+        ids = [m.id for m in meetings]
+
+        results = asyncio.run(generate_pre_meeting_prep_batch(ids))
+
+        self.assertEqual([r.meeting_id for r in results], ids)
+        for result in results:
+            self.assertIsInstance(result, PrepResult)
+            self.assertTrue(result.success)
+            self.assertGreater(len(result.meeting.prep), 50)
+
+    def test_batch_runs_concurrently(self):
+        """Simulated latency should overlap instead of adding up"""
+        ids = [self._create(start_hour=9 + i).id for i in range(6)]
+        client = AsyncMockLLMClient(simulate_latency=True, failure_rate=0.0)
+
+        started = time.perf_counter()
+        results = asyncio.run(generate_pre_meeting_prep_batch(ids, concurrency=6, client=client))
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(all(r.success for r in results))
+        # Six sequential calls would take 3s
+        self.assertLess(elapsed, 1.5)
+
+    def test_failures_are_reported_per_meeting(self):
+        """A bad meeting should not abort the rest of the batch"""
+        internal = self._create(contact_id=None)
+        good = self._create()
+
+        results = asyncio.run(generate_pre_meeting_prep_batch(
+            ["nonexistent_meeting", internal.id, good.id]
+        ))
+
+        self.assertEqual([r.success for r in results], [False, False, True])
+        self.assertIn("not found", results[0].error)
+        self.assertIsNone(results[1].meeting)
+
+    def test_llm_failures_exhaust_retries(self):
+        """Should report an LLM failure once retries are used up"""
+        meeting = self._create()
+        client = UnavailableClient()
+
+        results = asyncio.run(generate_pre_meeting_prep_batch([meeting.id], max_retries=2, client=client))
+
+        self.assertFalse(results[0].success)
+        self.assertIn("after 2 attempts", results[0].error)
+
+
+if __name__ == '__main__':
+    unittest.main()
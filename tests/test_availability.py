@@ -0,0 +1,376 @@
+"""
+Availability Engine Tests
+
+Tests for the bitmask availability engine in availability.py.
+Run with: python run_tests.py availability
+"""
+
+import threading
+import time
+import unittest
+import data
+import availability
+import timespan
+from models import Meeting
+from availability import interval_mask, busy_mask, free_windows, find_free_slots, iter_free_slots
+from meeting_service import find_available_slots, find_available_slots_in_range
+
+
+class TestAvailabilityEngine(unittest.TestCase):
+    """Test busy masks and free window computation"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        test_meeting_ids = [mid for mid in data.MEETINGS.keys() if mid.startswith("test_engine_")]
+        for mid in test_meeting_ids:
+            del data.MEETINGS[mid]
+
+    def _add(self, meeting_id, user_id, date, start_hour, end_hour):
+        data.MEETINGS[meeting_id] = {
+            "id": meeting_id,
+            "user_id": user_id,
+            "contact_id": None,
+            "title": "Engine Test",
+            "date": date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+        }
+
+    def test_interval_mask_clamps_to_day(self):
+        """Should clamp intervals to the day and ignore empty ones"""
+        self.assertEqual(interval_mask(0, 3), 0b111)
+        self.assertEqual(interval_mask(5, 5), 0)
+        self.assertEqual(interval_mask(-10, 2), 0b11)
+        self.assertEqual(interval_mask(1430, 2000).bit_length(), availability.MINUTES_PER_DAY)
+
+    def test_overlapping_meetings_merge(self):
+        """Overlapping meetings should produce one contiguous busy block"""
+        mask = busy_mask([
+            {"start_hour": 10, "end_hour": 12},
+            {"start_hour": 11, "end_hour": 13},
+        ])
+        self.assertEqual(free_windows(mask, 9 * 60, 17 * 60), [(540, 600), (780, 1020)])
+
+    def test_free_windows_whole_day(self):
+        """Should return the whole window when nothing is busy"""
+        self.assertEqual(free_windows(0, 9 * 60, 17 * 60), [(540, 1020)])
+
+    def test_minute_granularity(self):
+        """Should find 30-minute slots on a half-hour grid"""
+        self._add("test_engine_1", "user_1", "2026-01-05", 9, 10)
+        slots = find_free_slots(["user_1"], "2026-01-05", 30, work_hours=(9, 11), step_minutes=30)
+        self.assertEqual(slots, [(600, 630), (630, 660)])
+
+    def test_group_busy_is_union(self):
+        """A minute is busy for the group if any member is busy"""
+        self._add("test_engine_2", "user_1", "2026-01-06", 9, 10)
+        self._add("test_engine_3", "user_2", "2026-01-06", 11, 12)
+        slots = find_free_slots(["user_1", "user_2"], "2026-01-06", 60, work_hours=(9, 13))
+        self.assertEqual(slots, [(600, 660), (720, 780)])
+
+    def test_invalid_duration(self):
+        """Should reject non-positive durations"""
+        with self.assertRaises(ValueError):
+            find_free_slots(["user_1"], "2026-01-05", 0)
+
+
+class TestRangeSearch(unittest.TestCase):
+    """Test multi-day availability search"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        test_meeting_ids = [mid for mid in data.MEETINGS.keys() if mid.startswith("test_range_")]
+        for mid in test_meeting_ids:
+            del data.MEETINGS[mid]
+
+    def test_skips_fully_booked_day(self):
+        """Should move on to the next day when the first is fully booked"""
+        data.MEETINGS["test_range_1"] = {
+            "id": "test_range_1", "user_id": "user_2", "contact_id": None,
+            "title": "All Day", "date": "2026-02-02", "start_hour": 9, "end_hour": 17,
+        }
+        slots = list(find_available_slots_in_range(
+            ["user_1", "user_2"], "2026-02-02", "2026-02-04", limit=2
+        ))
+
+        self.assertEqual(len(slots), 2)
+        self.assertEqual([(s.date, s.start_hour) for s in slots], [("2026-02-03", 9), ("2026-02-03", 10)])
+
+    def test_unbounded_range_covers_every_day(self):
+        """Without a limit should return every slot on every day"""
+        slots = list(iter_free_slots(["user_1"], "2026-02-09", "2026-02-11", 60))
+        self.assertEqual(len(slots), 3 * 8)
+        self.assertEqual(slots[0], ("2026-02-09", 540, 600))
+        self.assertEqual(slots[-1], ("2026-02-11", 960, 1020))
+
+    def test_is_lazy(self):
+        """Should not walk days beyond what the caller consumes"""
+        slots = iter_free_slots(["user_1"], "2026-01-01", "2099-12-31", 60)
+        self.assertEqual(next(slots), ("2026-01-01", 540, 600))
+
+    def test_validates_eagerly(self):
+        """Should raise on bad input before any slot is requested"""
+        with self.assertRaises(ValueError):
+            find_available_slots_in_range(["user_1"], "2026-02-05", "2026-02-01")
+        with self.assertRaises(ValueError):
+            find_available_slots_in_range(["invalid_user"], "2026-02-01", "2026-02-05")
+
+
+class TestMinuteTimes(unittest.TestCase):
+    """Test meetings on minute boundaries and across midnight"""
+
+    def setUp(self):
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_minutes_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _add(self, meeting_id, start_at, end_at):
+        meeting = Meeting(id=meeting_id, user_id="user_1", title="Minute Test", start_at=start_at, end_at=end_at)
+        data.add_meeting(meeting)
+
+    def test_half_hour_meeting(self):
+        """A 30-minute meeting should only block its half hour"""
+        midnight = timespan.day_start("2026-03-16")
+        self._add("test_minutes_1", midnight + 10 * 60, midnight + 10 * 60 + 30)
+        slots = find_free_slots(["user_1"], "2026-03-16", 30, work_hours=(10, 11), step_minutes=30)
+        self.assertEqual(slots, [(630, 660)])
+
+    def test_service_minute_slots(self):
+        """The service should offer half-hour slots around a half-hour meeting"""
+        midnight = timespan.day_start("2026-03-16")
+        self._add("test_minutes_4", midnight + 10 * 60, midnight + 10 * 60 + 30)
+
+        slots = find_available_slots(["user_1"], "2026-03-16", work_hours=(10, 12),
+                                     duration_minutes=30, step_minutes=30)
+        self.assertEqual([s.start_at - midnight for s in slots], [630, 660, 690])
+        self.assertEqual((slots[0].start_hour, slots[0].end_hour), (10, 11))
+
+        slots = list(find_available_slots_in_range(["user_1"], "2026-03-16", "2026-03-16", work_hours=(10, 12),
+                                                   duration_minutes=90, step_minutes=30))
+        self.assertEqual([(s.start_at - midnight, s.end_at - midnight) for s in slots], [(630, 720)])
+
+    def test_service_duration_errors_name_the_argument(self):
+        """Bad durations should be reported under the argument the caller passed"""
+        with self.assertRaisesRegex(ValueError, "duration_hours"):
+            find_available_slots(["user_1"], "2026-03-16", duration_hours=0)
+        with self.assertRaisesRegex(ValueError, "duration_minutes"):
+            find_available_slots(["user_1"], "2026-03-16", duration_minutes=0)
+
+    def test_overnight_meeting_blocks_both_days(self):
+        """A meeting across midnight should be busy time on both dates"""
+        midnight = timespan.day_start("2026-03-17")
+        self._add("test_minutes_2", midnight + 23 * 60, midnight + 25 * 60 + 30)
+
+        self.assertEqual(availability.user_busy_mask("user_1", "2026-03-17"), interval_mask(1380, 1440))
+        self.assertEqual(availability.user_busy_mask("user_1", "2026-03-18"), interval_mask(0, 90))
+
+        # Moving it a day moves both halves, and keeps its minutes
+        data.update_meeting("test_minutes_2", {"date": "2026-03-18"})
+        self.assertEqual(availability.user_busy_mask("user_1", "2026-03-18"), interval_mask(1380, 1440))
+        self.assertEqual(availability.user_busy_mask("user_1", "2026-03-19"), interval_mask(0, 90))
+
+    def test_overnight_meeting_loaded_from_previous_day(self):
+        """A freshly built mask should include the previous day's overnight meeting"""
+        midnight = timespan.day_start("2026-03-20")
+        self._add("test_minutes_3", midnight + 22 * 60, midnight + 24 * 60 + 45)
+        view = availability.BusyMaskView()
+        self.assertEqual(view.get("user_1", "2026-03-21"), interval_mask(0, 45))
+
+    def test_overlapping_minutes_merge(self):
+        """Overlapping minute intervals should merge into one busy run"""
+        mask = busy_mask([
+            {"start_at": 600, "end_at": 645},
+            {"start_at": 630, "end_at": 700},
+            {"start_at": 700, "end_at": 710},
+        ], "1970-01-01")
+        self.assertEqual(free_windows(mask, 540, 720), [(540, 600), (710, 720)])
+
+
+class TestBusyMaskView(unittest.TestCase):
+    """Test the materialized busy masks follow meeting writes"""
+
+    def setUp(self):
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_view_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _row(self, meeting_id, start_hour, date="2026-03-09", title="View Test"):
+        return {"id": meeting_id, "user_id": "user_1", "contact_id": None, "title": title,
+                "date": date, "start_hour": start_hour, "end_hour": start_hour + 1}
+
+    def test_insert_is_ored_in_without_reload(self):
+        """A new meeting should be applied to a loaded mask incrementally"""
+        view = availability.BusyMaskView()
+        self.assertEqual(view.get("user_1", "2026-03-09"), 0)
+
+        # Not written to the store, so only apply() can put it in the mask
+        view.apply([("test_view_x", None, self._row("test_view_x", 9))])
+
+        self.assertEqual(view.get("user_1", "2026-03-09"), interval_mask(540, 600))
+
+    def test_unrelated_updates_leave_masks_alone(self):
+        """Changing a title should not touch the mask"""
+        view = availability.BusyMaskView()
+        view.get("user_1", "2026-03-09")
+        row = self._row("test_view_y", 9)
+        view.apply([("test_view_y", row, {**row, "title": "Renamed"})])
+
+        self.assertEqual(view.get("user_1", "2026-03-09"), 0)
+
+    def test_follows_store_writes(self):
+        """The shared view should track creates, moves and deletes"""
+        view = availability.busy_view
+        data.MEETINGS["test_view_1"] = self._row("test_view_1", 9)
+        data.MEETINGS["test_view_2"] = self._row("test_view_2", 9)
+        self.assertEqual(view.get("user_1", "2026-03-09"), interval_mask(540, 600))
+
+        # Overlapping meeting removed: the other one still holds the hour
+        del data.MEETINGS["test_view_1"]
+        self.assertEqual(view.get("user_1", "2026-03-09"), interval_mask(540, 600))
+
+        data.update_meeting("test_view_2", {"date": "2026-03-10"})
+        self.assertEqual(view.get("user_1", "2026-03-09"), 0)
+        self.assertEqual(view.get("user_1", "2026-03-10"), interval_mask(540, 600))
+
+    def test_bounded_least_recently_used(self):
+        """Past max_size, the least recently read mask should be dropped"""
+        view = availability.BusyMaskView(max_size=2)
+        view.get("user_1", "2026-03-09")
+        view.get("user_1", "2026-03-10")
+        view.group_mask(["user_1"], "2026-03-09")  # Now the most recently used
+        view.get("user_1", "2026-03-11")
+
+        self.assertEqual(len(view), 2)
+        self.assertEqual(set(view._masks), {("user_1", "2026-03-09"), ("user_1", "2026-03-11")})
+
+        # A dropped mask is reloaded, and later writes still reach it
+        data.MEETINGS["test_view_lru"] = self._row("test_view_lru", 9, date="2026-03-10")
+        self.assertEqual(view.get("user_1", "2026-03-10"), interval_mask(540, 600))
+
+    def test_write_during_load_is_not_kept(self):
+        """A mask loaded while its day was written should not be materialized"""
+        view = availability.BusyMaskView()
+        original = data.meetings_for_user_on
+
+        def racing_lookup(user_id, date):
+            rows = original(user_id, date)
+            view.apply([("test_view_z", None, self._row("test_view_z", 9))])
+            return rows
+
+        data.meetings_for_user_on = racing_lookup
+        try:
+            view.get("user_1", "2026-03-09")
+        finally:
+            data.meetings_for_user_on = original
+        self.assertEqual(len(view), 0)
+
+    def test_group_read_during_move_is_a_snapshot(self):
+        """A meeting moved between two users should count for exactly one of them"""
+        day = "2026-03-12"
+        data.MEETINGS["test_view_move"] = self._row("test_view_move", 9, date=day)
+        availability.busy_view.get("user_1", day)  # Materialized before the move
+        availability.busy_view._masks.pop(("user_2", day), None)  # Loaded during it
+
+        # Runs before the view's listener, holding the move between the data and the masks
+        applying = threading.Event()
+
+        def slow_listener(changes):
+            if any(meeting_id == "test_view_move" for meeting_id, _, _ in changes):
+                applying.set()
+                time.sleep(0.1)
+
+        data._write_listeners.insert(0, slow_listener)
+        try:
+            mover = threading.Thread(target=data.update_meeting, args=(
+                "test_view_move", {"user_id": "user_2", "start_hour": 11, "end_hour": 12}))
+            mover.start()
+            self.assertTrue(applying.wait(5))
+            busy = availability.group_busy_mask(["user_1", "user_2"], day)
+            mover.join()
+        finally:
+            data.remove_write_listener(slow_listener)
+
+        self.assertEqual(busy, interval_mask(660, 720))
+
+
+class TestAvailabilityCache(unittest.TestCase):
+    """Test cached slots are reused and invalidated precisely"""
+
+    def setUp(self):
+        """Clean up test meetings and start from an empty cache"""
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_cache_")]:
+            del data.MEETINGS[mid]
+        availability.slot_cache.clear()
+
+    tearDown = setUp
+
+    def _add(self, meeting_id, user_id, date, start_hour):
+        data.MEETINGS[meeting_id] = {
+            "id": meeting_id, "user_id": user_id, "contact_id": None, "title": "Cache Test",
+            "date": date, "start_hour": start_hour, "end_hour": start_hour + 1,
+        }
+
+    def _cached_keys(self):
+        return set(availability.slot_cache._entries)
+
+    def test_repeat_query_is_a_hit(self):
+        """The same user set in any order should be served from the cache"""
+        first = find_free_slots(["user_1", "user_2"], "2026-03-02", 60)
+        hits = availability.slot_cache.hits
+        second = find_free_slots(["user_2", "user_1", "user_1"], "2026-03-02", 60)
+
+        self.assertEqual(first, second)
+        self.assertEqual(availability.slot_cache.hits, hits + 1)
+
+    def test_write_drops_only_its_user_and_date(self):
+        """A new meeting should invalidate its (user, date) and nothing else"""
+        find_free_slots(["user_1"], "2026-03-02", 60)
+        find_free_slots(["user_1"], "2026-03-03", 60)
+        find_free_slots(["user_2"], "2026-03-02", 60)
+
+        self._add("test_cache_1", "user_1", "2026-03-02", 9)
+
+        self.assertEqual(
+            {(key[0], key[1]) for key in self._cached_keys()},
+            {(("user_1",), "2026-03-03"), (("user_2",), "2026-03-02")}
+        )
+        self.assertNotIn((540, 600), find_free_slots(["user_1"], "2026-03-02", 60))
+
+    def test_moving_a_meeting_invalidates_both_dates(self):
+        """Updating a meeting's date should refresh the old and the new day"""
+        # Dates no other test or seed meeting uses, so user_1 is free at 9:00 on both
+        old_day, new_day = "2026-09-14", "2026-09-16"
+        self._add("test_cache_2", "user_1", old_day, 9)
+        self.assertNotIn((540, 600), find_free_slots(["user_1"], old_day, 60))
+        self.assertIn((540, 600), find_free_slots(["user_1"], new_day, 60))
+
+        data.update_meeting("test_cache_2", {"date": new_day})
+
+        self.assertIn((540, 600), find_free_slots(["user_1"], old_day, 60))
+        self.assertNotIn((540, 600), find_free_slots(["user_1"], new_day, 60))
+
+    def test_write_during_compute_is_not_cached(self):
+        """A result computed while its inputs changed should not be stored"""
+        cache = availability.AvailabilityCache()
+        key = cache.cache_key(["user_1"], "2026-03-05", 60, (9, 17), 60)
+
+        def compute():
+            cache.invalidate("user_1", "2026-03-05")  # A write lands mid-compute
+            return [(540, 600)]
+
+        self.assertEqual(cache.get_or_compute(key, compute), [(540, 600)])
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.get_or_compute(key, lambda: [(600, 660)]), [(600, 660)])
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_backend_switch_clears(self):
+        """Swapping the storage backend should drop every cached result"""
+        find_free_slots(["user_1"], "2026-03-02", 60)
+        data.set_backend(data.set_backend(data.get_backend()))
+        self.assertEqual(availability.slot_cache.stats()["size"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Benchmark Harness Tests
+
+Tests for the synthetic data generator and timing harness in benchmark.py.
+Run with: python run_tests.py benchmark
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import benchmark
+import data
+import timespan
+
+
+class TestGenerateDataset(unittest.TestCase):
+    """Test the seeded synthetic data generator"""
+
+    def test_same_seed_same_dataset(self):
+        """The same seed should produce identical rows"""
+        self.assertEqual(benchmark.generate_dataset(300, seed=7), benchmark.generate_dataset(300, seed=7))
+        self.assertNotEqual(benchmark.generate_dataset(300, seed=7).meetings,
+                            benchmark.generate_dataset(300, seed=8).meetings)
+
+    def test_shape(self):
+        """Rows should reference generated users and contacts and fall in work hours"""
+        dataset = benchmark.generate_dataset(2000, n_users=10, n_contacts=20)
+        self.assertEqual((len(dataset.users), len(dataset.contacts), len(dataset.meetings)), (10, 20, 2000))
+        for row in dataset.meetings.values():
+            self.assertIn(row["user_id"], dataset.users)
+            self.assertTrue(row["contact_id"] is None or row["contact_id"] in dataset.contacts)
+            self.assertEqual(timespan.meeting_span(row), (row["start_at"], row["end_at"]))
+            self.assertTrue(8 <= row["start_hour"] <= 17)
+
+    def test_popularity_is_skewed(self):
+        """A few users should own far more meetings than the rest"""
+        dataset = benchmark.generate_dataset(5000, n_users=50)
+        counts = sorted(
+            sum(1 for row in dataset.meetings.values() if row["user_id"] == user_id)
+            for user_id in dataset.users
+        )
+        self.assertGreater(counts[-1], 5 * counts[0])
+
+
+class TestHarness(unittest.TestCase):
+    """Test measurement, the backend swap and regression checks"""
+
+    def test_run_restores_backend(self):
+        """A run should time every operation and put the original backend back"""
+        backend = data.get_backend()
+        results = benchmark.run_benchmarks([200], iterations=5, log=lambda message: None)
+
+        self.assertIs(data.get_backend(), backend)
+        operations = results["results"][0]["operations"]
+        self.assertEqual(set(operations), {
+            "get_all_meetings", "find_available_slots", "create_meeting",
+            "get_historical_meetings_for_contact", "generate_pre_meeting_prep",
+        })
+        for stats in operations.values():
+            self.assertEqual(stats["iterations"], 5)
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+            self.assertLessEqual(stats["p99_ms"], stats["max_ms"])
+        self.assertFalse(any(mid.startswith("bench_") for mid in data.MEETINGS.keys()))
+
+    def test_percentile(self):
+        """Should use the nearest-rank method"""
+        values = list(range(1, 101))
+        self.assertEqual(benchmark._percentile(values, 50), 50)
+        self.assertEqual(benchmark._percentile(values, 99), 99)
+        self.assertEqual(benchmark._percentile([3.0], 90), 3.0)
+
+    def test_compare_results(self):
+        """Only slowdowns above the threshold should be reported"""
+        def result(p50):
+            return {"results": [{"size": 1000, "operations": {"create_meeting": {"p50_ms": p50}}}]}
+
+        self.assertEqual(benchmark.compare_results(result(1.0), result(1.1)), [])
+        regressions = benchmark.compare_results(result(1.0), result(1.5))
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("create_meeting", regressions[0])
+
+    def test_main_writes_json(self):
+        """The CLI should write results that compare cleanly against themselves"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results.json")
+            argv = ["--sizes", "100", "--iterations", "3", "--operations", "create_meeting", "--output", path]
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(benchmark.main(argv), 0)
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+            self.assertEqual(list(results["results"][0]["operations"]), ["create_meeting"])
+            self.assertEqual(benchmark.compare_results(results, results), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Bulk Operation Tests
+
+Tests for bulk create/update/delete of meetings.
+Run with: python run_tests.py bulk
+"""
+
+import unittest
+import data
+from data import MeetingStore
+from models import CreateMeetingRequest
+from meeting_service import create_meetings, update_meetings, delete_meetings, get_all_meetings
+
+
+def _request(title="Bulk Test", user_id="user_1", contact_id="contact_1", date="2026-06-01", start_hour=10):
+    return CreateMeetingRequest(
+        user_id=user_id, contact_id=contact_id, title=title,
+        date=date, start_hour=start_hour, end_hour=start_hour + 1
+    )
+
+
+class TestBulkOperations(unittest.TestCase):
+    """Test the service-level bulk APIs"""
+
+    def setUp(self):
+        """Clean up meetings created by earlier tests"""
+        for meeting_id, row in list(data.MEETINGS.items()):
+            if row["title"].startswith("Bulk Test"):
+                del data.MEETINGS[meeting_id]
+
+    tearDown = setUp
+
+    def _bulk_ids(self):
+        return {m.id for m in get_all_meetings("user_1", {"title_contains": "Bulk Test"})}
+
+    def test_create_meetings(self):
+        """Should create every meeting and index them"""
+        created = create_meetings([_request(date=f"2026-06-{day:02d}") for day in range(1, 11)])
+
+        self.assertEqual(len(created), 10)
+        self.assertEqual(len({m.id for m in created}), 10)
+        self.assertEqual(self._bulk_ids(), {m.id for m in created})
+        self.assertEqual([m["id"] for m in data.meetings_for_user_on("user_1", "2026-06-03")], [created[2].id])
+
+    def test_create_is_all_or_nothing(self):
+        """One unknown contact should reject the whole batch"""
+        with self.assertRaises(ValueError):
+            create_meetings([_request(), _request(contact_id="invalid_contact")])
+        self.assertEqual(self._bulk_ids(), set())
+
+    def test_update_meetings(self):
+        """Should update every meeting and move them between indexes"""
+        first, second = create_meetings([_request(), _request()])
+        updated = update_meetings({
+            first.id: {"date": "2026-06-02"},
+            second.id: {"title": "Bulk Test Renamed", "contact_id": "contact_2"},
+        })
+
+        self.assertEqual([m.id for m in updated], [first.id, second.id])
+        self.assertEqual([m["id"] for m in data.meetings_for_user_on("user_1", "2026-06-02")], [first.id])
+        self.assertIn(second.id, [m["id"] for m in data.meetings_for_contact_on("contact_2", "2026-06-01")])
+
+    def test_update_is_all_or_nothing(self):
+        """An invalid update should leave every meeting untouched"""
+        first, second = create_meetings([_request(), _request()])
+
+        with self.assertRaises(ValueError):
+            update_meetings({first.id: {"start_hour": 11}, second.id: {"start_hour": "noon"}})
+        with self.assertRaises(ValueError):
+            update_meetings({first.id: {"start_hour": 11}, "missing_meeting": {"title": "x"}})
+        with self.assertRaises(ValueError):
+            update_meetings({first.id: {"user_id": "invalid_user"}})
+
+        self.assertEqual(data.get_meeting(first.id).start_hour, 10)
+
+    def test_delete_meetings(self):
+        """Should delete every meeting, or none if one is missing"""
+        meetings = create_meetings([_request(), _request(), _request()])
+        ids = [m.id for m in meetings]
+
+        with self.assertRaises(ValueError):
+            delete_meetings(ids + ["missing_meeting"])
+        self.assertEqual(self._bulk_ids(), set(ids))
+
+        self.assertEqual(delete_meetings(ids), 3)
+        self.assertEqual(self._bulk_ids(), set())
+
+
+class TestWriteBatch(unittest.TestCase):
+    """Test MeetingStore.write_batch"""
+
+    def _row(self, meeting_id, date="2026-06-01"):
+        return {"id": meeting_id, "user_id": "user_1", "contact_id": "contact_1",
+                "title": "Batch", "date": date, "start_hour": 10, "end_hour": 11}
+
+    def test_mixed_batch_keeps_indexes_consistent(self):
+        """Puts, patches and deletes in one batch should leave indexes in sync"""
+        store = MeetingStore({"a": self._row("a"), "b": self._row("b")})
+        store.write_batch(
+            puts={"c": self._row("c", "2026-06-02")},
+            patches={"a": {"date": "2026-06-03"}},
+            deletes=["b"]
+        )
+
+        self.assertEqual(set(store), {"a", "c"})
+        self.assertEqual([m["id"] for m in store.for_user_on("user_1", "2026-06-01")], [])
+        self.assertEqual([m["id"] for m in store.iter_timeline("contact", "contact_1")], ["c", "a"])
+
+    def test_missing_meeting_writes_nothing(self):
+        """A patch of a missing meeting should abort the whole batch"""
+        store = MeetingStore({"a": self._row("a")})
+
+        with self.assertRaises(KeyError):
+            store.write_batch(puts={"c": self._row("c")}, patches={"missing": {"title": "x"}})
+        self.assertEqual(set(store), {"a"})
+        self.assertEqual([m["id"] for m in store.for_user("user_1")], ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
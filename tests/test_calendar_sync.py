@@ -0,0 +1,137 @@
+"""
+Calendar Sync Tests
+
+Tests for the incremental calendar ingest in calendar_sync.py.
+Run with: python run_tests.py sync
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import data
+from calendar_sync import sync_changes, sync_jsonl, meeting_id_for
+
+
+def _upsert(external_id, title="Synced Meeting", date="2026-07-01", start_hour=10, **fields):
+    return {
+        "op": "upsert", "external_id": external_id, "user_id": "user_1", "contact_id": "contact_1",
+        "title": title, "date": date, "start_hour": start_hour, "end_hour": start_hour + 1, **fields,
+    }
+
+
+def _delete(external_id):
+    return {"op": "delete", "external_id": external_id}
+
+
+class TestCalendarSync(unittest.TestCase):
+    """Test change detection, dedupe and batching"""
+
+    def setUp(self):
+        """Clean up synced meetings"""
+        synced = [mid for mid, row in data.MEETINGS.items() if (row.get("external_id") or "").startswith("test_sync_")]
+        for mid in synced:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def test_creates_then_skips_unchanged(self):
+        """Re-syncing the same feed should write nothing"""
+        feed = [_upsert(f"test_sync_{i}", start_hour=9 + i) for i in range(5)]
+
+        first = sync_changes(feed, batch_size=2)
+        second = sync_changes(feed, batch_size=2)
+
+        self.assertEqual((first.received, first.created, first.unchanged), (5, 5, 0))
+        self.assertEqual((second.created, second.updated, second.unchanged), (0, 0, 5))
+        meeting = data.get_meeting(meeting_id_for("test_sync_0"))
+        self.assertEqual((meeting.external_id, meeting.start_hour), ("test_sync_0", 9))
+
+    def test_update_keeps_local_fields(self):
+        """A changed record should update the meeting but keep its prep"""
+        sync_changes([_upsert("test_sync_1")])
+        meeting_id = meeting_id_for("test_sync_1")
+        data.update_meeting(meeting_id, {"prep": "Local notes"})
+
+        report = sync_changes([_upsert("test_sync_1", title="Moved", start_hour=14)])
+
+        self.assertEqual(report.updated, 1)
+        meeting = data.get_meeting(meeting_id)
+        self.assertEqual((meeting.title, meeting.start_hour, meeting.prep), ("Moved", 14, "Local notes"))
+        self.assertEqual([m["id"] for m in data.meetings_for_user_on("user_1", "2026-07-01")
+                          if m["id"] == meeting_id], [meeting_id])
+
+    def test_dedupes_within_batch(self):
+        """Only the last record for an external_id in a batch should apply"""
+        report = sync_changes([
+            _upsert("test_sync_2", title="First"),
+            _upsert("test_sync_2", title="Second"),
+            _upsert("test_sync_3"),
+            _delete("test_sync_3"),
+        ])
+
+        self.assertEqual((report.duplicates, report.created, report.missing), (2, 1, 1))
+        self.assertEqual(data.get_meeting(meeting_id_for("test_sync_2")).title, "Second")
+        self.assertIsNone(data.get_meeting(meeting_id_for("test_sync_3")))
+
+    def test_deletes(self):
+        """Deletes should remove synced meetings and count missing ones"""
+        sync_changes([_upsert("test_sync_4")])
+        report = sync_changes([_delete("test_sync_4"), _delete("test_sync_missing")])
+
+        self.assertEqual((report.deleted, report.missing), (1, 1))
+        self.assertFalse(data.meeting_exists(meeting_id_for("test_sync_4")))
+
+    def test_delete_racing_another_writer(self):
+        """A meeting deleted elsewhere mid-batch should count as deleted, and the batch be one write"""
+        sync_changes([_upsert("test_sync_10")])
+        gone = meeting_id_for("test_sync_10")
+        original = data.meetings_by_id
+        writes = []
+
+        def read_then_delete(meeting_ids):
+            current = original(meeting_ids)
+            data.delete_meeting(gone)  # Deleted after the batch has read it
+            return current
+
+        data.meetings_by_id = read_then_delete
+        data.add_write_listener(writes.append)
+        try:
+            report = sync_changes([_delete("test_sync_10"), _upsert("test_sync_11")])
+        finally:
+            data.meetings_by_id = original
+            data.remove_write_listener(writes.append)
+
+        self.assertEqual((report.deleted, report.created, report.failed), (1, 1, 0))
+        self.assertTrue(data.meeting_exists(meeting_id_for("test_sync_11")))
+        self.assertEqual(len(writes), 2)  # The racing delete, then the whole batch
+
+    def test_bad_records_do_not_stop_sync(self):
+        """Invalid records should be reported while the rest are applied"""
+        report = sync_changes([
+            _upsert("test_sync_5", end_hour="noon"),
+            _upsert("test_sync_6", user_id="invalid_user"),
+            {"op": "upsert", "title": "No external id"},
+            _upsert("test_sync_7"),
+        ])
+
+        self.assertEqual((report.failed, report.created), (3, 1))
+        self.assertEqual(len(report.errors), 3)
+        self.assertTrue(any("invalid_user" in error for error in report.errors))
+
+    def test_sync_jsonl(self):
+        """Should read a JSONL feed, counting unparseable lines as failures"""
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(json.dumps(_upsert("test_sync_8")) + "\n\n{not json\n")
+            f.write(json.dumps(_upsert("test_sync_9")) + "\n")
+        try:
+            report = sync_jsonl(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual((report.received, report.created, report.failed), (3, 2, 1))
+        self.assertGreater(report.records_per_second, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
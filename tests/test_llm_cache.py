@@ -0,0 +1,193 @@
+"""
+LLM Cache Tests
+
+Tests for the prompt-keyed LLM response cache and fingerprint-based
+prep reuse.
+Run with: python run_tests.py cache
+"""
+
+import unittest
+import data
+import meeting_service
+from models import CreateMeetingRequest
+from llm_client import CachedLLMClient, MockLLMClient, LLMAPIError
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingClient:
+    """Client stub that counts calls and can be told to fail"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        if self.fail:
+            raise LLMAPIError("ServiceUnavailableError: Service temporarily unavailable.")
+        return f"response to {prompt} ({system_prompt})"
+
+
+class TestCachedLLMClient(unittest.TestCase):
+    """Test hit/miss behaviour, eviction and expiry"""
+
+    def setUp(self):
+        self.inner = CountingClient()
+        self.clock = FakeClock()
+        self.client = CachedLLMClient(self.inner, max_size=2, ttl_seconds=60, clock=self.clock)
+
+    def test_repeated_prompt_is_a_hit(self):
+        """Second identical call should not reach the wrapped client"""
+        first = self.client.generate("prompt A")
+        second = self.client.generate("prompt A")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(self.client.stats()["hits"], 1)
+        self.assertEqual(self.client.stats()["misses"], 1)
+
+    def test_system_prompt_is_part_of_key(self):
+        """Same prompt with a different system prompt is a different entry"""
+        self.client.generate("prompt A", system_prompt="one")
+        self.client.generate("prompt A", system_prompt="two")
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_lru_eviction(self):
+        """Least recently used entry should be evicted when full"""
+        self.client.generate("A")
+        self.client.generate("B")
+        self.client.generate("A")  # A is now most recent
+        self.client.generate("C")  # evicts B
+
+        self.assertEqual(len(self.client), 2)
+        self.client.generate("A")
+        self.assertEqual(self.inner.calls, 3)
+        self.client.generate("B")
+        self.assertEqual(self.inner.calls, 4)
+
+    def test_ttl_expiry(self):
+        """Entries older than the TTL should be regenerated"""
+        self.client.generate("A")
+        self.clock.now = 59
+        self.client.generate("A")
+        self.assertEqual(self.inner.calls, 1)
+
+        self.clock.now = 61
+        self.client.generate("A")
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_refresh(self):
+        """refresh() should call the client despite a cached response, then cache the new one"""
+        self.client.generate("prompt A")
+        self.client.refresh("prompt A")
+        self.client.generate("prompt A")
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_failures_are_not_cached(self):
+        """An LLMAPIError should propagate and leave nothing in the cache"""
+        self.inner.fail = True
+        with self.assertRaises(LLMAPIError):
+            self.client.generate("A")
+        self.assertEqual(len(self.client), 0)
+
+        self.inner.fail = False
+        self.assertIn("response to A", self.client.generate("A"))
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_wraps_mock_client(self):
+        """Should work in front of the real mock client"""
+        client = CachedLLMClient(MockLLMClient(failure_rate=0.0))
+        prompt = "Help prepare for an upcoming meeting with contact: Jennifer Liu"
+        self.assertEqual(client.generate(prompt), client.generate(prompt))
+        self.assertEqual(client.stats()["hits"], 1)
+
+
+class TestPrepFingerprint(unittest.TestCase):
+    """Test prep is only regenerated when its inputs change"""
+
+    def setUp(self):
+        """Route prep generation through a cache in front of a counting client"""
+        self.inner = CountingClient()
+        self.original_llm = meeting_service.llm
+        meeting_service.llm = CachedLLMClient(self.inner)
+        self.meeting = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1",
+            contact_id="contact_2",
+            title="Fingerprint Test",
+            date="2026-03-10",
+            start_hour=10,
+            end_hour=11
+        ))
+        self.history_id = "test_fingerprint_history"
+
+    def tearDown(self):
+        meeting_service.llm = self.original_llm
+        data.delete_meeting(self.meeting.id)
+        data.delete_meeting(self.history_id)
+
+    def test_unchanged_inputs_reuse_prep(self):
+        """Second request with unchanged inputs should not call the LLM"""
+        first = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        second = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(first.prep, second.prep)
+        self.assertIsNotNone(second.prep_fingerprint)
+
+    def test_new_history_regenerates(self):
+        """A new past meeting with the contact should invalidate the prep"""
+        first = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        data.MEETINGS[self.history_id] = {
+            "id": self.history_id, "user_id": "user_1", "contact_id": "contact_2",
+            "title": "Follow-up", "date": "2025-10-01", "start_hour": 9, "end_hour": 10,
+            "summary": "Discussed rollout plan.", "action_items": ["Send plan"],
+        }
+
+        second = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+
+        self.assertEqual(self.inner.calls, 2)
+        self.assertNotEqual(first.prep_fingerprint, second.prep_fingerprint)
+
+    def test_later_meeting_is_not_history(self):
+        """A meeting after this one is not part of its history"""
+        first = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        data.MEETINGS[self.history_id] = {
+            "id": self.history_id, "user_id": "user_1", "contact_id": "contact_2",
+            "title": "Next Quarter", "date": "2026-06-01", "start_hour": 9, "end_hour": 10,
+        }
+
+        second = meeting_service.generate_pre_meeting_prep(self.meeting.id)
+
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(first.prep_fingerprint, second.prep_fingerprint)
+
+    def test_updated_summary_regenerates(self):
+        """Editing a past meeting's summary should invalidate the prep"""
+        meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        original = data.MEETINGS["hist_meeting_5"]["summary"]
+        try:
+            data.update_meeting("hist_meeting_5", {"summary": original + " Updated."})
+            meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        finally:
+            data.update_meeting("hist_meeting_5", {"summary": original})
+
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_force_regenerates(self):
+        """force=True should always call the LLM, even for a cached prompt"""
+        meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        meeting_service.generate_pre_meeting_prep(self.meeting.id, force=True)
+        self.assertEqual(self.inner.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Meeting Query Tests
+
+Tests for the filter engine and index planning in meeting_query.py.
+Run with: python run_tests.py query
+"""
+
+import unittest
+from data import MeetingStore
+from meeting_query import parse_filters, plan, execute
+from meeting_service import get_all_meetings
+
+
+def _row(meeting_id, date, start_hour=10, contact_id="contact_1", user_id="user_1", **extra):
+    return {
+        "id": meeting_id, "user_id": user_id, "contact_id": contact_id,
+        "title": "Weekly Sync", "date": date, "start_hour": start_hour, "end_hour": start_hour + 1,
+        **extra,
+    }
+
+
+class TestFilterEngine(unittest.TestCase):
+    """Test each filter against a small store"""
+
+    def setUp(self):
+        self.store = MeetingStore({
+            "m1": _row("m1", "2026-01-05", transcript="...", sentiment="positive"),
+            "m2": _row("m2", "2026-01-06", start_hour=15, contact_id=None, title="Internal Planning"),
+            "m3": _row("m3", "2026-01-07", contact_id="contact_2", prep="Notes"),
+            "m4": _row("m4", "2026-01-08", user_id="user_2"),
+        })
+
+    def _ids(self, **filters):
+        return [row["id"] for row in execute(self.store, "user_1", parse_filters(filters))]
+
+    def test_no_filters_returns_user_history_in_order(self):
+        """Should return every meeting of the user, oldest first"""
+        self.assertEqual(self._ids(), ["m1", "m2", "m3"])
+
+    def test_each_filter(self):
+        """Each filter should narrow the result on its own"""
+        self.assertEqual(self._ids(contact_id="contact_1"), ["m1"])
+        self.assertEqual(self._ids(date_from="2026-01-06", date_to="2026-01-06"), ["m2"])
+        self.assertEqual(self._ids(hour_from=12), ["m2"])
+        self.assertEqual(self._ids(hour_to=11), ["m1", "m3"])
+        self.assertEqual(self._ids(internal=True), ["m2"])
+        self.assertEqual(self._ids(internal=False), ["m1", "m3"])
+        self.assertEqual(self._ids(sentiment="positive"), ["m1"])
+        self.assertEqual(self._ids(has_transcript=True), ["m1"])
+        self.assertEqual(self._ids(has_prep=False), ["m1", "m2"])
+        self.assertEqual(self._ids(title_contains="planning"), ["m2"])
+
+    def test_filters_combine(self):
+        """Filters should be ANDed together"""
+        self.assertEqual(self._ids(date_from="2026-01-06", internal=False), ["m3"])
+        self.assertEqual(self._ids(contact_id="contact_1", date_from="2026-01-06"), [])
+
+    def test_rejects_bad_filters(self):
+        """Unknown names and malformed values should raise ValueError"""
+        with self.assertRaises(ValueError):
+            parse_filters({"contact": "contact_1"})
+        with self.assertRaises(ValueError):
+            parse_filters({"date_from": "01/05/2026"})
+        with self.assertRaises(ValueError):
+            get_all_meetings("user_1", {"has_prep": "sometimes"})
+
+
+class TestQueryPlanning(unittest.TestCase):
+    """Test the planner reads from the most selective index"""
+
+    def setUp(self):
+        # user_1 has a long history, mostly with contact_1
+        meetings = {f"h{i}": _row(f"h{i}", f"2025-{1 + i // 28:02d}-{1 + i % 28:02d}") for i in range(200)}
+        meetings.update({f"c{i}": _row(f"c{i}", f"2026-03-{1 + i:02d}", contact_id="contact_2") for i in range(3)})
+        self.store = MeetingStore(meetings)
+
+    def test_uses_contact_index_when_narrower(self):
+        """A rare contact should be read from the contact timeline"""
+        query_plan = plan(self.store, "user_1", parse_filters({"contact_id": "contact_2"}))
+        self.assertEqual((query_plan.index, query_plan.estimated_rows), ("contact", 3))
+        self.assertEqual(query_plan.residual, ("user_id",))
+
+    def test_uses_date_range_on_user_index(self):
+        """A narrow date range should beat a busy contact"""
+        filters = parse_filters({"contact_id": "contact_1", "date_from": "2025-02-01", "date_to": "2025-02-02"})
+        query_plan = plan(self.store, "user_1", filters)
+
+        self.assertEqual(query_plan.estimated_rows, 2)
+        self.assertEqual([row["id"] for row in execute(self.store, "user_1", filters)], ["h28", "h29"])
+
+    def test_residual_filters_only_see_indexed_range(self):
+        """Non-indexed filters should only be checked against rows in the date range"""
+        filters = parse_filters({"date_from": "2026-03-01", "title_contains": "sync"})
+        query_plan = plan(self.store, "user_1", filters)
+
+        self.assertEqual((query_plan.index, query_plan.estimated_rows), ("user", 3))
+        self.assertEqual(query_plan.residual, ("title_contains",))
+        self.assertEqual(len(list(execute(self.store, "user_1", filters))), 3)
+
+if __name__ == '__main__':
+    unittest.main()
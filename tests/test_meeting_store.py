@@ -0,0 +1,289 @@
+"""
+Meeting Store Tests
+
+Tests for the indexed in-memory meetings table in data.py.
+Run with: python run_tests.py store
+"""
+
+import bisect
+import random
+import threading
+import unittest
+import data
+import timespan
+from data import MeetingStore
+
+
+def _row(meeting_id, user_id="user_1", contact_id="contact_1", date="2025-12-01", start_hour=10):
+    return {
+        "id": meeting_id,
+        "user_id": user_id,
+        "contact_id": contact_id,
+        "title": "Store Test",
+        "date": date,
+        "start_hour": start_hour,
+        "end_hour": start_hour + 1,
+    }
+
+
+class TestMeetingStore(unittest.TestCase):
+    """Test secondary indexes stay consistent with the table"""
+
+    def setUp(self):
+        self.store = MeetingStore({
+            "m1": _row("m1"),
+            "m2": _row("m2", contact_id=None, start_hour=13),
+            "m3": _row("m3", user_id="user_2", contact_id="contact_1", date="2025-12-02"),
+        })
+
+    def test_behaves_like_dict(self):
+        """Should support the dict operations the rest of the code uses"""
+        self.assertEqual(len(self.store), 3)
+        self.assertIn("m1", self.store)
+        self.assertEqual(self.store.get("m1")["id"], "m1")
+        self.assertIsNone(self.store.get("missing"))
+        self.assertEqual(set(self.store.keys()), {"m1", "m2", "m3"})
+
+    def test_lookups_by_index(self):
+        """Should answer each index lookup with only matching meetings"""
+        self.assertEqual([m["id"] for m in self.store.for_user("user_1")], ["m1", "m2"])
+        self.assertEqual([m["id"] for m in self.store.for_contact("contact_1")], ["m1", "m3"])
+        self.assertEqual([m["id"] for m in self.store.for_user_on("user_2", "2025-12-02")], ["m3"])
+        self.assertEqual(self.store.for_user("nobody"), [])
+
+    def test_patch_reindexes(self):
+        """Should move a meeting between index buckets when its keys change"""
+        self.store.patch("m1", {"date": "2025-12-05", "contact_id": "contact_2"})
+
+        self.assertEqual(self.store.for_user_on("user_1", "2025-12-01")[0]["id"], "m2")
+        self.assertEqual([m["id"] for m in self.store.for_user_on("user_1", "2025-12-05")], ["m1"])
+        self.assertEqual([m["id"] for m in self.store.for_contact("contact_1")], ["m3"])
+        self.assertEqual([m["id"] for m in self.store.for_contact("contact_2")], ["m1"])
+
+    def test_delete_unindexes(self):
+        """Should remove a deleted meeting from every index"""
+        del self.store["m3"]
+
+        self.assertNotIn("m3", self.store)
+        self.assertEqual(self.store.for_user("user_2"), [])
+        self.assertEqual([m["id"] for m in self.store.for_contact("contact_1")], ["m1"])
+
+    def test_overwrite_reindexes(self):
+        """Should drop stale index entries when a meeting is replaced"""
+        self.store["m1"] = _row("m1", user_id="user_2")
+
+        self.assertEqual([m["id"] for m in self.store.for_user("user_1")], ["m2"])
+        self.assertEqual({m["id"] for m in self.store.for_user("user_2")}, {"m1", "m3"})
+
+    def test_recent_for_contact_newest_first(self):
+        """Should return the most recent meetings with a contact, newest first"""
+        self.store["m4"] = _row("m4", date="2025-12-02", start_hour=9)
+        self.store["m5"] = _row("m5", date="2025-11-30")
+
+        self.assertEqual([m["id"] for m in self.store.recent_for_contact("contact_1", 2)], ["m3", "m4"])
+        self.assertEqual([m["id"] for m in self.store.recent_for_contact("contact_1", 10)],
+                         ["m3", "m4", "m1", "m5"])
+        self.assertEqual(self.store.recent_for_contact("nobody", 5), [])
+
+    def test_recent_for_contact_before(self):
+        """Should only return meetings starting strictly before the cutoff"""
+        self.store["m4"] = _row("m4", date="2025-12-02", start_hour=9)
+
+        cutoff = ("2025-12-02", timespan.day_start("2025-12-02") + 10 * 60)
+        recent = self.store.recent_for_contact("contact_1", 5, before=cutoff)
+        self.assertEqual([m["id"] for m in recent], ["m4", "m1"])
+        cutoff = ("2025-12-01", timespan.day_start("2025-12-01") + 10 * 60)
+        self.assertEqual(self.store.recent_for_contact("contact_1", 5, before=cutoff), [])
+
+    def test_timeline_follows_writes(self):
+        """The sorted timeline should track patches and deletes"""
+        self.store.patch("m1", {"date": "2025-12-03"})
+        self.assertEqual([m["id"] for m in self.store.recent_for_contact("contact_1", 5)], ["m1", "m3"])
+
+        self.store.patch("m3", {"contact_id": "contact_2"})
+        del self.store["m1"]
+        self.assertEqual(self.store.recent_for_contact("contact_1", 5), [])
+        self.assertEqual([m["id"] for m in self.store.recent_for_contact("contact_2", 5)], ["m3"])
+
+    def test_external_on_date(self):
+        """The date index should hold only external meetings, in start order, and follow writes"""
+        self.store["m4"] = _row("m4", contact_id="contact_2", start_hour=8)
+        self.assertEqual([m["id"] for m in self.store.external_on("2025-12-01")], ["m4", "m1"])
+
+        self.store.patch("m1", {"contact_id": None})
+        self.store.patch("m2", {"contact_id": "contact_3"})
+        self.store.patch("m4", {"date": "2025-12-02"})
+        self.assertEqual([m["id"] for m in self.store.external_on("2025-12-01")], ["m2"])
+        self.assertEqual([m["id"] for m in self.store.external_on("2025-12-02")], ["m4", "m3"])
+        del self.store["m3"]
+        self.assertEqual([m["id"] for m in self.store.external_on("2025-12-02")], ["m4"])
+
+
+class TestTimeline(unittest.TestCase):
+    """Test the chunked sorted sequence behind the store's timelines"""
+
+    def test_matches_sorted_list(self):
+        """Updates, positions and bisects should match one flat sorted list"""
+        rng = random.Random(7)
+        timeline, expected = data._Timeline(), []
+        for _ in range(300):
+            adds = [(rng.randrange(1000), rng.random()) for _ in range(rng.randrange(1, 8))]
+            removes = set(rng.sample(expected, min(len(expected), rng.randrange(4))))
+            previous, previous_entries = timeline, list(timeline.entries())
+
+            timeline = timeline.updated(adds, removes)
+            expected = sorted([entry for entry in expected if entry not in removes] + adds)
+
+            self.assertEqual(list(previous.entries()), previous_entries)
+            self.assertEqual(len(timeline), len(expected))
+            self.assertEqual(list(timeline.entries()), expected)
+            lo, hi = sorted(rng.randrange(len(expected) + 1) for _ in range(2))
+            self.assertEqual(list(timeline.entries(lo, hi)), expected[lo:hi])
+            probe = (rng.randrange(1000),)
+            self.assertEqual(timeline.bisect_left(probe), bisect.bisect_left(expected, probe))
+            self.assertEqual(timeline.bisect_right((probe[0], 1.0)),
+                             bisect.bisect_right(expected, (probe[0], 1.0)))
+
+        self.assertGreater(len(timeline._chunks), 1)
+        self.assertLessEqual(max(len(chunk) for chunk in timeline._chunks), data._Timeline.CHUNK_SIZE)
+
+    def test_chunks_stay_bounded_under_churn(self):
+        """Chunks emptied by removes should be merged, not left behind as slivers"""
+        rng = random.Random(11)
+        original = data._Timeline.CHUNK_SIZE
+        data._Timeline.CHUNK_SIZE = 8
+        try:
+            expected = [(n,) for n in range(400)]
+            timeline = data._Timeline().updated(expected, set())
+            while len(expected) > 20:
+                removes = set(rng.sample(expected, 12))
+                adds = [(rng.randrange(400), rng.random())]
+                timeline = timeline.updated(adds, removes)
+                expected = sorted([entry for entry in expected if entry not in removes] + adds)
+
+                self.assertEqual(list(timeline.entries()), expected)
+                sizes = [len(chunk) for chunk in timeline._chunks]
+                self.assertLessEqual(max(sizes), 8)
+                self.assertLessEqual(sum(size < 2 for size in sizes), 1)
+                self.assertLessEqual(len(sizes), len(expected) // 2 + 1)
+        finally:
+            data._Timeline.CHUNK_SIZE = original
+
+
+class TestMeetingStoreConcurrency(unittest.TestCase):
+    """Test concurrent writers keep the store consistent"""
+
+    def _assert_indexes_match_rows(self, store):
+        for user_id in ("user_1", "user_2"):
+            expected = {mid for mid, row in store.items() if row["user_id"] == user_id}
+            self.assertEqual({m["id"] for m in store.for_user(user_id)}, expected)
+        for date in ("2025-12-01", "2025-12-02"):
+            expected = {mid for mid, row in store.items()
+                        if row["user_id"] == "user_1" and row["date"] == date}
+            self.assertEqual({m["id"] for m in store.for_user_on("user_1", date)}, expected)
+        expected = {mid for mid, row in store.items() if row["contact_id"] == "contact_1"}
+        self.assertEqual({m["id"] for m in store.recent_for_contact("contact_1", len(store))}, expected)
+
+    def test_concurrent_writes(self):
+        """Concurrent create/patch/delete should leave indexes consistent"""
+        store = MeetingStore()
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(200):
+                    meeting_id = f"m{(n * 7 + i) % 50}"
+                    op = i % 3
+                    if op == 0:
+                        store[meeting_id] = _row(meeting_id, user_id=f"user_{1 + i % 2}")
+                    else:
+                        try:
+                            if op == 1:
+                                store.patch(meeting_id, {"date": "2025-12-02"})
+                            else:
+                                del store[meeting_id]
+                        except KeyError:
+                            pass  # Not created yet, or deleted by another worker
+                    list(store.keys())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self._assert_indexes_match_rows(store)
+
+    def test_patch_does_not_mutate_published_row(self):
+        """Readers holding a row should keep seeing the version they read"""
+        store = MeetingStore({"m1": _row("m1")})
+        before = store["m1"]
+        store.patch("m1", {"title": "Renamed"})
+
+        self.assertEqual(before["title"], "Store Test")
+        self.assertEqual(store["m1"]["title"], "Renamed")
+
+    def test_read_consistent_retries_overlapping_write(self):
+        """A read that overlaps a write should be retried"""
+        store = MeetingStore({"m1": _row("m1")})
+        attempts = []
+
+        def read():
+            attempts.append(1)
+            if len(attempts) == 1:
+                store.patch("m1", {"start_hour": 11})
+            return store["m1"]["start_hour"]
+
+        self.assertEqual(store.read_consistent(read), 11)
+        self.assertEqual(len(attempts), 2)
+
+
+class TestDataHelpersUseStore(unittest.TestCase):
+    """Test data.py helpers keep MEETINGS indexes consistent"""
+
+    def setUp(self):
+        test_meeting_ids = [mid for mid in data.MEETINGS.keys() if mid.startswith("test_store_")]
+        for mid in test_meeting_ids:
+            del data.MEETINGS[mid]
+
+    def test_update_meeting_moves_date_index(self):
+        """data.update_meeting should re-index a meeting whose date changes"""
+        data.MEETINGS["test_store_1"] = _row("test_store_1", date="2025-12-10")
+        data.update_meeting("test_store_1", {"date": "2025-12-11"})
+
+        ids_10 = [m["id"] for m in data.MEETINGS.for_user_on("user_1", "2025-12-10")]
+        ids_11 = [m["id"] for m in data.MEETINGS.for_user_on("user_1", "2025-12-11")]
+        self.assertNotIn("test_store_1", ids_10)
+        self.assertIn("test_store_1", ids_11)
+
+    def test_delete_meeting_helper(self):
+        """data.delete_meeting should report whether anything was deleted"""
+        data.MEETINGS["test_store_2"] = _row("test_store_2")
+
+        self.assertTrue(data.delete_meeting("test_store_2"))
+        self.assertFalse(data.delete_meeting("test_store_2"))
+        self.assertNotIn("test_store_2", [m["id"] for m in data.MEETINGS.for_user("user_1")])
+
+    def test_update_meeting_validates_before_writing(self):
+        """An invalid update should raise and leave the stored row untouched"""
+        data.MEETINGS["test_store_3"] = _row("test_store_3")
+
+        with self.assertRaises(ValueError):
+            data.update_meeting("test_store_3", {"start_hour": "not an hour"})
+        self.assertEqual(data.MEETINGS["test_store_3"]["start_hour"], 10)
+
+    def test_returned_models_do_not_alias_rows(self):
+        """Mutating a returned Meeting should not change the stored row"""
+        data.MEETINGS["test_store_4"] = {**_row("test_store_4"), "action_items": ["one"]}
+
+        meeting = data.get_meeting("test_store_4")
+        meeting.action_items.append("two")
+
+        self.assertEqual(data.MEETINGS["test_store_4"]["action_items"], ["one"])
+
+
+if __name__ == '__main__':
+    unittest.main()
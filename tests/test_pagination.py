@@ -0,0 +1,97 @@
+"""
+Pagination Tests
+
+Tests for cursor pagination and streaming of a user's meetings.
+Run with: python run_tests.py pagination
+"""
+
+import unittest
+import data
+from meeting_service import get_all_meetings, get_meetings_page, iter_meetings
+
+
+def _sort_key(meeting):
+    return (meeting.date, meeting.start_hour, meeting.id)
+
+
+class TestPagination(unittest.TestCase):
+    """Test cursor pages and the streaming iterator"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        test_meeting_ids = [mid for mid in data.MEETINGS.keys() if mid.startswith("test_page_")]
+        for mid in test_meeting_ids:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _add(self, meeting_id, date, start_hour=10, contact_id=None):
+        data.MEETINGS[meeting_id] = {
+            "id": meeting_id, "user_id": "user_1", "contact_id": contact_id,
+            "title": "Page Test", "date": date, "start_hour": start_hour, "end_hour": start_hour + 1,
+        }
+
+    def _all_pages(self, page_size, filters=None):
+        meetings, cursor = [], None
+        while True:
+            page = get_meetings_page("user_1", filters, limit=page_size, cursor=cursor)
+            meetings.extend(page.meetings)
+            if page.next_cursor is None:
+                return meetings
+            cursor = page.next_cursor
+
+    def test_pages_cover_history_in_order(self):
+        """Walking every page should return each meeting once, in key order"""
+        for i in range(5):
+            self._add(f"test_page_{i}", "2026-05-01", start_hour=9 + i)
+
+        expected = sorted(get_all_meetings("user_1"), key=_sort_key)
+        for page_size in (1, 2, 7, 1000):
+            self.assertEqual([m.id for m in self._all_pages(page_size)], [m.id for m in expected])
+
+    def test_last_page_has_no_cursor(self):
+        """A page that reaches the end should not return a cursor"""
+        total = len(get_all_meetings("user_1"))
+        self.assertIsNone(get_meetings_page("user_1", limit=total).next_cursor)
+        self.assertIsNotNone(get_meetings_page("user_1", limit=total - 1).next_cursor)
+
+    def test_cursor_is_stable_across_inserts(self):
+        """Meetings inserted before the cursor should not shift the next page"""
+        own = {"title_contains": "Page Test"}  # Only this test's rows, whatever else user_1 has
+        self._add("test_page_a", "2026-05-01")
+        self._add("test_page_b", "2026-05-02")
+        self._add("test_page_c", "2026-05-03")
+        first = get_meetings_page("user_1", own, limit=1)
+        self.assertEqual([m.id for m in first.meetings], ["test_page_a"])
+
+        self._add("test_page_0", "2020-01-01")
+        second = get_meetings_page("user_1", own, limit=10, cursor=first.next_cursor)
+
+        self.assertEqual([m.id for m in second.meetings], ["test_page_b", "test_page_c"])
+
+    def test_contact_filter(self):
+        """Should page only meetings with the filtered contact"""
+        expected = sorted(get_all_meetings("user_1", {"contact_id": "contact_1"}), key=_sort_key)
+        pages = self._all_pages(1, {"contact_id": "contact_1"})
+        self.assertEqual([m.id for m in pages], [m.id for m in expected])
+
+    def test_iter_meetings_matches_pages(self):
+        """The iterator should yield the same sequence as the pages"""
+        for i in range(3):
+            self._add(f"test_page_{i}", "2026-05-01", start_hour=9 + i)
+
+        streamed = [m.id for m in iter_meetings("user_1", page_size=2)]
+        self.assertEqual(streamed, [m.id for m in self._all_pages(1000)])
+
+    def test_validates_eagerly(self):
+        """Bad input should raise before any meeting is requested"""
+        with self.assertRaises(ValueError):
+            iter_meetings("invalid_user")
+        with self.assertRaises(ValueError):
+            iter_meetings("user_1", page_size=0)
+        with self.assertRaises(ValueError):
+            get_meetings_page("user_1", cursor="not-a-cursor")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Prep Pre-warming Tests
+
+Tests for generating tomorrow's meeting prep ahead of time.
+Run with: python run_tests.py prewarm
+"""
+
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+import data
+from models import PrepResult
+from llm_client import AsyncMockLLMClient
+from meeting_service import prewarm_prep
+
+DAY = "2027-04-01"  # A date with no seed meetings
+
+
+class RecordingClient(AsyncMockLLMClient):
+    """Async mock client that records which meeting each prompt was for"""
+
+    def __init__(self, delay=0.0):
+        super().__init__(failure_rate=0.0)
+        self.delay = delay
+        self.titles = []
+        self.completed = 0
+
+    async def generate(self, prompt, system_prompt=None):
+        self.titles.append(prompt.split("Upcoming meeting: ", 1)[1].split("\n", 1)[0])
+        await asyncio.sleep(self.delay)
+        self.completed += 1
+        return await super().generate(prompt, system_prompt)
+
+
+class TestPrewarmPrep(unittest.TestCase):
+    """Test ordering, rate limiting and the deadline"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_prewarm_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _add(self, name, start_hour, contact_id="contact_1", date=DAY):
+        data.MEETINGS[f"test_prewarm_{name}"] = {
+            "id": f"test_prewarm_{name}",
+            "user_id": "user_1",
+            "contact_id": contact_id,
+            "title": name,
+            "date": date,
+            "start_hour": start_hour,
+            "end_hour": start_hour + 1,
+        }
+
+    def _run(self, client, **kwargs):
+        kwargs.setdefault("rate_per_second", 1000)
+        return asyncio.run(prewarm_prep(DAY, client=client, **kwargs))
+
+    def test_external_meetings_in_start_order(self):
+        """Only external meetings should be warmed, earliest first"""
+        for name, hour in [("late", 15), ("early", 9), ("middle", 11)]:
+            self._add(name, hour)
+        self._add("internal", 10, contact_id=None)
+        client = RecordingClient()
+
+        results = self._run(client, concurrency=1)
+
+        self.assertEqual(client.titles, ["early", "middle", "late"])
+        self.assertEqual([r.meeting_id for r in results],
+                         ["test_prewarm_early", "test_prewarm_middle", "test_prewarm_late"])
+        self.assertTrue(all(isinstance(r, PrepResult) and r.success for r in results))
+        self.assertTrue(data.MEETINGS["test_prewarm_late"]["prep"])
+
+    def test_up_to_date_prep_is_skipped(self):
+        """A second run should not call the LLM again"""
+        self._add("once", 9)
+        self._run(RecordingClient())
+        client = RecordingClient()
+        results = self._run(client)
+        self.assertEqual(client.titles, [])
+        self.assertTrue(results[0].success)
+
+    def test_rate_limit(self):
+        """Starts should be spaced by the rate limit"""
+        for hour in range(9, 13):
+            self._add(f"m{hour}", hour)
+        started = time.perf_counter()
+        self._run(RecordingClient(), rate_per_second=20)
+        # 4 starts at 20/s: the last starts 3 intervals after the first
+        self.assertGreaterEqual(time.perf_counter() - started, 0.14)
+
+    def test_deadline_cuts_off_latest_meetings(self):
+        """Work left at the deadline should be the latest meetings, reported as failed"""
+        for hour in range(9, 15):
+            self._add(f"m{hour}", hour)
+        client = RecordingClient(delay=0.05)
+
+        started = time.perf_counter()
+        results = self._run(client, concurrency=1, deadline_seconds=0.12)
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+        succeeded = [r.success for r in results]
+        self.assertEqual(succeeded, sorted(succeeded, reverse=True))
+        self.assertTrue(succeeded[0])
+        self.assertFalse(succeeded[-1])
+        self.assertIn("Deadline", results[-1].error)
+
+    def test_deadline_stops_running_generations(self):
+        """Generations cut off by the deadline should not finish or save prep afterwards"""
+        for hour in range(9, 12):
+            self._add(f"m{hour}", hour)
+        client = RecordingClient(delay=0.3)
+
+        async def main():
+            results = await prewarm_prep(DAY, client=client, rate_per_second=1000, deadline_seconds=0.1)
+            await asyncio.sleep(0.4)  # Long enough for any orphaned call to finish
+            return results
+
+        results = asyncio.run(main())
+
+        self.assertEqual(len(client.titles), 3)
+        self.assertEqual(client.completed, 0)
+        self.assertFalse(any(r.success for r in results))
+        self.assertFalse(any(data.MEETINGS[r.meeting_id].get("prep") for r in results))
+
+    def test_defaults_to_tomorrow(self):
+        """Without a date, tomorrow's (UTC) meetings should be warmed"""
+        tomorrow = (datetime.now(timezone.utc).date() + timedelta(days=1)).isoformat()
+        self._add("tomorrow", 9, date=tomorrow)
+        results = asyncio.run(prewarm_prep(client=RecordingClient(), rate_per_second=1000))
+        self.assertIn("test_prewarm_tomorrow", [r.meeting_id for r in results])
+
+    def test_invalid_arguments(self):
+        """Non-positive rates or concurrency should raise ValueError"""
+        with self.assertRaises(ValueError):
+            asyncio.run(prewarm_prep(DAY, rate_per_second=0))
+        with self.assertRaises(ValueError):
+            asyncio.run(prewarm_prep(DAY, concurrency=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
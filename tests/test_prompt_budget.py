@@ -0,0 +1,134 @@
+"""
+Prompt Budget Tests
+
+Tests for budgeted prompt assembly and the pre-meeting prep prompt.
+Run with: python run_tests.py prompt
+"""
+
+import unittest
+import data
+import prompt_budget
+from prompt_budget import PromptBuilder
+from models import CreateMeetingRequest
+from meeting_service import build_prep_prompt, create_meeting, generate_pre_meeting_prep
+
+
+class TestPromptBuilder(unittest.TestCase):
+    """Test greedy assembly within a token budget"""
+
+    def test_parts_keep_their_order(self):
+        """Parts should be joined in the order they were added, whatever their score"""
+        builder = PromptBuilder(max_tokens=100)
+        builder.add("intro")
+        builder.add_optional("low", score=0.1)
+        builder.add_optional("high", score=0.9)
+        builder.add("outro")
+        prompt = builder.build()
+        self.assertEqual(prompt.text, "intro\nlow\nhigh\noutro")
+        self.assertEqual((prompt.included, prompt.dropped), (2, 0))
+
+    def test_highest_score_wins_the_budget(self):
+        """With room for one item, the higher-scoring one should be kept"""
+        builder = PromptBuilder(max_tokens=5)  # 20 characters
+        builder.add("head")
+        builder.add_optional("x" * 12, score=0.2)
+        builder.add_optional("y" * 12, score=0.8)
+        prompt = builder.build()
+        self.assertEqual(prompt.text, "head\n" + "y" * 12)
+        self.assertEqual((prompt.included, prompt.dropped), (1, 1))
+
+    def test_fallback_and_skip(self):
+        """Items that don't fit should fall back to their short form, and smaller ones still be tried"""
+        builder = PromptBuilder(max_tokens=5)
+        builder.add_optional("a" * 30, score=0.9, fallback="short")
+        builder.add_optional("b" * 30, score=0.8)
+        builder.add_optional("c" * 10, score=0.1)
+        prompt = builder.build()
+        self.assertEqual(prompt.text, "short\n" + "c" * 10)
+        self.assertLessEqual(prompt.estimated_tokens, 5)
+
+    def test_required_parts_exceed_budget(self):
+        """Required parts should never be dropped"""
+        prompt = PromptBuilder(max_tokens=1).add("x" * 40).build()
+        self.assertEqual(prompt.estimated_tokens, 10)
+
+    def test_rank_score(self):
+        """Scores should decay with age and rise with relevance"""
+        query = prompt_budget.keywords("Pricing review for the Q4 contract")
+        self.assertEqual(query, {"pricing", "review", "contract"})
+        self.assertGreater(prompt_budget.rank_score(0, "Demo", query), prompt_budget.rank_score(1, "Demo", query))
+        self.assertGreater(prompt_budget.rank_score(2, "Contract pricing", query),
+                           prompt_budget.rank_score(0, "Demo", query))
+
+
+class TestPrepPrompt(unittest.TestCase):
+    """Test the budgeted pre-meeting prep prompt"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_budget_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _add_history(self, count, summary_words=200, relevant_at=None):
+        for i in range(count):
+            title = "Pricing negotiation" if i == relevant_at else f"Weekly sync {i}"
+            data.MEETINGS[f"test_budget_{i}"] = {
+                "id": f"test_budget_{i}",
+                "user_id": "user_1",
+                "contact_id": "contact_2",
+                "title": title,
+                "date": f"2027-01-{i + 1:02d}",
+                "start_hour": 10,
+                "end_hour": 11,
+                "summary": " ".join(["discussion"] * summary_words),
+                "action_items": ["Send notes"],
+            }
+        data.MEETINGS["test_budget_next"] = {
+            "id": "test_budget_next",
+            "user_id": "user_1",
+            "contact_id": "contact_2",
+            "title": "Pricing follow-up",
+            "date": "2027-02-01",
+            "start_hour": 10,
+            "end_hour": 11,
+        }
+
+    def test_long_history_stays_within_budget(self):
+        """Long summaries should be trimmed to fit the budget"""
+        self._add_history(10, summary_words=500)
+        prompt = build_prep_prompt("test_budget_next", max_tokens=800)
+        self.assertLessEqual(prompt.estimated_tokens, 800)
+        self.assertGreater(prompt.dropped + prompt.text.count("- 2027-01-"), 0)
+        self.assertIn("Past meetings (10 total)", prompt.text)
+
+    def test_relevant_history_beats_recency(self):
+        """An older meeting on the same subject should be kept over a recent unrelated one"""
+        self._add_history(10, relevant_at=8)
+        prompt = build_prep_prompt("test_budget_next", max_tokens=800)
+        self.assertIn("Pricing negotiation\n  Summary:", prompt.text)
+        self.assertIn("Weekly sync 9\n", prompt.text)
+        self.assertNotIn("Weekly sync 9\n  Summary:", prompt.text)
+
+    def test_first_meeting(self):
+        """A meeting before any history with the contact should get the first-meeting prompt"""
+        meeting = create_meeting(CreateMeetingRequest(
+            user_id="user_2", contact_id="contact_3", title="Intro",
+            date="2020-01-06", start_hour=10, end_hour=11
+        ))
+        try:
+            self.assertIn("first meeting with this contact", build_prep_prompt(meeting.id).text)
+        finally:
+            data.delete_meeting(meeting.id)
+
+    def test_prep_records_prompt_size(self):
+        """Generated prep should record the estimated prompt size"""
+        self._add_history(3)
+        meeting = generate_pre_meeting_prep("test_budget_next")
+        self.assertEqual(meeting.prep_prompt_tokens, build_prep_prompt("test_budget_next").estimated_tokens)
+        self.assertGreater(meeting.prep_prompt_tokens, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,459 @@
+"""
+Resilience Tests
+
+Tests for the circuit breaker, retry budget, jittered backoff and
+single-flight coalescing used around LLM calls.
+Run with: python run_tests.py resilience
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import meeting_service
+from models import CreateMeetingRequest
+from llm_client import (
+    CachedLLMClient,
+    LLMAPIError,
+    RateLimitError,
+    ServiceUnavailableError,
+    InvalidRequestError,
+)
+from resilience import (
+    BreakerLLMClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    SingleFlight,
+    retry_delay,
+)
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingClient:
+    """Client stub that raises a given error and counts calls"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        raise self.error
+
+
+class EchoClient:
+    """Client stub that echoes the prompt, or raises error if one is set"""
+
+    def __init__(self):
+        self.error = None
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return f"answer to {prompt}"
+
+
+class SlowClient:
+    """Client stub that answers after a delay and counts calls"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return "PREP: " + prompt[:20]
+
+
+class AsyncSlowClient(SlowClient):
+    """Async version of SlowClient"""
+
+    async def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return "PREP: " + prompt[:20]
+
+
+def _fail(error):
+    raise error
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test closed / open / half-open transitions"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=self.clock)
+
+    def _trip(self):
+        for _ in range(2):
+            with self.assertRaises(ServiceUnavailableError):
+                self.breaker.call(_fail, ServiceUnavailableError("down"))
+
+    def test_opens_after_threshold(self):
+        """Should open after consecutive failures and then fail fast"""
+        self._trip()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(calls.append, "x")
+        self.assertEqual(calls, [])
+
+    def test_success_resets_failure_count(self):
+        """A success between failures should keep the circuit closed"""
+        with self.assertRaises(ServiceUnavailableError):
+            self.breaker.call(_fail, ServiceUnavailableError("down"))
+        self.breaker.call(lambda: "ok")
+        with self.assertRaises(ServiceUnavailableError):
+            self.breaker.call(_fail, ServiceUnavailableError("down"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_closes_on_success(self):
+        """After the timeout one probe is allowed; success closes the circuit"""
+        self._trip()
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_reopens_on_failure(self):
+        """A failed probe should re-open the circuit for another timeout"""
+        self._trip()
+        self.clock.now = 10
+        with self.assertRaises(ServiceUnavailableError):
+            self.breaker.call(_fail, ServiceUnavailableError("still down"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_invalid_requests_do_not_trip(self):
+        """Client errors say nothing about service health"""
+        for _ in range(5):
+            with self.assertRaises(InvalidRequestError):
+                self.breaker.call(_fail, InvalidRequestError("bad"))
+            with self.assertRaises(ValueError):
+                self.breaker.call(_fail, ValueError("bad input"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestBreakerBehindCache(unittest.TestCase):
+    """Test a CachedLLMClient around a BreakerLLMClient"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=self.clock)
+        self.inner = EchoClient()
+        self.client = CachedLLMClient(BreakerLLMClient(self.inner, self.breaker))
+
+    def _open_circuit(self):
+        self.client.generate("cached")
+        self.inner.error = ServiceUnavailableError("down")
+        with self.assertRaises(ServiceUnavailableError):
+            self.client.generate("miss")
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_cached_response_served_while_open(self):
+        """Cache hits should not consult the breaker; misses should fail fast"""
+        self._open_circuit()
+        calls = self.inner.calls
+
+        self.assertEqual(self.client.generate("cached"), "answer to cached")
+        with self.assertRaises(CircuitOpenError):
+            self.client.generate("other")
+        self.assertEqual(self.inner.calls, calls)
+
+    def test_cache_hit_does_not_close_half_open_circuit(self):
+        """Only a real call should count as the half-open probe"""
+        self._open_circuit()
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.client.generate("cached")
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.inner.error = None
+        self.client.generate("probe")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestBackoffAndBudget(unittest.TestCase):
+    """Test jittered delays and the retry token bucket"""
+
+    def test_full_jitter_bounds(self):
+        """Delay should be uniform in [0, min(max_delay, base * 2^attempt)]"""
+        error = ServiceUnavailableError("down")
+        self.assertEqual(retry_delay(error, 0, rng=lambda: 0.0), 0.0)
+        self.assertAlmostEqual(retry_delay(error, 2, rng=lambda: 1.0), 0.4)
+        self.assertEqual(retry_delay(error, 20, max_delay=2.0, rng=lambda: 1.0), 2.0)
+
+    def test_rate_limit_backs_off_longer(self):
+        """Rate limits should use a longer backoff than other errors"""
+        slow = retry_delay(RateLimitError("slow down"), 1, rng=lambda: 1.0)
+        normal = retry_delay(ServiceUnavailableError("down"), 1, rng=lambda: 1.0)
+        self.assertGreater(slow, normal)
+
+    def test_budget_is_bounded(self):
+        """Retries should stop once tokens run out, and refill with traffic"""
+        clock = FakeClock()
+        budget = RetryBudget(capacity=2, deposit_per_request=0.5, refill_per_second=0, clock=clock)
+
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+        budget.record_request()
+        budget.record_request()
+        self.assertTrue(budget.try_spend())
+
+
+class TestServiceRetryPolicy(unittest.TestCase):
+    """Test generate_pre_meeting_prep_with_retry uses the shared policy"""
+
+    def setUp(self):
+        self.original = (meeting_service.llm, meeting_service.llm_breaker, meeting_service.llm_retry_budget)
+        meeting_service.llm_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        meeting_service.llm_retry_budget = RetryBudget()
+        self.meeting = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1",
+            contact_id="contact_1",
+            title="Resilience Test",
+            date="2026-03-20",
+            start_hour=10,
+            end_hour=11
+        ))
+
+    def tearDown(self):
+        meeting_service.llm, meeting_service.llm_breaker, meeting_service.llm_retry_budget = self.original
+
+    def _use(self, client):
+        """Route prep generation through client, behind the service's breaker"""
+        meeting_service.llm = BreakerLLMClient(client, meeting_service.llm_breaker)
+        return client
+
+    def test_invalid_request_not_retried(self):
+        """InvalidRequestError should be raised after a single call"""
+        client = self._use(FailingClient(InvalidRequestError("bad")))
+        with self.assertRaises(InvalidRequestError):
+            meeting_service.generate_pre_meeting_prep_with_retry(self.meeting.id, max_retries=5)
+        self.assertEqual(client.calls, 1)
+
+    def test_open_circuit_fails_fast(self):
+        """Once the breaker opens, callers should not call the LLM or sleep"""
+        client = self._use(FailingClient(ServiceUnavailableError("down")))
+        with self.assertRaises(LLMAPIError):
+            meeting_service.generate_pre_meeting_prep_with_retry(self.meeting.id, max_retries=5, max_delay=0.01)
+        calls_before = client.calls
+
+        started = time.perf_counter()
+        with self.assertRaises(CircuitOpenError):
+            meeting_service.generate_pre_meeting_prep_with_retry(self.meeting.id, max_retries=5)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(client.calls, calls_before)
+        self.assertLess(elapsed, 0.05)
+
+    def test_budget_exhaustion_stops_retries(self):
+        """An empty retry budget should end the retry loop early"""
+        meeting_service.llm_breaker = CircuitBreaker(failure_threshold=100)
+        meeting_service.llm_retry_budget = RetryBudget(capacity=1, deposit_per_request=0, refill_per_second=0)
+        client = self._use(FailingClient(ServiceUnavailableError("down")))
+
+        with self.assertRaises(LLMAPIError):
+            meeting_service.generate_pre_meeting_prep_with_retry(self.meeting.id, max_retries=5, max_delay=0.01)
+        self.assertEqual(client.calls, 2)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test coalescing of concurrent calls"""
+
+    def test_threads_share_one_call(self):
+        """Concurrent thread callers with one key should run the function once"""
+        flights = SingleFlight()
+        calls = []
+        gate = threading.Event()
+
+        def work():
+            calls.append(1)
+            gate.wait(1)
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flights.do, "key", work) for _ in range(8)]
+            while flights.shared < 7:
+                time.sleep(0.001)
+            gate.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, ["done"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """Waiters should get the leader's exception, and the next call should run afresh"""
+        flights = SingleFlight()
+        gate = threading.Event()
+
+        def boom():
+            gate.wait(1)
+            raise ServiceUnavailableError("down")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flights.do, "key", boom) for _ in range(3)]
+            while flights.shared < 2:
+                time.sleep(0.001)
+            gate.set()
+            for future in futures:
+                with self.assertRaises(ServiceUnavailableError):
+                    future.result()
+
+        self.assertEqual(flights.do("key", lambda: "fresh"), "fresh")
+
+    def test_different_keys_run_separately(self):
+        """Calls with different keys should not be coalesced"""
+        flights = SingleFlight()
+        self.assertEqual([flights.do(k, lambda k=k: k) for k in "ab"], ["a", "b"])
+        self.assertEqual(flights.shared, 0)
+
+    def test_async_callers_share_one_task(self):
+        """Concurrent coroutines with one key should await one task"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def main():
+            return await asyncio.gather(*(flights.do_async("key", work) for _ in range(10)))
+
+        self.assertEqual(asyncio.run(main()), ["done"] * 10)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_cancelled_waiter_does_not_cancel_flight(self):
+        """Cancelling one waiter should leave the shared task running for the rest"""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            first = asyncio.ensure_future(flights.do_async("key", work))
+            second = asyncio.ensure_future(flights.do_async("key", work))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), "done")
+
+    def test_cancelling_every_waiter_cancels_flight(self):
+        """Once no caller is waiting, the shared task should be cancelled and forgotten"""
+        flights = SingleFlight()
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+            return "done"
+
+        async def main():
+            waiters = [asyncio.ensure_future(flights.do_async("key", work)) for _ in range(2)]
+            await asyncio.sleep(0)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            self.assertEqual(flights.in_flight(), 0)
+            again = await flights.do_async("key", work)  # Starts afresh
+            await asyncio.sleep(0.1)
+            return again
+
+        self.assertEqual(asyncio.run(main()), "done")
+        self.assertEqual(finished, [True])
+
+
+class TestPrepCoalescing(unittest.TestCase):
+    """Test concurrent prep requests for one meeting share a generation"""
+
+    def setUp(self):
+        self.original = (meeting_service.llm, meeting_service.async_llm)
+        self.meeting = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1",
+            contact_id="contact_1",
+            title="Coalescing Test",
+            date="2026-03-21",
+            start_hour=10,
+            end_hour=11
+        ))
+
+    def tearDown(self):
+        meeting_service.llm, meeting_service.async_llm = self.original
+        meeting_service.delete_meeting(self.meeting.id)
+
+    def test_threads_share_prep_generation(self):
+        """Simultaneous callers should cause one LLM call and all get the prep"""
+        meeting_service.llm = SlowClient()
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(meeting_service.generate_pre_meeting_prep_with_retry, self.meeting.id)
+                       for _ in range(6)]
+            results = [f.result() for f in futures]
+
+        self.assertEqual(meeting_service.llm.calls, 1)
+        self.assertEqual({r.prep for r in results}, {results[0].prep})
+        self.assertTrue(results[0].prep.startswith("PREP: "))
+
+    def test_async_callers_share_prep_generation(self):
+        """Concurrent coroutines should cause one LLM call"""
+        client = AsyncSlowClient()
+
+        async def main():
+            return await asyncio.gather(*(
+                meeting_service.generate_pre_meeting_prep_async(self.meeting.id, client) for _ in range(6)
+            ))
+
+        results = asyncio.run(main())
+        self.assertEqual(client.calls, 1)
+        self.assertEqual({r.prep for r in results}, {results[0].prep})
+
+    def test_forced_call_does_not_join_normal_flight(self):
+        """force=True during a normal generation should still reach the client"""
+        inner = SlowClient(delay=0.1)
+        meeting_service.llm = CachedLLMClient(inner)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            normal = pool.submit(meeting_service.generate_pre_meeting_prep, self.meeting.id)
+            time.sleep(0.02)  # The normal call is now in flight
+            forced = pool.submit(meeting_service.generate_pre_meeting_prep, self.meeting.id, True)
+            normal.result(), forced.result()
+
+        self.assertEqual(inner.calls, 2)
+        meeting_service.generate_pre_meeting_prep(self.meeting.id, force=True)
+        self.assertEqual(inner.calls, 3)
+
+    def test_new_fingerprint_is_a_new_flight(self):
+        """A later request after the inputs change should generate again"""
+        meeting_service.llm = SlowClient(delay=0)
+        meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        meeting_service.update_meetings({self.meeting.id: {"title": "Coalescing Test, renamed"}})
+        meeting_service.generate_pre_meeting_prep(self.meeting.id)
+        self.assertEqual(meeting_service.llm.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Meeting Time Optimizer Tests
+
+Tests for ranked meeting time suggestions in scheduler.py.
+Run with: python run_tests.py scheduler
+"""
+
+import unittest
+from datetime import datetime, timezone
+
+import data
+import scheduler
+from models import Participant
+from meeting_service import suggest_meeting_times
+
+DAY = "2027-03-01"  # A Monday with no seed meetings
+
+
+def utc(day, hour, minute=0):
+    year, month, dom = map(int, day.split("-"))
+    return datetime(year, month, dom, hour, minute, tzinfo=timezone.utc)
+
+
+class TestSchedulerMasks(unittest.TestCase):
+    """Test time zone windows and buffer dilation"""
+
+    def test_utc_work_hours(self):
+        """UTC work hours should map straight onto the day"""
+        mask = scheduler.local_hours_mask("UTC", DAY, 9, 17)
+        self.assertEqual(mask, scheduler.interval_mask(9 * 60, 17 * 60))
+
+    def test_offset_zone(self):
+        """New York 9-17 in winter should be 14:00-22:00 UTC"""
+        mask = scheduler.local_hours_mask("America/New_York", DAY, 9, 17)
+        self.assertEqual(mask, scheduler.interval_mask(14 * 60, 22 * 60))
+
+    def test_window_crossing_utc_midnight(self):
+        """Tokyo windows should map across the UTC day boundary"""
+        mask = scheduler.local_hours_mask("Asia/Tokyo", DAY, 9, 17)
+        self.assertEqual(mask, scheduler.interval_mask(0, 8 * 60))
+        mask = scheduler.local_hours_mask("Asia/Tokyo", DAY, 7, 17)
+        self.assertEqual(scheduler.free_windows(~mask, 0, 1440), [(0, 480), (1320, 1440)])
+
+    def test_daylight_saving(self):
+        """New York should shift one hour earlier in UTC after DST starts"""
+        mask = scheduler.local_hours_mask("America/New_York", "2027-03-15", 9, 17)
+        self.assertEqual(mask, scheduler.interval_mask(13 * 60, 21 * 60))
+
+    def test_dilate(self):
+        """Buffers should widen busy runs on both sides"""
+        busy = scheduler.interval_mask(600, 660)
+        self.assertEqual(scheduler.dilate(busy, 15), scheduler.interval_mask(585, 675))
+        self.assertEqual(scheduler.dilate(busy, 0), busy)
+        self.assertEqual(scheduler.dilate(scheduler.interval_mask(0, 10), 7), scheduler.interval_mask(0, 17))
+
+    def test_unknown_timezone(self):
+        """Unknown time zones should raise ValueError"""
+        with self.assertRaises(ValueError):
+            scheduler.suggest_meeting_times([Participant(id="user_1", timezone="Mars/Base")], DAY, DAY)
+
+
+class TestSuggestMeetingTimes(unittest.TestCase):
+    """Test ranking across participants"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_sched_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _add(self, meeting_id, user_id, start_hour, end_hour, contact_id=None, date=DAY):
+        data.MEETINGS[meeting_id] = {
+            "id": meeting_id,
+            "user_id": user_id,
+            "contact_id": contact_id,
+            "title": "Scheduler Test",
+            "date": date,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+        }
+
+    def test_overlap_across_zones(self):
+        """Only the overlap of New York and London work hours should be offered"""
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", timezone="America/New_York"),
+            Participant(id="user_2", timezone="Europe/London"),
+        ], DAY, DAY, duration_minutes=60, top_n=10)
+        starts = [s.start for s in suggestions]
+        self.assertEqual(starts, [utc(DAY, 14), utc(DAY, 14, 30), utc(DAY, 15), utc(DAY, 15, 30), utc(DAY, 16)])
+
+    def test_preferred_hours_rank_first(self):
+        """Slots inside preferred hours should outrank the rest"""
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", preferred_hours=(15, 16)),
+        ], DAY, DAY, duration_minutes=60, top_n=3)
+        self.assertEqual(suggestions[0].start, utc(DAY, 15))
+        self.assertEqual(suggestions[0].score, 1.0)
+        self.assertEqual(suggestions[1].score, 0.5)
+
+    def test_busy_and_buffer(self):
+        """Busy time plus the buffer around it should be excluded"""
+        self._add("test_sched_1", "user_1", 10, 11)
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", work_hours=(9, 12), buffer_minutes=30),
+        ], DAY, DAY, duration_minutes=30, top_n=10)
+        self.assertEqual([s.start for s in suggestions], [utc(DAY, 9), utc(DAY, 11, 30)])
+
+    def test_slot_across_utc_midnight(self):
+        """Los Angeles and Sydney share 22:00-01:00 UTC, so a slot can end the next UTC day"""
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", timezone="America/Los_Angeles"),
+            Participant(id="user_2", timezone="Australia/Sydney"),
+        ], DAY, DAY, duration_minutes=60, top_n=10)
+        # 00:00 is the end of the overlap that began the day before
+        self.assertEqual([s.start for s in suggestions],
+                         [utc(DAY, 0), utc(DAY, 22), utc(DAY, 22, 30), utc(DAY, 23), utc(DAY, 23, 30)])
+        self.assertEqual(suggestions[-1].end, utc("2027-03-02", 0, 30))
+
+    def test_buffer_across_utc_midnight(self):
+        """A buffer before a meeting just after midnight should block the end of the day before"""
+        self._add("test_sched_3", "user_1", 0, 1, date="2027-03-02")
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", work_hours=(0, 24), buffer_minutes=30),
+        ], DAY, DAY, duration_minutes=30, top_n=100)
+        self.assertEqual(suggestions[-1].start, utc(DAY, 23))
+
+    def test_contact_calendar(self):
+        """A contact's meetings should block the slot"""
+        self._add("test_sched_2", "user_2", 9, 16, contact_id="contact_1")
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1"),
+            Participant(id="contact_1", is_contact=True),
+        ], DAY, DAY, duration_minutes=60, top_n=10)
+        self.assertEqual([s.start for s in suggestions], [utc(DAY, 16)])
+
+    def test_earlier_days_win_ties(self):
+        """With equal preference, earlier days should rank higher"""
+        suggestions = suggest_meeting_times(
+            [Participant(id="user_1")], DAY, "2027-03-05", duration_minutes=60, top_n=20
+        )
+        self.assertEqual(len(suggestions), 20)
+        self.assertEqual(suggestions[0].start, utc(DAY, 9))
+        self.assertTrue(all(a.score >= b.score for a, b in zip(suggestions, suggestions[1:])))
+        self.assertLess(suggestions[-1].score, suggestions[0].score)
+
+    def test_many_participants_long_range(self):
+        """Should handle 30+ participants over several weeks"""
+        participants = [
+            Participant(id="user_1", timezone=tz, preferred_hours=(10, 12))
+            for tz in ["Europe/London", "Europe/Berlin", "UTC"] * 11
+        ]
+        suggestions = suggest_meeting_times(participants, DAY, "2027-03-28", duration_minutes=30, top_n=5)
+        self.assertEqual(len(suggestions), 5)
+        # Only 10:00-11:00 UTC suits everyone; a perfect next-day slot beats a partial one today
+        self.assertEqual([s.start for s in suggestions[:2]], [utc(DAY, 10), utc(DAY, 10, 30)])
+        self.assertEqual(suggestions[2].start, utc("2027-03-02", 10))
+        self.assertAlmostEqual(suggestions[2].score, 0.95)
+
+    def test_unknown_participant(self):
+        """Unknown users or contacts should raise ValueError"""
+        with self.assertRaises(ValueError):
+            suggest_meeting_times([Participant(id="user_nope")], DAY, DAY)
+        with self.assertRaises(ValueError):
+            suggest_meeting_times([Participant(id="contact_nope", is_contact=True)], DAY, DAY)
+
+    def test_no_common_time(self):
+        """Participants with no shared hours should get no suggestions"""
+        suggestions = suggest_meeting_times([
+            Participant(id="user_1", work_hours=(9, 12)),
+            Participant(id="user_2", work_hours=(13, 17)),
+        ], DAY, DAY)
+        self.assertEqual(suggestions, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
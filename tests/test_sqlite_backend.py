@@ -0,0 +1,271 @@
+"""
+SQLite Backend Tests
+
+Tests for the persistent SQLite storage backend behind data.py.
+Run with: python run_tests.py sqlite
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import data
+import meeting_service
+import timespan
+from models import CreateMeetingRequest, Meeting, MeetingFilters
+from sqlite_backend import SQLiteBackend
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    """Test the service layer running on the SQLite backend"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "meetings.db")
+        self.backend = SQLiteBackend(self.path)
+        self.backend.import_from(data.get_backend())
+        self.previous = data.set_backend(self.backend)
+
+    def tearDown(self):
+        data.set_backend(self.previous)
+        self.backend.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_uses_wal_mode(self):
+        """Should open the database in WAL journal mode"""
+        mode = self.backend._conn().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_helpers_read_imported_fixtures(self):
+        """data.py helpers should return the same fixtures as in memory"""
+        self.assertEqual(data.get_user("user_1").name, "Sarah Chen")
+        self.assertTrue(data.contact_exists("contact_3"))
+        self.assertFalse(data.meeting_exists("nonexistent"))
+
+        history = data.get_historical_meetings_for_contact("contact_1", limit=50)
+        self.assertIn("hist_meeting_3", [m.id for m in history])
+        keys = [(m.date, m.start_hour) for m in history]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_service_crud_round_trip(self):
+        """Create, read, update and delete should go through SQLite"""
+        meeting = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_2",
+            contact_id="contact_2",
+            title="SQLite Meeting",
+            date="2026-04-01",
+            start_hour=10,
+            end_hour=11
+        ))
+        self.assertNotIn(meeting.id, data.MEETINGS)
+
+        fetched = meeting_service.get_meeting(meeting.id)
+        self.assertIsInstance(fetched, Meeting)
+        self.assertEqual(fetched.title, "SQLite Meeting")
+
+        updated = data.update_meeting(meeting.id, {"summary": "Went well"})
+        self.assertEqual(updated.summary, "Went well")
+
+        slots = meeting_service.find_available_slots(["user_2"], "2026-04-01")
+        self.assertNotIn(10, [s.start_hour for s in slots])
+
+        self.assertTrue(meeting_service.delete_meeting(meeting.id))
+        self.assertFalse(data.meeting_exists(meeting.id))
+
+    def test_data_survives_restart(self):
+        """A new backend on the same file should see earlier writes"""
+        meeting = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1",
+            contact_id="contact_1",
+            title="Persisted",
+            date="2026-04-02",
+            start_hour=9,
+            end_hour=10
+        ))
+        meeting_service.generate_pre_meeting_prep(meeting.id)
+
+        reopened = SQLiteBackend(self.path)
+        try:
+            row = reopened.get_meeting(meeting.id)
+            self.assertEqual(row["title"], "Persisted")
+            self.assertIsNotNone(row["prep"])
+        finally:
+            reopened.close()
+
+    def test_batch_is_atomic(self):
+        """An error inside batch() should roll back every write in it"""
+        with self.assertRaises(RuntimeError):
+            with self.backend.batch():
+                self.backend.add_meetings([
+                    {"id": "test_sqlite_1", "user_id": "user_1", "contact_id": None,
+                     "title": "Batch", "date": "2026-04-03", "start_hour": 9, "end_hour": 10},
+                ])
+                raise RuntimeError("abort")
+
+        self.assertFalse(self.backend.meeting_exists("test_sqlite_1"))
+
+    def test_recent_meetings_for_contact_before(self):
+        """Should page history newest first, stopping at the cutoff"""
+        self.backend.add_meetings([
+            {"id": f"test_sqlite_h{i}", "user_id": "user_1", "contact_id": "contact_3",
+             "title": "History", "date": f"2026-04-1{i}", "start_hour": 9, "end_hour": 10}
+            for i in range(4)
+        ])
+
+        cutoff = ("2026-04-13", timespan.from_hours("2026-04-13", 9, 10)[0])
+        recent = data.get_historical_meetings_for_contact("contact_3", limit=2, before=cutoff)
+        self.assertEqual([m.id for m in recent], ["test_sqlite_h2", "test_sqlite_h1"])
+
+        # Same-date cutoff: an earlier meeting that day counts, the 09:00 one doesn't
+        self.backend.add_meetings([
+            {"id": "test_sqlite_h3_early", "user_id": "user_1", "contact_id": "contact_3",
+             "title": "History", "date": "2026-04-13", "start_hour": 8, "end_hour": 9}
+        ])
+        recent = data.get_historical_meetings_for_contact("contact_3", limit=2, before=cutoff)
+        self.assertEqual([m.id for m in recent], ["test_sqlite_h3_early", "test_sqlite_h2"])
+
+    def test_external_meetings_on(self):
+        """Should return a date's external meetings in start order, like in memory"""
+        self.backend.add_meetings([
+            {"id": f"test_sqlite_x{i}", "user_id": "user_1", "contact_id": contact,
+             "title": "External", "date": "2026-04-20", "start_hour": hour, "end_hour": hour + 1}
+            for i, (contact, hour) in enumerate([("contact_1", 14), (None, 9), ("contact_2", 10)])
+        ])
+
+        rows = data.external_meetings_on("2026-04-20")
+        self.assertEqual([row["id"] for row in rows], ["test_sqlite_x2", "test_sqlite_x0"])
+        self.assertEqual(data.external_meetings_on("2025-07-10"), self.previous.external_meetings_on("2025-07-10"))
+
+    def test_query_pages_match_in_memory(self):
+        """Keyset pages should come back in the same order as in memory"""
+        filters = MeetingFilters()
+        expected = [row["id"] for row in self.previous.query_meetings("user_1", filters)]
+
+        ids, after = [], None
+        while True:
+            rows = self.backend.query_meetings("user_1", filters, after=after, limit=3)
+            ids.extend(row["id"] for row in rows)
+            if len(rows) < 3:
+                break
+            after = (rows[-1]["date"], timespan.start_at(rows[-1]), rows[-1]["id"])
+        self.assertEqual(ids, expected)
+
+    def test_filters_match_in_memory(self):
+        """Each filter should select the same meetings as the in-memory engine"""
+        cases = [
+            {"contact_id": "contact_1"},
+            {"date_from": "2025-08-01", "date_to": "2025-09-30"},
+            {"hour_from": 10, "hour_to": 15},
+            {"internal": False, "sentiment": "positive"},
+            {"has_transcript": True},
+            {"has_prep": False},
+            {"title_contains": "REVIEW"},
+        ]
+        for case in cases:
+            filters = MeetingFilters(**case)
+            expected = [row["id"] for row in self.previous.query_meetings("user_1", filters)]
+            actual = [row["id"] for row in self.backend.query_meetings("user_1", filters)]
+            self.assertEqual(actual, expected, case)
+
+    def test_day_lookups_match_in_memory_order(self):
+        """Day lookups should be ordered by (start_at, id) on both backends, whatever the insert order"""
+        rows = [
+            {"id": f"sqlite_order_{suffix}", "user_id": "user_1", "contact_id": "contact_1", "title": "Order",
+             "date": "2026-04-08", "start_hour": hour, "end_hour": hour + 1}
+            for suffix, hour in [("c", 11), ("b", 9), ("a", 11)]
+        ]
+        expected = ["sqlite_order_b", "sqlite_order_a", "sqlite_order_c"]
+        self.backend.add_meetings(rows)
+        self.previous.add_meetings(rows)
+        try:
+            for backend in (self.backend, self.previous):
+                lookups = [
+                    backend.meetings_for_user_on("user_1", "2026-04-08"),
+                    backend.meetings_for_contact_on("contact_1", "2026-04-08"),
+                    backend.external_meetings_on("2026-04-08"),
+                ]
+                for found in lookups:
+                    self.assertEqual([row["id"] for row in found if row["title"] == "Order"], expected, backend)
+        finally:
+            self.previous.delete_meetings([row["id"] for row in rows])
+
+    def test_bulk_writes_are_atomic(self):
+        """A bulk update or delete with a missing meeting should change nothing"""
+        created = meeting_service.create_meetings([
+            CreateMeetingRequest(user_id="user_1", contact_id=None, title="SQLite Bulk",
+                                 date="2026-04-04", start_hour=hour, end_hour=hour + 1)
+            for hour in (9, 10)
+        ])
+        ids = [m.id for m in created]
+
+        with self.assertRaises(ValueError):
+            meeting_service.delete_meetings(ids + ["missing_meeting"])
+        self.assertTrue(all(self.backend.meeting_exists(mid) for mid in ids))
+
+        updated = meeting_service.update_meetings({mid: {"title": "SQLite Bulk 2"} for mid in ids})
+        self.assertEqual({m.title for m in updated}, {"SQLite Bulk 2"})
+        self.assertEqual(meeting_service.delete_meetings(ids), 2)
+        self.assertFalse(any(self.backend.meeting_exists(mid) for mid in ids))
+
+    def test_write_meetings_skips_deletes_already_gone(self):
+        """Puts and deletes should commit together, skipping meetings that no longer exist"""
+        row = {"id": "sqlite_gone_1", "user_id": "user_1", "contact_id": None, "title": "SQLite Write",
+               "date": "2026-04-07", "start_hour": 9, "end_hour": 10}
+        self.backend.add_meeting(row)
+        writes = []
+        data.add_write_listener(writes.append)
+        try:
+            data.write_meetings([Meeting(**{**row, "id": "sqlite_new_1"})], ["sqlite_gone_1", "missing_meeting"])
+        finally:
+            data.remove_write_listener(writes.append)
+
+        self.assertFalse(self.backend.meeting_exists("sqlite_gone_1"))
+        self.assertTrue(self.backend.meeting_exists("sqlite_new_1"))
+        self.assertEqual([[(mid, new is None) for mid, _, new in changes] for changes in writes],
+                         [[("sqlite_new_1", False), ("sqlite_gone_1", True)]])
+
+    def test_minute_times_round_trip(self):
+        """Minute-granularity and overnight meetings should keep their span and order"""
+        midnight = timespan.day_start("2026-04-05")
+        late = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1", title="Late", start_at=midnight + 23 * 60, end_at=midnight + 25 * 60
+        ))
+        early = meeting_service.create_meeting(CreateMeetingRequest(
+            user_id="user_1", title="Early", start_at=midnight + 22 * 60 + 30, end_at=midnight + 23 * 60
+        ))
+
+        self.assertEqual(data.get_meeting(late.id).end_at, midnight + 25 * 60)
+        rows = self.backend.query_meetings("user_1", MeetingFilters(date_from="2026-04-05", date_to="2026-04-05"))
+        self.assertEqual([row["id"] for row in rows], [early.id, late.id])
+        slots = meeting_service.find_available_slots(["user_1"], "2026-04-06", work_hours=(0, 3))
+        self.assertEqual([s.start_hour for s in slots], [1, 2])
+
+    def test_migrates_database_without_start_at(self):
+        """A database created before start_at existed should be upgraded in place"""
+        path = os.path.join(self.tmpdir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE meetings (id TEXT PRIMARY KEY, user_id TEXT NOT NULL, contact_id TEXT, "
+            "date TEXT NOT NULL, start_hour INTEGER NOT NULL, doc TEXT NOT NULL);"
+            "CREATE INDEX idx_meetings_user_slot ON meetings (user_id, date, start_hour, id);"
+        )
+        row = {"id": "old_1", "user_id": "user_1", "contact_id": None, "title": "Old",
+               "date": "2026-04-07", "start_hour": 9, "end_hour": 10}
+        conn.execute("INSERT INTO meetings VALUES (?, ?, ?, ?, ?, ?)",
+                     ("old_1", "user_1", None, "2026-04-07", 9, json.dumps(row)))
+        conn.commit()
+        conn.close()
+
+        backend = SQLiteBackend(path)
+        try:
+            (start_at,) = backend._conn().execute("SELECT start_at FROM meetings").fetchone()
+            self.assertEqual(start_at, timespan.day_start("2026-04-07") + 9 * 60)
+            self.assertEqual([r["id"] for r in backend.query_meetings("user_1", MeetingFilters())], ["old_1"])
+        finally:
+            backend.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
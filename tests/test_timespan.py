@@ -0,0 +1,94 @@
+"""
+Time Model Tests
+
+Tests for the epoch-minute meeting times in timespan.py and the models.
+Run with: python run_tests.py timespan
+"""
+
+import unittest
+from pydantic import ValidationError
+
+import timespan
+from models import CreateMeetingRequest, Meeting
+
+
+class TestTimespan(unittest.TestCase):
+    """Test conversions, merging and updates"""
+
+    def test_day_start(self):
+        """Should count minutes from the Unix epoch in UTC"""
+        self.assertEqual(timespan.day_start("1970-01-02"), 1440)
+        self.assertEqual(timespan.day_of(timespan.day_start("2026-02-28") + 1439), "2026-02-28")
+
+    def test_from_hours_crosses_midnight(self):
+        """An end hour below the start hour should end the next day"""
+        start, end = timespan.from_hours("2026-01-01", 22, 2)
+        self.assertEqual(end - start, 4 * 60)
+        self.assertEqual(timespan.days_spanned((start, end)), ["2026-01-01", "2026-01-02"])
+
+    def test_hour_fields(self):
+        """Should round the start down and the end up, counted from the start date"""
+        midnight = timespan.day_start("2026-01-01")
+        fields = timespan.hour_fields(midnight + 23 * 60 + 30, midnight + 24 * 60 + 15)
+        self.assertEqual(fields, {"date": "2026-01-01", "start_hour": 23, "end_hour": 25})
+
+    def test_merge_spans(self):
+        """Should merge overlapping and touching spans and drop empty ones"""
+        merged = timespan.merge_spans([(50, 60), (0, 10), (5, 20), (20, 30), (40, 40)])
+        self.assertEqual(merged, [(0, 30), (50, 60)])
+
+    def test_meeting_span_falls_back_to_hours(self):
+        """Rows without start_at should be read from their hours"""
+        row = {"date": "2026-01-01", "start_hour": 9, "end_hour": 10}
+        self.assertEqual(timespan.meeting_span(row), timespan.from_hours("2026-01-01", 9, 10))
+        self.assertIsNone(timespan.meeting_span({"date": "2026-01-01"}))
+
+    def test_apply_update(self):
+        """Updates should keep the span and hours in agreement"""
+        row = Meeting(id="m", user_id="u", title="t", start_at=100_000, end_at=100_030).model_dump()
+
+        moved = timespan.apply_update(row, {"date": timespan.day_of(100_000 + 1440)})
+        self.assertEqual((moved["start_at"], moved["end_at"]), (101_440, 101_470))
+
+        rehoured = timespan.apply_update(row, {"start_hour": 9, "end_hour": 10})
+        self.assertNotIn("start_at", rehoured)
+
+        respanned = timespan.apply_update(row, {"start_at": 100_060, "end_at": 100_120})
+        self.assertEqual(respanned["start_hour"], (100_060 - timespan.day_start(row["date"])) // 60)
+
+
+class TestTimeModels(unittest.TestCase):
+    """Test the span fields on the models"""
+
+    def test_derived_from_hours(self):
+        """start_at/end_at should be filled from the hour fields"""
+        request = CreateMeetingRequest(user_id="u", title="t", date="2026-01-01", start_hour=9, end_hour=10)
+        self.assertEqual((request.start_at, request.end_at), timespan.from_hours("2026-01-01", 9, 10))
+
+    def test_hours_derived_from_span(self):
+        """The hour fields should be filled from start_at/end_at"""
+        midnight = timespan.day_start("2026-01-01")
+        meeting = Meeting(id="m", user_id="u", title="t", start_at=midnight + 570, end_at=midnight + 600)
+        self.assertEqual((meeting.date, meeting.start_hour, meeting.end_hour), ("2026-01-01", 9, 10))
+
+    def test_invalid_spans(self):
+        """Reversed, over-long and missing times should not validate"""
+        with self.assertRaises(ValidationError):
+            Meeting(id="m", user_id="u", title="t", start_at=100, end_at=50)
+        with self.assertRaises(ValidationError):
+            Meeting(id="m", user_id="u", title="t", start_at=0, end_at=24 * 60 + 1)
+        with self.assertRaises(ValidationError):
+            CreateMeetingRequest(user_id="u", title="t")
+
+    def test_out_of_range_hours(self):
+        """Hours that would move the meeting to another date should not validate"""
+        for start_hour, end_hour in [(30, 31), (-5, 1), (24, 25), (9, 49), (9, -1)]:
+            with self.assertRaises(ValidationError, msg=(start_hour, end_hour)):
+                CreateMeetingRequest(user_id="u", title="t", date="2026-01-01",
+                                     start_hour=start_hour, end_hour=end_hour)
+        overnight = CreateMeetingRequest(user_id="u", title="t", date="2026-01-01", start_hour=23, end_hour=25)
+        self.assertEqual(overnight.end_at - overnight.start_at, 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,325 @@
+"""
+Transcript Analysis Tests
+
+Tests for packed transcript analysis prompts, long-transcript chunking with
+map-reduce summarization, and the batch analysis pipeline.
+Run with: python run_tests.py analysis
+"""
+
+import asyncio
+import json
+import unittest
+import data
+import transcript_analysis
+from models import Meeting
+from llm_client import AsyncMockLLMClient, MockLLMClient, ServiceUnavailableError
+import meeting_service
+from meeting_service import analyze_transcripts_batch, delete_meeting, summarize_transcript, update_meetings
+
+TRANSCRIPT = """Sarah: Thanks for joining. We're excited about the platform.
+Alex: Great. I'll send over the pricing proposal by Friday.
+Sarah: Perfect, I'll review it with my team next week."""
+
+
+def long_transcript(turns=2000, edit_at=None):
+    """A transcript of many speaker turns, optionally with one turn edited"""
+    speakers = ["Alex", "Sarah", "Jordan"]
+    lines = [f"{speakers[i % 3]}: Point {i}. " + "We discussed the rollout. " * (i % 7) for i in range(turns)]
+    if edit_at is not None:
+        lines[edit_at] = "Sarah: Actually, that timeline is a problem."
+    return "\n".join(lines)
+
+
+class CountingClient(AsyncMockLLMClient):
+    """Async mock client that records the prompts it answers"""
+
+    def __init__(self):
+        super().__init__(failure_rate=0.0)
+        self.prompts = []
+
+    async def generate(self, prompt, system_prompt=None):
+        self.prompts.append(prompt)
+        return await super().generate(prompt, system_prompt)
+
+    def count(self, kind):
+        return sum(1 for p in self.prompts if p.startswith(kind))
+
+
+class UnavailableClient:
+    """Async client stub whose service is always down"""
+
+    async def generate(self, prompt, system_prompt=None):
+        raise ServiceUnavailableError("ServiceUnavailableError: Service temporarily unavailable.")
+
+
+def _meeting(meeting_id, transcript="Alex: Hello."):
+    return Meeting(id=meeting_id, user_id="user_1", title="Analysis", date="2026-03-02",
+                   start_hour=10, end_hour=11, transcript=transcript)
+
+
+class TestAnalysisPrompt(unittest.TestCase):
+    """Test packing, prompt building and response parsing"""
+
+    def test_pack_limits(self):
+        """Packs should respect both the meeting count and character limits"""
+        meetings = [_meeting(f"m{i}", "x" * 100) for i in range(10)]
+        self.assertEqual([len(p) for p in transcript_analysis.pack_meetings(meetings, 4, 10_000)], [4, 4, 2])
+        self.assertEqual([len(p) for p in transcript_analysis.pack_meetings(meetings, 4, 250)], [2, 2, 2, 2, 2])
+        # A transcript over the character limit gets a pack of its own
+        long = [_meeting("big", "x" * 1000), _meeting("small", "x")]
+        self.assertEqual([len(p) for p in transcript_analysis.pack_meetings(long, 4, 500)], [1, 1])
+
+    def test_prompt_round_trip(self):
+        """Each packed meeting should get its own analysis back"""
+        meetings = [_meeting("m1", TRANSCRIPT), _meeting("m2", "Jordan: Timeline is too slow.")]
+        prompt = transcript_analysis.build_analysis_prompt(meetings)
+        self.assertIn("=== MEETING m1: Analysis ===", prompt)
+
+        parsed = transcript_analysis.parse_analysis_response(MockLLMClient(failure_rate=0).generate(prompt), ["m1", "m2"])
+        self.assertEqual(set(parsed), {"m1", "m2"})
+        self.assertTrue(parsed["m1"].summary)
+        self.assertEqual(len(parsed["m1"].key_topics), 3)
+        self.assertTrue(all(" to " in item for item in parsed["m1"].action_items))
+
+    def test_missing_and_malformed_results(self):
+        """Missing meetings should parse as None; a non-analysis reply should raise"""
+        response = json.dumps({"meetings": {"m1": {"summary": "ok", "sentiment": {"score": 0.9}}}})
+        parsed = transcript_analysis.parse_analysis_response(response, ["m1", "m2"])
+        self.assertEqual(parsed["m1"].sentiment, "very_positive")
+        self.assertIsNone(parsed["m2"])
+        with self.assertRaises(ValueError):
+            transcript_analysis.parse_analysis_response("not json", ["m1"])
+        with self.assertRaises(ValueError):
+            transcript_analysis.parse_analysis_response('{"meetings": []}', ["m1"])
+
+    def test_sentiment_labels(self):
+        """Scores should map onto the stored sentiment labels"""
+        labels = [transcript_analysis.sentiment_label(s) for s in (0.9, 0.75, 0.6, 0.3)]
+        self.assertEqual(labels, ["very_positive", "positive", "neutral", "negative"])
+
+    def test_needs_analysis(self):
+        """Only unanalyzed or changed transcripts should need analysis"""
+        meeting = _meeting("m1", TRANSCRIPT)
+        self.assertTrue(transcript_analysis.needs_analysis(meeting))
+        meeting.analysis_hash = transcript_analysis.transcript_hash(TRANSCRIPT)
+        self.assertFalse(transcript_analysis.needs_analysis(meeting))
+        self.assertFalse(transcript_analysis.needs_analysis(_meeting("m2", None)))
+
+
+class TestTranscriptChunking(unittest.TestCase):
+    """Test splitting long transcripts on speaker turns"""
+
+    def test_chunks_are_bounded_whole_turns(self):
+        """Chunks should stay under the limit, start on a turn and lose nothing"""
+        text = long_transcript()
+        chunks = list(transcript_analysis.chunk_transcript(text, 4000))
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(c) <= 4000 for c in chunks))
+        self.assertTrue(all(transcript_analysis.SPEAKER_TURN.match(c) for c in chunks))
+        self.assertEqual("\n".join(chunks), text)
+
+    def test_continuation_lines_stay_with_their_turn(self):
+        """Lines without a speaker should belong to the turn above"""
+        turns = list(transcript_analysis.iter_turns("Alex: Hello\nstill Alex\nSarah: Hi"))
+        self.assertEqual(turns, ["Alex: Hello\nstill Alex", "Sarah: Hi"])
+
+    def test_streamed_input_matches_string(self):
+        """Chunking text pieces that split lines arbitrarily should match chunking the string"""
+        text = long_transcript(500)
+        pieces = [text[i:i + 97] for i in range(0, len(text), 97)]
+        self.assertEqual(list(transcript_analysis.chunk_transcript(iter(pieces), 3000)),
+                         list(transcript_analysis.chunk_transcript(text, 3000)))
+
+    def test_overlong_turn_is_sliced(self):
+        """A single turn longer than the limit should be cut into slices"""
+        chunks = list(transcript_analysis.chunk_transcript("Alex: " + "x" * 2500, 1000))
+        self.assertEqual([len(c) for c in chunks], [1000, 1000, 506])
+
+    def test_edit_changes_few_chunks(self):
+        """Editing one turn should leave the chunks away from it unchanged"""
+        before = list(transcript_analysis.chunk_transcript(long_transcript(), 4000))
+        after = list(transcript_analysis.chunk_transcript(long_transcript(edit_at=1000), 4000))
+        self.assertLessEqual(len(set(after) - set(before)), 2)
+        self.assertEqual(after[:5], before[:5])
+        self.assertEqual(after[-5:], before[-5:])
+
+
+class TestSummarizeTranscript(unittest.TestCase):
+    """Test map-reduce summarization and the chunk cache"""
+
+    def setUp(self):
+        meeting_service.chunk_cache.clear()
+
+    def test_map_reduce(self):
+        """Every chunk should be analyzed once, then reduced into one analysis"""
+        text = long_transcript()
+        chunks = list(transcript_analysis.chunk_transcript(text, 4000))
+        client = CountingClient()
+
+        analysis = asyncio.run(summarize_transcript(text, chunk_chars=4000, client=client))
+
+        self.assertEqual(client.count("Transcript chunk request"), len(chunks))
+        # Tree reduce: ceil(n / 16) calls, then one to combine those
+        self.assertEqual(client.count("Transcript summary reduce request"), -(-len(chunks) // 16) + 1)
+        self.assertTrue(analysis.summary)
+        self.assertTrue(analysis.action_items)
+        self.assertEqual(len(analysis.action_items), len(set(analysis.action_items)))
+        self.assertLessEqual(len(analysis.key_topics), transcript_analysis.MAX_KEY_TOPICS)
+        self.assertIsNotNone(analysis.sentiment)
+
+    def test_edit_recomputes_changed_chunks_only(self):
+        """After an edit, unchanged chunks should come from the cache"""
+        asyncio.run(summarize_transcript(long_transcript(), chunk_chars=4000, client=CountingClient()))
+        client = CountingClient()
+        asyncio.run(summarize_transcript(long_transcript(edit_at=1000), chunk_chars=4000, client=client))
+        self.assertLessEqual(client.count("Transcript chunk request"), 2)
+
+    def test_single_chunk_skips_reduce(self):
+        """A transcript that fits one chunk should need no reduce call"""
+        client = CountingClient()
+        analysis = asyncio.run(summarize_transcript(iter([TRANSCRIPT]), client=client))
+        self.assertEqual(client.count("Transcript summary reduce request"), 0)
+        self.assertEqual(analysis.sentiment, "positive")
+
+    def test_empty_transcript(self):
+        """An empty transcript should raise ValueError"""
+        with self.assertRaises(ValueError):
+            asyncio.run(summarize_transcript("", client=CountingClient()))
+
+
+class TestAnalyzeTranscriptsBatch(unittest.TestCase):
+    """Test the batch analysis pipeline end to end"""
+
+    def setUp(self):
+        """Clean up test meetings"""
+        for mid in [mid for mid in data.MEETINGS.keys() if mid.startswith("test_analysis_")]:
+            del data.MEETINGS[mid]
+
+    tearDown = setUp
+
+    def _create(self, transcript=TRANSCRIPT, start_hour=10):
+        meeting_id = f"test_analysis_{len(data.MEETINGS)}"
+        data.MEETINGS[meeting_id] = {
+            "id": meeting_id,
+            "user_id": "user_1",
+            "contact_id": "contact_1",
+            "title": "Analysis Meeting",
+            "date": "2026-03-02",
+            "start_hour": start_hour,
+            "end_hour": start_hour + 1,
+            "transcript": transcript,
+        }
+        return meeting_id
+
+    def _run(self, ids, **kwargs):
+        kwargs.setdefault("client", AsyncMockLLMClient(failure_rate=0.0))
+        return asyncio.run(analyze_transcripts_batch(ids, **kwargs))
+
+    def test_writes_analysis_back(self):
+        """Every analyzed meeting should store summary, action items, topics and sentiment"""
+        ids = [self._create(TRANSCRIPT + f"\nAlex: Note {i}.", start_hour=8 + i) for i in range(6)]
+        results = self._run(ids, pack_size=4)
+
+        self.assertEqual([r.meeting_id for r in results], ids)
+        for result in results:
+            self.assertTrue(result.success, result.error)
+            self.assertFalse(result.skipped)
+            stored = data.MEETINGS[result.meeting_id]
+            self.assertTrue(stored["summary"])
+            self.assertTrue(stored["action_items"])
+            self.assertEqual(len(stored["key_topics"]), 3)
+            self.assertIn(stored["sentiment"], {"very_positive", "positive", "neutral", "negative"})
+            self.assertEqual(stored["analysis_hash"], transcript_analysis.transcript_hash(stored["transcript"]))
+
+    def test_skips_unchanged_transcripts(self):
+        """Re-running should skip analyzed meetings until the transcript changes"""
+        meeting_id = self._create()
+        self._run([meeting_id])
+
+        result = self._run([meeting_id])[0]
+        self.assertTrue(result.success)
+        self.assertTrue(result.skipped)
+
+        self.assertFalse(self._run([meeting_id], force=True)[0].skipped)
+
+        update_meetings({meeting_id: {"transcript": "Jordan: Budget is a concern. Timeline is too slow."}})
+        result = self._run([meeting_id])[0]
+        self.assertFalse(result.skipped)
+        self.assertEqual(result.meeting.sentiment, "negative")
+
+    def test_missing_meeting_and_transcript(self):
+        """Unknown meetings and meetings without transcripts should fail individually"""
+        with_transcript = self._create()
+        without_transcript = self._create(transcript=None, start_hour=12)
+        results = self._run(["test_analysis_nope", without_transcript, with_transcript])
+
+        self.assertFalse(results[0].success)
+        self.assertIn("not found", results[0].error)
+        self.assertFalse(results[1].success)
+        self.assertIn("no transcript", results[1].error)
+        self.assertTrue(results[2].success)
+
+    def test_long_transcript_is_map_reduced(self):
+        """Transcripts over chunk_chars should be chunked rather than packed"""
+        meeting_service.chunk_cache.clear()
+        short_id, long_id = self._create(start_hour=9), self._create(long_transcript(), start_hour=11)
+        client = CountingClient()
+        results = self._run([short_id, long_id], client=client, chunk_chars=4000)
+
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(client.count("Transcript analysis request"), 1)
+        self.assertGreater(client.count("Transcript chunk request"), 10)
+        stored = data.MEETINGS[long_id]
+        self.assertTrue(stored["summary"])
+        self.assertEqual(stored["analysis_hash"], transcript_analysis.transcript_hash(stored["transcript"]))
+
+    def test_llm_failure_fails_pack(self):
+        """A pack whose LLM call keeps failing should fail without writing anything"""
+        ids = [self._create(start_hour=9 + i) for i in range(2)]
+        results = self._run(ids, client=UnavailableClient(), max_delay=0.0)
+
+        self.assertTrue(all(not r.success for r in results))
+        self.assertTrue(all(data.MEETINGS[i].get("analysis_hash") is None for i in ids))
+
+    def test_meeting_deleted_mid_analysis(self):
+        """A meeting deleted before the write-back should fail without blocking the rest"""
+        kept, deleted = self._create(start_hour=9), self._create(start_hour=11)
+
+        class DeletingClient(AsyncMockLLMClient):
+            async def generate(self, prompt, system_prompt=None):
+                if deleted in data.MEETINGS:
+                    delete_meeting(deleted)
+                return await super().generate(prompt, system_prompt)
+
+        results = self._run([kept, deleted], client=DeletingClient(failure_rate=0.0))
+        self.assertTrue(results[0].success)
+        self.assertFalse(results[1].success)
+        self.assertIn("not found", results[1].error)
+
+    def test_meeting_deleted_during_write_back(self):
+        """A delete racing the bulk update should not lose the other meetings' results"""
+        kept, deleted = self._create(start_hour=9), self._create(start_hour=11)
+        meetings_by_id = data.meetings_by_id
+        calls = []
+
+        def racing_meetings_by_id(meeting_ids):
+            rows = meetings_by_id(meeting_ids)
+            calls.append(meeting_ids)
+            if len(calls) == 2:
+                delete_meeting(deleted)  # Deleted just after the write-back's existence check
+            return rows
+
+        data.meetings_by_id = racing_meetings_by_id
+        try:
+            results = self._run([kept, deleted])
+        finally:
+            data.meetings_by_id = meetings_by_id
+
+        self.assertTrue(results[0].success, results[0].error)
+        self.assertTrue(data.MEETINGS[kept]["summary"])
+        self.assertFalse(results[1].success)
+        self.assertIn("not found", results[1].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Minute-granularity meeting times
+
+Meetings store their span as start_at/end_at: UTC minutes since the Unix
+epoch, as plain ints. The legacy date/start_hour/end_hour fields are kept
+alongside and derived from the span (start_hour rounded down, end_hour
+rounded up and counted from the start date's midnight, so a meeting from
+23:30 to 00:30 has start_hour 23 and end_hour 25).
+
+Rows written before start_at existed - or built by hand with only hours -
+are read through meeting_span(), which falls back to the hour fields.
+An end_hour below start_hour there means the meeting ends the next day.
+"""
+
+from datetime import date as Date, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+MAX_DURATION_MINUTES = MINUTES_PER_DAY
+
+EPOCH = Date(1970, 1, 1)
+SPAN_FIELDS = ("start_at", "end_at")
+HOUR_FIELDS = ("date", "start_hour", "end_hour")
+
+
+@lru_cache(maxsize=8192)
+def day_start(day: str) -> int:
+    """Epoch minute of UTC midnight on a YYYY-MM-DD date"""
+    return (Date.fromisoformat(day) - EPOCH).days * MINUTES_PER_DAY
+
+
+def day_of(epoch_minute: int) -> str:
+    """The YYYY-MM-DD date an epoch minute falls on"""
+    return (EPOCH + timedelta(days=epoch_minute // MINUTES_PER_DAY)).isoformat()
+
+
+def from_hours(day: str, start_hour: int, end_hour: int) -> Tuple[int, int]:
+    """(start_at, end_at) for hour fields; an end before the start is on the next day"""
+    start_at = day_start(day) + start_hour * 60
+    end_at = day_start(day) + end_hour * 60
+    if end_hour < start_hour:
+        end_at += MINUTES_PER_DAY
+    return start_at, end_at
+
+
+def hour_fields(start_at: int, end_at: int) -> dict:
+    """The legacy date/start_hour/end_hour fields for a span"""
+    day = day_of(start_at)
+    midnight = day_start(day)
+    return {
+        "date": day,
+        "start_hour": (start_at - midnight) // 60,
+        "end_hour": -(-(end_at - midnight) // 60),
+    }
+
+
+def meeting_span(row: dict) -> Optional[Tuple[int, int]]:
+    """A meeting row's (start_at, end_at), or None if it has no times"""
+    start_at, end_at = row.get("start_at"), row.get("end_at")
+    if start_at is not None and end_at is not None:
+        return start_at, end_at
+    day, start_hour, end_hour = row.get("date"), row.get("start_hour"), row.get("end_hour")
+    if day is None or start_hour is None or end_hour is None:
+        return None
+    return from_hours(day, start_hour, end_hour)
+
+
+def start_at(row: dict) -> int:
+    """A meeting row's start as an epoch minute - its sort position within a date"""
+    value = row.get("start_at")
+    if value is not None:
+        return value
+    return day_start(row["date"]) + row["start_hour"] * 60
+
+
+def days_spanned(span: Tuple[int, int]) -> List[str]:
+    """Every date a span has minutes on (the start date for an empty span)"""
+    start, end = span
+    last = max(end - 1, start) // MINUTES_PER_DAY
+    return [day_of(day * MINUTES_PER_DAY) for day in range(start // MINUTES_PER_DAY, last + 1)]
+
+
+def previous_day(day: str) -> str:
+    """The date before a YYYY-MM-DD date"""
+    return day_of(day_start(day) - MINUTES_PER_DAY)
+
+
+def merge_spans(spans: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge overlapping or touching (start, end) spans into disjoint ones
+
+    Sorts once and sweeps, O(n log n) in the number of spans however long
+    they are. Empty spans are dropped.
+    """
+    merged = []
+    for start, end in sorted(spans):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def apply_update(row: dict, updates: dict) -> dict:
+    """
+    {**row, **updates}, with the span and hour fields kept in agreement
+
+    - start_at/end_at in the update win and the hour fields are re-derived
+    - a new start_hour or end_hour drops the stored span, so it is read
+      (and re-validated) from the hours
+    - a new date alone moves the span by whole days, keeping its minutes
+    """
+    new = {**row, **updates}
+    if any(field in updates for field in SPAN_FIELDS):
+        if isinstance(new.get("start_at"), int) and isinstance(new.get("end_at"), int):
+            new.update(hour_fields(new["start_at"], new["end_at"]))
+        return new
+    if not any(field in updates for field in HOUR_FIELDS) or row.get("start_at") is None:
+        return new
+    if "start_hour" not in updates and "end_hour" not in updates:
+        try:
+            shift = day_start(new["date"]) - day_start(row["date"])
+        except (TypeError, ValueError):
+            shift = None  # Left to validation
+        if shift is not None:
+            new["start_at"] = row["start_at"] + shift
+            new["end_at"] = row["end_at"] + shift
+            return new
+    new.pop("start_at", None)
+    new.pop("end_at", None)
+    return new
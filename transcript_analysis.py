@@ -0,0 +1,300 @@
+"""
+Post-meeting transcript analysis
+
+Builds the LLM prompt that extracts a summary, action items, key topics and
+sentiment from meeting transcripts, and parses the reply. Several meetings
+can be packed into one prompt - one request instead of four per meeting,
+and fewer per-call overheads - and the reply carries one result per
+meeting ID.
+
+Transcripts too long for one prompt are cut into chunks on speaker turns
+("Name: ..." lines) and analyzed map-reduce style: each chunk on its own,
+then the partial summaries are combined. Chunk boundaries depend on the
+turns' content rather than their offsets, so after an edit the unchanged
+chunks come out identical and their cached results can be reused.
+
+The batch runner that calls the LLM and writes results back is
+meeting_service.analyze_transcripts_batch.
+"""
+
+import hashlib
+import json
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from pydantic import ValidationError
+
+from models import Meeting, MeetingAnalysis
+
+DEFAULT_PACK_SIZE = 4  # Meetings per prompt
+DEFAULT_PACK_CHARS = 24_000  # Transcript characters per prompt
+DEFAULT_CHUNK_CHARS = 8_000  # Longer transcripts are chunked and map-reduced
+BOUNDARY_ODDS = 8  # Once a chunk is big enough, ~1 turn in 8 ends it
+REDUCE_FANOUT = 16  # Partial summaries combined per reduce prompt
+MAX_KEY_TOPICS = 5
+
+SPEAKER_TURN = re.compile(r"^[A-Z][\w.' -]{0,40}:")
+
+MEETING_HEADER = "=== MEETING {id}: {title} ==="
+
+INSTRUCTIONS = """Transcript analysis request.
+
+For each meeting below, extract:
+- summary: 2-3 sentences on what was discussed and decided
+- action_items: list of {"task": ..., "owner": ...}
+- key_topics: list of the main topics
+- sentiment: {"score": 0.0-1.0, "summary": ..., "relationship_health": ...}
+
+Respond with JSON only, keyed by meeting ID:
+{"meetings": {"<meeting id>": {"summary": ..., "action_items": [...], "key_topics": [...], "sentiment": {...}}}}"""
+
+CHUNK_INSTRUCTIONS = """Transcript chunk request.
+
+The text below is one part of a longer meeting transcript. For this part, extract:
+- summary: 1-2 sentences on what was discussed and decided
+- action_items: list of {"task": ..., "owner": ...}
+- key_topics: list of the main topics
+- sentiment: {"score": 0.0-1.0, "summary": ...}
+
+Respond with JSON only:
+{"summary": ..., "action_items": [...], "key_topics": [...], "sentiment": {...}}
+
+=== TRANSCRIPT CHUNK ==="""
+
+REDUCE_INSTRUCTIONS = """Transcript summary reduce request.
+
+Below are summaries of consecutive parts of one meeting, in order. Combine
+them into a single 2-3 sentence summary of the whole meeting.
+
+Respond with JSON only: {"summary": ...}"""
+
+PART_HEADER = "=== PART {n} ==="
+
+
+def transcript_hash(transcript: str) -> str:
+    """Fingerprint of a transcript, stored as Meeting.analysis_hash once analyzed"""
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+def needs_analysis(meeting: Meeting) -> bool:
+    """True if the meeting has a transcript that hasn't been analyzed in its current form"""
+    return bool(meeting.transcript) and meeting.analysis_hash != transcript_hash(meeting.transcript)
+
+
+def pack_meetings(
+    meetings: Iterable[Meeting],
+    max_meetings: int = DEFAULT_PACK_SIZE,
+    max_chars: int = DEFAULT_PACK_CHARS
+) -> List[List[Meeting]]:
+    """
+    Group meetings into prompts of at most max_meetings meetings and about
+    max_chars transcript characters (a longer transcript gets a prompt to itself)
+    """
+    packs, current, size = [], [], 0
+    for meeting in meetings:
+        length = len(meeting.transcript or "")
+        if current and (len(current) == max_meetings or size + length > max_chars):
+            packs.append(current)
+            current, size = [], 0
+        current.append(meeting)
+        size += length
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_analysis_prompt(meetings: List[Meeting]) -> str:
+    """One prompt covering every meeting in a pack"""
+    parts = [INSTRUCTIONS]
+    for meeting in meetings:
+        parts.append(MEETING_HEADER.format(id=meeting.id, title=meeting.title))
+        parts.append(meeting.transcript or "")
+    return "\n\n".join(parts)
+
+
+def iter_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Lines of a transcript given as one string or as an iterable of text
+    pieces (an open file, a network stream, ...) that needn't end on line breaks
+    """
+    if isinstance(source, str):
+        yield from source.splitlines()
+        return
+    pending = ""
+    for piece in source:
+        *lines, pending = (pending + piece).split("\n")
+        yield from (line.rstrip("\r") for line in lines)
+    if pending:
+        yield pending
+
+
+def iter_turns(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Speaker turns: each "Name: ..." line plus the lines that follow it"""
+    turn = []
+    for line in iter_lines(source):
+        if turn and SPEAKER_TURN.match(line):
+            yield "\n".join(turn)
+            turn = []
+        turn.append(line)
+    if turn:
+        yield "\n".join(turn)
+
+
+def _is_boundary(turn: str) -> bool:
+    return zlib.crc32(turn.encode("utf-8")) % BOUNDARY_ODDS == 0
+
+
+def chunk_transcript(
+    source: Union[str, Iterable[str]],
+    max_chars: int = DEFAULT_CHUNK_CHARS
+) -> Iterator[str]:
+    """
+    Cut a transcript into chunks of whole speaker turns, lazily as it is read
+
+    A chunk ends after a turn whose hash hits a 1 in BOUNDARY_ODDS chance
+    once it holds max_chars / 4 characters, or before a turn that would take
+    it past max_chars. A single turn longer than max_chars is sliced.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+    min_chars = max_chars // 4
+    chunk, size = [], 0
+    for turn in iter_turns(source):
+        for start in range(0, max(len(turn), 1), max_chars):
+            piece = turn[start:start + max_chars]
+            if chunk and size + 1 + len(piece) > max_chars:
+                yield "\n".join(chunk)
+                chunk, size = [], 0
+            size += len(piece) + (1 if chunk else 0)
+            chunk.append(piece)
+            if size >= min_chars and _is_boundary(piece):
+                yield "\n".join(chunk)
+                chunk, size = [], 0
+    if chunk:
+        yield "\n".join(chunk)
+
+
+def build_chunk_prompt(chunk: str) -> str:
+    """Prompt for the map step: one chunk of a long transcript"""
+    return "\n".join([CHUNK_INSTRUCTIONS, chunk])
+
+
+def build_reduce_prompt(summaries: List[str]) -> str:
+    """Prompt for the reduce step: consecutive partial summaries"""
+    parts = [REDUCE_INSTRUCTIONS]
+    for n, summary in enumerate(summaries, 1):
+        parts.append(f"{PART_HEADER.format(n=n)}\n{summary}")
+    return "\n\n".join(parts)
+
+
+def sentiment_label(score: float) -> str:
+    """Map a 0-1 sentiment score onto the labels stored on meetings"""
+    if score >= 0.85:
+        return "very_positive"
+    if score >= 0.7:
+        return "positive"
+    if score > 0.5:
+        return "neutral"
+    return "negative"
+
+
+def _action_item_text(item) -> str:
+    """'Owner to task' for a {"task", "owner"} item, as in the stored meetings"""
+    if isinstance(item, str):
+        return item
+    task, owner = item.get("task", ""), item.get("owner")
+    if not owner:
+        return task
+    return f"{owner} to {task[:1].lower()}{task[1:]}"
+
+
+def _to_analysis(result: dict) -> MeetingAnalysis:
+    sentiment = result.get("sentiment")
+    if isinstance(sentiment, dict):
+        sentiment = sentiment_label(float(sentiment["score"]))
+    return MeetingAnalysis(
+        summary=result["summary"],
+        action_items=[_action_item_text(item) for item in result.get("action_items", [])],
+        key_topics=result.get("key_topics", []),
+        sentiment=sentiment,
+    )
+
+
+def parse_analysis_response(response: str, meeting_ids: List[str]) -> Dict[str, Optional[MeetingAnalysis]]:
+    """
+    meeting_id -> MeetingAnalysis for each requested meeting, None for one
+    missing from or malformed in the reply
+
+    Raises:
+        ValueError: If the reply isn't JSON in the requested shape at all
+    """
+    try:
+        results = json.loads(response)["meetings"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("LLM response is not a transcript analysis")
+    if not isinstance(results, dict):
+        raise ValueError("LLM response is not a transcript analysis")
+
+    parsed = {}
+    for meeting_id in meeting_ids:
+        try:
+            parsed[meeting_id] = _to_analysis(results[meeting_id])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            parsed[meeting_id] = None
+    return parsed
+
+
+def parse_chunk_response(response: str) -> dict:
+    """
+    A chunk's partial analysis: summary, action_items, key_topics and the
+    raw sentiment_score (kept so partials can be averaged)
+
+    Raises:
+        ValueError: If the reply isn't a chunk analysis
+    """
+    try:
+        result = json.loads(response)
+        analysis = _to_analysis(result)
+        score = float(result["sentiment"]["score"])
+    except (ValueError, KeyError, TypeError, ValidationError):
+        raise ValueError("LLM response is not a transcript chunk analysis")
+    return {**analysis.model_dump(exclude={"sentiment"}), "sentiment_score": score}
+
+
+def parse_reduce_response(response: str) -> str:
+    """
+    The combined summary from a reduce reply
+
+    Raises:
+        ValueError: If the reply isn't a summary
+    """
+    try:
+        summary = json.loads(response)["summary"]
+    except (ValueError, KeyError, TypeError):
+        summary = None
+    if not isinstance(summary, str):
+        raise ValueError("LLM response is not a transcript summary")
+    return summary
+
+
+def merge_partials(partials: List[dict], summary: str) -> MeetingAnalysis:
+    """
+    One analysis from chunk partials and their reduced summary: action
+    items de-duplicated in order, the most frequent topics, mean sentiment
+    """
+    action_items = list(dict.fromkeys(item for p in partials for item in p["action_items"]))
+    topic_counts = Counter(topic for p in partials for topic in p["key_topics"])
+    score = sum(p["sentiment_score"] for p in partials) / len(partials)
+    return MeetingAnalysis(
+        summary=summary,
+        action_items=action_items,
+        key_topics=[topic for topic, _ in topic_counts.most_common(MAX_KEY_TOPICS)],
+        sentiment=sentiment_label(score),
+    )
+
+
+def analysis_updates(analysis: MeetingAnalysis, transcript: str) -> dict:
+    """The meeting fields to write for an analysis of `transcript`"""
+    return {**analysis.model_dump(), "analysis_hash": transcript_hash(transcript)}